@@ -5,10 +5,12 @@ import click
 
 from dnastack.alpha.cli.commands import alpha_command_group
 from dnastack.cli.commands.auth import auth_command_group
+from dnastack.cli.commands.cache import cache_command_group
 from dnastack.cli.commands.collections import collections_command_group
 from dnastack.cli.commands.config import config_command_group
 from dnastack.cli.commands.config.contexts import contexts_command_group, ContextCommandHandler
 from dnastack.cli.commands.dataconnect import data_connect_command_group
+from dnastack.cli.commands.debug import debug_command_group
 from dnastack.cli.commands.drs import drs_command_group
 from dnastack.cli.commands.publisher import publisher_command_group
 from dnastack.cli.commands.workbench import workbench_command_group
@@ -105,6 +107,10 @@ dnastack.add_command(alpha_command_group)
 dnastack.add_command(publisher_command_group)
 # noinspection PyTypeChecker
 dnastack.add_command(workbench_command_group)
+# noinspection PyTypeChecker
+dnastack.add_command(cache_command_group)
+# noinspection PyTypeChecker
+dnastack.add_command(debug_command_group)
 
 
 if __name__ == "__main__":
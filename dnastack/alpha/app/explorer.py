@@ -2,6 +2,7 @@ import json
 from typing import Optional
 from urllib.parse import urljoin
 
+from imagination import container
 from pydantic import BaseModel
 
 from dnastack.alpha.app.publisher_helper.collection_service import BlobApiMixin, RootCollectionApiMixin, \
@@ -12,6 +13,7 @@ from dnastack.client.collections.client import CollectionServiceClient
 from dnastack.client.collections.model import Collection as CollectionModel
 from dnastack.client.data_connect import DataConnectClient
 from dnastack.client.drs import DrsClient, Blob
+from dnastack.client.drs_blob_cache import BlobCache
 from dnastack.client.factory import EndpointRepository
 from dnastack.client.models import ServiceEndpoint
 from dnastack.common.logger import get_logger_for
@@ -34,7 +36,8 @@ class Collection(PerCollectionApiMixin, BlobApiMixin):
                  factory: EndpointRepository,
                  cs: CollectionServiceClient,
                  collection: CollectionModel,
-                 no_auth: bool):
+                 no_auth: bool,
+                 use_blob_cache: bool = False):
         self._logger = get_logger_for(self)
         self._factory = factory
         self._cs = cs
@@ -43,6 +46,9 @@ class Collection(PerCollectionApiMixin, BlobApiMixin):
         self._dc: DataConnectClient = self.data_connect()
         self._drs: DrsClient = self._factory.get_one_of(client_class=DrsClient)
 
+        if use_blob_cache:
+            self._drs.blob_cache = container.get(BlobCache)
+
     def get_record(self) -> CollectionModel:
         return self._collection
 
@@ -118,21 +124,24 @@ class Explorer(RootCollectionApiMixin):
             blob: Optional[Blob] = collection.blob(id='123-456') or collection.blob(name='foo-bar')
             blobs: Dict[str, Optional[Blob]] = collection.blobs(ids=['123-456']) or collection.blobs(names=['foo-bar'])
 
+        With "use_blob_cache", the content of the blobs is read from and stored into the local blob cache.
     """
 
-    def __init__(self, context_name_or_url: str, *, no_auth: bool = False):
+    def __init__(self, context_name_or_url: str, *, no_auth: bool = False, use_blob_cache: bool = False):
         self._logger = get_logger_for(self)
         self._context_name_or_url = context_name_or_url
         self._factory = use(self._context_name_or_url, no_auth=no_auth)
         self._cs: CollectionServiceClient = self._factory.get_one_of(client_class=CollectionServiceClient)
         self._no_auth = no_auth
+        self._use_blob_cache = use_blob_cache
 
     def collection(self, id_or_slug_name: Optional[str] = None, *, name: Optional[str] = None) -> Collection:
         # NOTE: "ID" and "slug name" are unique identifier whereas "name" is not.
         return Collection(self._factory,
                           self._cs,
                           self.get_collection_info(id_or_slug_name=id_or_slug_name, name=name),
-                          no_auth=self._no_auth)
+                          no_auth=self._no_auth,
+                          use_blob_cache=self._use_blob_cache)
 
     def get_filtered_data(self, signed_url):
         return FilterOperation(signed_url)
@@ -138,8 +138,10 @@ class BlobApiMixin:
             self.query(f"SELECT id, name FROM ({collection.itemsQuery}) WHERE {conditions}").load_data()
         ).to_map(lambda row: row['id'], lambda row: row['name'])
 
+        blobs = self._drs.get_blobs(id_to_name_map.keys(), no_auth=self._no_auth)
+
         return {
-            id if ids is not None else id_to_name_map[id]: self._drs.get_blob(id)
+            id if ids is not None else id_to_name_map[id]: blobs[id]
             for id in id_to_name_map.keys()
         }
 
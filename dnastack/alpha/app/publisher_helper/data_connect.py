@@ -1,6 +1,7 @@
 from typing import Iterator, Dict, Any, List
 
 from dnastack import DataConnectClient
+from dnastack.client.data_connect_arrow import import_pyarrow, rows_to_data_frame, to_arrow_table, to_data_frame
 from dnastack.common.exceptions import DependencyError
 
 
@@ -19,11 +20,22 @@ class SearchOperation:
     def to_list(self) -> List[Dict[str, Any]]:
         return [row for row in self.load_data()]
 
-    def to_data_frame(self):
+    def iterate_record_batches(self, decimal_as: str = 'decimal') -> Iterator[Any]:
+        """ Iterate the result as Arrow record batches, one per page (requires pyarrow) """
+        return self._dc.query_record_batches(self.__query, no_auth=self._no_auth, decimal_as=decimal_as)
+
+    def to_arrow(self, decimal_as: str = 'decimal'):
+        """ Load the result as an Arrow table (requires pyarrow) """
+        return to_arrow_table(self.iterate_record_batches(decimal_as=decimal_as))
+
+    def to_data_frame(self, decimal_as: str = 'decimal'):
+        """ Load the result as a pandas data frame (requires pandas)
+
+            With pyarrow, the column types are taken from the data model. Otherwise, they are inferred by pandas.
+        """
         try:
-            # We delay the import as late as possible so that the optional dependency (pandas)
-            # does not block the other functionalities of the library.
-            import pandas as pd
-            return pd.DataFrame(self.load_data())
-        except ImportError:
-            raise DependencyError('pandas')
+            import_pyarrow()
+        except DependencyError:
+            return rows_to_data_frame(self.load_data())
+
+        return to_data_frame(self.to_arrow(decimal_as=decimal_as))
@@ -1,8 +1,11 @@
 from typing import Iterator, Dict, Any, List
 
 from dnastack.client.data_connect import QueryLoader
+from dnastack.client.data_connect_arrow import import_pyarrow, iterate_record_batches, rows_to_data_frame, \
+    to_arrow_table, to_data_frame
 from dnastack.client.result_iterator import ResultIterator
 from dnastack.common.exceptions import DependencyError
+from dnastack.http.session import HttpSession
 
 
 class FilterOperation:
@@ -10,20 +13,35 @@ class FilterOperation:
         self._signed_url = signed_url
 
     def __iter__(self):
-        return ResultIterator(QueryLoader(initial_url=self._signed_url))
-
+        return self.load_data()
 
     def load_data(self) -> Iterator[Dict[str, Any]]:
-        return ResultIterator(QueryLoader(initial_url=self._signed_url))
+        return ResultIterator(self.__create_loader())
 
     def to_list(self) -> List[Dict[str, Any]]:
         return [row for row in self.load_data()]
 
-    def to_data_frame(self):
+    def iterate_record_batches(self, decimal_as: str = 'decimal') -> Iterator[Any]:
+        """ Iterate the result as Arrow record batches, one per page (requires pyarrow) """
+        return iterate_record_batches(self.__create_loader(), decimal_as=decimal_as)
+
+    def to_arrow(self, decimal_as: str = 'decimal'):
+        """ Load the result as an Arrow table (requires pyarrow) """
+        return to_arrow_table(self.iterate_record_batches(decimal_as=decimal_as))
+
+    def to_data_frame(self, decimal_as: str = 'decimal'):
+        """ Load the result as a pandas data frame (requires pandas)
+
+            With pyarrow, the column types are taken from the data model. Otherwise, they are inferred by pandas.
+        """
         try:
-            # We delay the import as late as possible so that the optional dependency (pandas)
-            # does not block the other functionalities of the library.
-            import pandas as pd
-            return pd.DataFrame(self.load_data())
-        except ImportError:
-            raise DependencyError('pandas')
+            import_pyarrow()
+        except DependencyError:
+            return rows_to_data_frame(self.load_data())
+
+        return to_data_frame(self.to_arrow(decimal_as=decimal_as))
+
+    def __create_loader(self) -> QueryLoader:
+        # NOTE: The signed URL does not require authentication.
+        return QueryLoader(initial_url=self._signed_url,
+                           http_session=HttpSession(suppress_error=False, enable_auth=False))
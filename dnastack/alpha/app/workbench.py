@@ -14,7 +14,9 @@ from dnastack.client.workbench.ewes.models import ExtendedRunListOptions, Extend
 from dnastack.client.workbench.workflow.client import WorkflowClient
 from dnastack.client.workbench.workflow.models import Workflow, WorkflowVersion, WorkflowSource, WorkflowListOptions, \
     WorkflowDescriptor
+from dnastack.common.exceptions import DependencyError
 from dnastack.common.logger import get_logger
+from dnastack.http.async_session import import_httpx
 
 
 class WorkbenchBatchException(Exception):
@@ -142,7 +144,33 @@ class Workbench:
 		return self._get_ewes_client().get_run(run_id, include_tasks)
 
 	def describe_batch(self, batch_id: str) -> Iterator[ExtendedRunStatus]:
-		return self._get_ewes_client().list_runs(list_options=ExtendedRunListOptions(tag=[f"batch_id:{batch_id}"]))
+		return self._get_ewes_client().list_runs(list_options=self._get_batch_list_options(batch_id))
+
+	# NOTE: The asynchronous methods of the client require httpx, which is optional. Without it, the blocking methods
+	#       run on the default executor so that the event loop is not blocked either.
+	async def _describe_batch_async(self, batch_id: str) -> List[ExtendedRunStatus]:
+		if self._is_async_client_available():
+			return [run async for run in self._get_ewes_client().list_runs_async(list_options=self._get_batch_list_options(batch_id))]
+		else:
+			return await asyncio.get_running_loop().run_in_executor(None, lambda: list(self.describe_batch(batch_id)))
+
+	async def _describe_run_async(self, run_id: str) -> ExtendedRun:
+		if self._is_async_client_available():
+			return await self._get_ewes_client().get_run_async(run_id)
+		else:
+			return await asyncio.get_running_loop().run_in_executor(None, self.describe_run, run_id, False)
+
+	@staticmethod
+	def _get_batch_list_options(batch_id: str) -> ExtendedRunListOptions:
+		return ExtendedRunListOptions(tag=[f"batch_id:{batch_id}"])
+
+	@staticmethod
+	def _is_async_client_available() -> bool:
+		try:
+			import_httpx()
+			return True
+		except DependencyError:
+			return False
 
 	def submit_batch(self, batch: BatchRunRequest, batch_id:Optional[str]=None) -> str:
 		self._logger.debug("Submitting batch request: "+json.dumps(batch.dict()))
@@ -187,10 +215,10 @@ class Workbench:
 	# - If any run has a failed status, then that status is returned, otherwise
 	# - If any run has a canceled status, then that status is returned, otherwise
 	# - If the runs are not all in the same state, then RunStatus.Unknown is returned.
-	def _get_unanimous_state(self, batch_id:str) -> RunStatus:
+	async def _get_unanimous_state(self, batch_id:str) -> RunStatus:
 		batch_error_message = ""
 		current_unanimous_state = None
-		runs_in_batch = self.describe_batch(batch_id)
+		runs_in_batch = await self._describe_batch_async(batch_id)
 		for run in runs_in_batch:
 			this_runs_state = RunStatus(run.state)
 			if this_runs_state.has_failed():
@@ -214,7 +242,7 @@ class Workbench:
 		current_unanimous_state = None
 		last_unanimous_state = RunStatus.UNKNOWN
 		while current_unanimous_state != desired_state:
-			current_unanimous_state = self._get_unanimous_state(batch_id)
+			current_unanimous_state = await self._get_unanimous_state(batch_id)
 			if current_unanimous_state != last_unanimous_state:
 				on_state_change(current_unanimous_state, batch_id)
 			last_unanimous_state = current_unanimous_state
@@ -225,7 +253,8 @@ class Workbench:
 		current_state = RunStatus.UNKNOWN
 		run=None
 		while current_state != desired_state:
-			run = self.describe_run(run_id)
+			# NOTE: The run is fetched asynchronously so that the other runs can be polled at the same time.
+			run = await self._describe_run_async(run_id)
 			current_state = RunStatus(run.state)
 			if current_state.has_failed():
 				raise WorkbenchRunException("Run "+run.run_id+" has failed with status "+run.state, [run.run_id])
@@ -11,7 +11,7 @@ from pydantic import BaseModel, ValidationError, Field
 
 from dnastack.client.base_client import BaseServiceClient
 from dnastack.client.base_exceptions import UnauthenticatedApiAccessError, UnauthorizedApiAccessError, DataConnectError
-from dnastack.client.result_iterator import ResultLoader, InactiveLoaderError, ResultIterator
+from dnastack.client.result_iterator import ResultLoader, InactiveLoaderError, ResultIterator, UrlHistory
 from dnastack.client.service_registry.models import ServiceType
 from dnastack.http.session import HttpSession, HttpError, ClientError
 
@@ -156,76 +156,80 @@ class RunListLoader(ResultLoader):
         self.__page_token = page_token
         self.__current_url: Optional[str] = None
         self.__active = True
-        self.__visited_urls: List[str] = Field(default_factory=list)
+        self.__visited_urls = UrlHistory()
 
     def load(self) -> List[_Status]:
         if not self.__active:
             raise InactiveLoaderError(self.__initial_url)
 
-        with self.__http_session as session:
-            current_url = self.__initial_url
-
-            params = dict()
-            if self.__page_size:
-                params['page_size'] = self.__page_size
-            if self.__page_token:
-                params['page_token'] = self.__page_token
-
-            try:
-                response = session.get(current_url, params=params)
-            except HttpError as e:
-                status_code = e.response.status_code
-                response_text = e.response.text
-
-                self.__visited_urls.append(current_url)
-
-                if status_code == 401:
-                    raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_text))
-                elif status_code == 403:
-                    raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_text))
-                elif status_code >= 400:  # Catch all errors
-                    raise DataConnectError(
-                        f'Unexpected error: {response_text}',
-                        status_code,
-                        response_text,
-                        urls=self.__visited_urls
-                    )
-
-            status_code = response.status_code
-            response_text = response.text
-
-            try:
-                response_body = response.json() if response_text else dict()
-            except Exception:
-                self.logger.error(f'{self.__initial_url}: Unexpectedly non-JSON response body from {current_url}')
-                raise DataConnectError(
-                    f'Unable to deserialize JSON from {response_text}.',
-                    status_code,
-                    response_text,
-                    urls=self.__visited_urls
-                )
+        session = self.__http_session
+        current_url = self.__initial_url
+
+        params = dict()
+        if self.__page_size:
+            params['page_size'] = self.__page_size
+        if self.__page_token:
+            params['page_token'] = self.__page_token
 
-            try:
-                api_response = RunListResponse(**response_body)
-            except ValidationError:
+        try:
+            response = session.get(current_url, params=params)
+        except HttpError as e:
+            status_code = e.response.status_code
+            response_text = e.response.text
+
+            self.__visited_urls.append(current_url)
+
+            if status_code == 401:
+                raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_text))
+            elif status_code == 403:
+                raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_text))
+            elif status_code >= 400:  # Catch all errors
                 raise DataConnectError(
-                    f'Invalid Response Body: {response_body}',
+                    f'Unexpected error: {response_text}',
                     status_code,
                     response_text,
                     urls=self.__visited_urls
                 )
 
-            self.logger.debug(f'Response:\n{pformat(response_body, indent=2)}')
+        status_code = response.status_code
+        response_text = response.text
 
-            self.__page_token = api_response.next_page_token or None
-            if not self.__page_token:
-                self.__active = False
+        try:
+            response_body = response.json() if response_text else dict()
+        except Exception:
+            self.logger.error(f'{self.__initial_url}: Unexpectedly non-JSON response body from {current_url}')
+            raise DataConnectError(
+                f'Unable to deserialize JSON from {response_text}.',
+                status_code,
+                response_text,
+                urls=self.__visited_urls
+            )
+
+        try:
+            api_response = RunListResponse(**response_body)
+        except ValidationError:
+            raise DataConnectError(
+                f'Invalid Response Body: {response_body}',
+                status_code,
+                response_text,
+                urls=self.__visited_urls
+            )
 
-            return api_response.runs
+        self.logger.debug(f'Response:\n{pformat(response_body, indent=2)}')
+
+        self.__page_token = api_response.next_page_token or None
+        if not self.__page_token:
+            self.__active = False
+
+        return api_response.runs
 
     def has_more(self) -> bool:
         return self.__active or self.__current_url
 
+    def close(self):
+        if self.__http_session:
+            self.__http_session.close()
+
     def __generate_api_error_feedback(self, response_body) -> str:
         if self.__current_url:
             return f'Failed to load a follow-up page of the table list from {self.__current_url} ({response_body})'
@@ -0,0 +1,10 @@
+from dnastack.cli.commands.cache.commands import init_cache_commands
+from dnastack.cli.core.group import formatted_group
+
+
+@formatted_group("cache")
+def cache_command_group():
+    """ Manage the local cache of query results """
+
+# Initialize all commands
+init_cache_commands(cache_command_group)
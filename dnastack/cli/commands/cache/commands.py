@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Optional
+
+import click
+from click import Group
+from imagination import container
+
+from dnastack.cli.commands.drs.utils import _format_byte_size
+from dnastack.cli.core.command import formatted_command
+from dnastack.cli.core.command_spec import RESOURCE_OUTPUT_ARG
+from dnastack.cli.helpers.iterator_printer import show_iterator
+from dnastack.client.data_connect_cache import QueryResultCache, QueryCacheEntry
+
+
+def init_cache_commands(group: Group):
+    @formatted_command(
+        group=group,
+        name='list',
+        specs=[
+            RESOURCE_OUTPUT_ARG,
+        ]
+    )
+    def list_entries(output: Optional[str] = None):
+        """ List the cached query results, from the least recently used """
+        cache: QueryResultCache = container.get(QueryResultCache)
+        show_iterator(output, cache.list_entries(), transform=_transform_entry)
+        click.secho(f'Total: {_format_byte_size(cache.size())} of {_format_byte_size(cache.max_size)} '
+                    f'in {cache.dir_path}',
+                    dim=True,
+                    err=True)
+
+    @formatted_command(
+        group=group,
+        name='prune',
+        specs=[]
+    )
+    def prune():
+        """ Remove the expired results and the least recently used results exceeding the size limit """
+        cache: QueryResultCache = container.get(QueryResultCache)
+        removed_entries = cache.prune()
+        removed_size = sum([entry.size for entry in removed_entries])
+        click.secho(f'Removed {len(removed_entries)} cached result{"s" if len(removed_entries) != 1 else ""} '
+                    f'({_format_byte_size(removed_size)})',
+                    fg='green',
+                    err=True)
+
+    @formatted_command(
+        group=group,
+        name='clear',
+        specs=[]
+    )
+    def clear():
+        """ Remove all cached results """
+        cache: QueryResultCache = container.get(QueryResultCache)
+        removed_count = cache.clear()
+        click.secho(f'Removed {removed_count} cached result{"s" if removed_count != 1 else ""}',
+                    fg='green',
+                    err=True)
+
+
+def _transform_entry(entry: QueryCacheEntry):
+    return dict(
+        key=entry.key,
+        endpoint_url=entry.endpoint_url,
+        query=entry.query,
+        row_count=entry.row_count,
+        size=_format_byte_size(entry.size),
+        created_at=datetime.fromtimestamp(entry.created_at).isoformat(),
+        last_used_at=datetime.fromtimestamp(entry.last_used_at).isoformat(),
+        expires_at=datetime.fromtimestamp(entry.expires_at).isoformat(),
+        expired=entry.is_expired(),
+    )
@@ -8,10 +8,11 @@ from click import Group
 from dnastack.cli.commands.collections.utils import _filter_collection_fields, _simplify_collection, _get, \
     _transform_to_public_collection, COLLECTION_ID_CLI_ARG, _abort_with_collection_list, _switch_to_data_connect, \
     _get_context
-from dnastack.cli.commands.dataconnect.utils import DECIMAL_POINT_OUTPUT_ARG, handle_query
+from dnastack.cli.commands.dataconnect.utils import DECIMAL_POINT_OUTPUT_ARG, CACHE_TTL_ARG, \
+    CHECKPOINT_FILE_ARG, handle_query
 from dnastack.cli.core.command import formatted_command
-from dnastack.cli.core.command_spec import ArgumentSpec, RESOURCE_OUTPUT_ARG, DATA_OUTPUT_ARG, CONTEXT_ARG, \
-    SINGLE_ENDPOINT_ID_ARG, ArgumentType
+from dnastack.cli.core.command_spec import ArgumentSpec, RESOURCE_OUTPUT_ARG, DATA_EXPORT_OUTPUT_ARG, CONTEXT_ARG, \
+    SINGLE_ENDPOINT_ID_ARG, ArgumentType, OUTPUT_FILE_ARG
 from dnastack.cli.helpers.exporter import to_json
 from dnastack.cli.helpers.iterator_printer import show_iterator
 from dnastack.common.logger import get_logger
@@ -202,7 +203,10 @@ def init_collections_commands(group: Group):
             ),
             COLLECTION_ID_CLI_ARG,
             DECIMAL_POINT_OUTPUT_ARG,
-            DATA_OUTPUT_ARG,
+            DATA_EXPORT_OUTPUT_ARG,
+            OUTPUT_FILE_ARG,
+            CACHE_TTL_ARG,
+            CHECKPOINT_FILE_ARG,
             CONTEXT_ARG,
             SINGLE_ENDPOINT_ID_ARG,
         ]
@@ -211,9 +215,12 @@ def init_collections_commands(group: Group):
                          endpoint_id: Optional[str],
                          collection: Optional[str],
                          query: str,
-                         decimal_as: str = 'string',
+                         decimal_as: Optional[str] = None,
                          no_auth: bool = False,
-                         output: Optional[str] = None):
+                         output: Optional[str] = None,
+                         output_file: Optional[str] = None,
+                         cache_ttl: Optional[int] = None,
+                         checkpoint_file: Optional[str] = None):
         """ Query data """
         trace = Span(origin='cli.collections.query')
         client = _switch_to_data_connect(_get_context(context), _get(context, endpoint_id), collection, no_auth=no_auth)
@@ -221,5 +228,8 @@ def init_collections_commands(group: Group):
                             decimal_as=decimal_as,
                             no_auth=no_auth,
                             output_format=output,
+                            output_file=output_file,
+                            cache_ttl=cache_ttl,
+                            checkpoint_file=checkpoint_file,
                             trace=trace)
 
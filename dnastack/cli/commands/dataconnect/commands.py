@@ -3,10 +3,10 @@ from typing import Optional
 from click import Group
 
 from dnastack.cli.core.command import formatted_command
-from dnastack.cli.core.command_spec import DATA_OUTPUT_ARG, ArgumentType, ArgumentSpec, CONTEXT_ARG, \
-    SINGLE_ENDPOINT_ID_ARG
+from dnastack.cli.core.command_spec import DATA_EXPORT_OUTPUT_ARG, ArgumentType, ArgumentSpec, CONTEXT_ARG, \
+    SINGLE_ENDPOINT_ID_ARG, OUTPUT_FILE_ARG
 from dnastack.common.tracing import Span
-from .utils import DECIMAL_POINT_OUTPUT_ARG, handle_query, _get
+from .utils import DECIMAL_POINT_OUTPUT_ARG, CACHE_TTL_ARG, CHECKPOINT_FILE_ARG, handle_query, _get
 
 
 def init_data_connect_commands(group: Group):
@@ -28,8 +28,11 @@ def init_data_connect_commands(group: Group):
                 required=False,
                 hidden=True,
             ),
-            DATA_OUTPUT_ARG,
+            DATA_EXPORT_OUTPUT_ARG,
+            OUTPUT_FILE_ARG,
             DECIMAL_POINT_OUTPUT_ARG,
+            CACHE_TTL_ARG,
+            CHECKPOINT_FILE_ARG,
             CONTEXT_ARG,
             SINGLE_ENDPOINT_ID_ARG,
         ]
@@ -38,7 +41,10 @@ def init_data_connect_commands(group: Group):
                            endpoint_id: Optional[str],
                            query: str,
                            output: Optional[str] = None,
-                           decimal_as: str = 'string',
+                           output_file: Optional[str] = None,
+                           decimal_as: Optional[str] = None,
+                           cache_ttl: Optional[int] = None,
+                           checkpoint_file: Optional[str] = None,
                            no_auth: bool = False):
         """ Perform a search query """
         trace = Span(origin='cli.data_connect.query')
@@ -47,4 +53,7 @@ def init_data_connect_commands(group: Group):
                             decimal_as=decimal_as,
                             no_auth=no_auth,
                             output_format=output,
+                            output_file=output_file,
+                            cache_ttl=cache_ttl,
+                            checkpoint_file=checkpoint_file,
                             trace=trace)
@@ -4,9 +4,9 @@ import click
 
 from dnastack.cli.core.command import formatted_command
 from dnastack.cli.core.command_spec import RESOURCE_OUTPUT_ARG, ArgumentSpec, ArgumentType, CONTEXT_ARG, \
-    SINGLE_ENDPOINT_ID_ARG
+    SINGLE_ENDPOINT_ID_ARG, DATA_EXPORT_OUTPUT_ARG, OUTPUT_FILE_ARG
 from dnastack.cli.core.group import formatted_group
-from .utils import _get
+from .utils import _get, DECIMAL_POINT_OUTPUT_ARG, handle_data_output
 from ...helpers.exporter import to_json, to_yaml
 from ...helpers.iterator_printer import show_iterator
 
@@ -72,3 +72,44 @@ def get_table_info(context: Optional[str],
     """ Get info from the given table """
     obj = _get(context=context, id=endpoint_id).table(table_name, no_auth=no_auth).info.dict()
     click.echo((to_json if output == 'json' else to_yaml)(obj))
+
+
+@formatted_command(
+    group=tables_command_group,
+    name='export',
+    specs=[
+        ArgumentSpec(
+            name='table_name',
+            arg_type=ArgumentType.POSITIONAL,
+            help='The table name.',
+            required=True,
+        ),
+        ArgumentSpec(
+            name='no_auth',
+            arg_names=['--no-auth'],
+            help='Skip automatic authentication if set',
+            type=bool,
+            required=False,
+            hidden=True,
+        ),
+        DATA_EXPORT_OUTPUT_ARG,
+        OUTPUT_FILE_ARG,
+        DECIMAL_POINT_OUTPUT_ARG,
+        CONTEXT_ARG,
+        SINGLE_ENDPOINT_ID_ARG,
+    ]
+)
+def export_table_data(context: Optional[str],
+                      endpoint_id: Optional[str],
+                      table_name: str,
+                      no_auth: bool = False,
+                      output: Optional[str] = None,
+                      output_file: Optional[str] = None,
+                      decimal_as: Optional[str] = None):
+    """ Export the data from the given table """
+    table = _get(context=context, id=endpoint_id).table(table_name, no_auth=no_auth)
+    handle_data_output(lambda: table.data,
+                       lambda columnar_decimal_as: table.iterate_record_batches(decimal_as=columnar_decimal_as),
+                       decimal_as=decimal_as,
+                       output_format=output,
+                       output_file=output_file)
@@ -1,20 +1,43 @@
+import json
 import os
-from typing import Optional
+import sys
+from contextlib import redirect_stdout
+from typing import Optional, Callable, Iterator, Any, Dict
 
+import click
 from imagination import container
 
 from dnastack.cli.core.command_spec import ArgumentSpec
 from dnastack.cli.helpers.client_factory import ConfigurationBasedClientFactory
-from dnastack.cli.helpers.iterator_printer import show_iterator
+from dnastack.cli.helpers.iterator_printer import show_iterator, OutputFormat
 from dnastack.client.data_connect import DataConnectClient
+from dnastack.client.data_connect_arrow import write_record_batches
+from dnastack.client.result_iterator import ResultCheckpoint
 from dnastack.common.tracing import Span
 
 DECIMAL_POINT_OUTPUT_ARG = ArgumentSpec(
     name='decimal_as',
     arg_names=['--decimal-as'],
-    help='The format of the decimal value',
-    choices=["string", "float"],
-    default="string",
+    help='The format of the decimal value. By default, it is "decimal" (exact decimal types) for the columnar output '
+         'formats, and "string" for the others, for which "decimal" is the same as "string".',
+    choices=["decimal", "string", "float"],
+)
+
+CACHE_TTL_ARG = ArgumentSpec(
+    name='cache_ttl',
+    arg_names=['--cache-ttl'],
+    help='The number of seconds to keep the result in the local query cache. If the same query has been run within '
+         'that period, the cached result is used. Use "dnastack cache" to manage the cache.',
+    type=int,
+)
+
+CHECKPOINT_FILE_ARG = ArgumentSpec(
+    name='checkpoint_file',
+    arg_names=['--checkpoint-file'],
+    help='The file to save the progress of the query to after each page. If the file exists, the query resumes from '
+         'the saved progress and only outputs the remaining rows, without the opening bracket (JSON) or the header '
+         '(CSV), so that the output can be appended to the output of the interrupted run. The file is removed once '
+         'the query completes. This is not available with --output-file or the columnar output formats.',
 )
 
 
@@ -25,20 +48,26 @@ def _get(context: Optional[str] = None, id: Optional[str] = None) -> DataConnect
 
 def handle_query(data_connect: DataConnectClient,
                  query: str,
-                 decimal_as: str = 'string',
+                 decimal_as: Optional[str] = None,
                  no_auth: bool = False,
                  output_format: Optional[str] = None,
                  allow_using_query_from_file: bool = False,
-                 trace: Optional[Span] = None):
+                 trace: Optional[Span] = None,
+                 output_file: Optional[str] = None,
+                 cache_ttl: Optional[int] = None,
+                 checkpoint_file: Optional[str] = None):
     """
     Initiate a Data Connect query
     :param data_connect: The Data Connect client
     :param query: The query to the endpoint
-    :param decimal_as: Decimal representation
+    :param decimal_as: Decimal representation (see "handle_data_output")
     :param no_auth: Flag to disable authentication or temporarily disregard session info
     :param output_format: Output format (e.g., JSON, CSV, YAML)
     :param allow_using_query_from_file: Flag to allow the CLI user to run a query from a file
     :param trace: Distributed Trace Context
+    :param output_file: The path to the output file (required by the columnar formats, e.g., Parquet)
+    :param cache_ttl: The number of seconds to keep the result in the local query cache
+    :param checkpoint_file: The path to the file to save the progress to, and to resume from
     :return:
     """
     actual_query = query
@@ -52,5 +81,117 @@ def handle_query(data_connect: DataConnectClient,
             else:
                 raise IOError(f'File not found: {query_file_path}')
 
-    iterator = data_connect.query(actual_query, no_auth=no_auth, trace=trace)
-    show_iterator(output_format, iterator, decimal_as=decimal_as, sort_keys=False)
+    if checkpoint_file:
+        if output_format in OutputFormat.COLUMNAR:
+            raise click.UsageError(f'--checkpoint-file is not available for the "{output_format}" output format.')
+        elif cache_ttl:
+            raise click.UsageError('--checkpoint-file and --cache-ttl cannot be used together.')
+        elif output_file:
+            # NOTE: The output file would be overwritten by the remaining rows when the query is resumed.
+            raise click.UsageError('--checkpoint-file and --output-file cannot be used together.')
+
+    checkpoint = _load_checkpoint(checkpoint_file, actual_query) if checkpoint_file else None
+
+    def load_rows():
+        if checkpoint_file:
+            return _iterate_with_checkpoint(data_connect, actual_query, checkpoint_file, checkpoint, no_auth, trace)
+        else:
+            return data_connect.query(actual_query, no_auth=no_auth, trace=trace, cache_ttl=cache_ttl)
+
+    handle_data_output(load_rows,
+                       lambda columnar_decimal_as: data_connect.query_record_batches(actual_query,
+                                                                                     no_auth=no_auth,
+                                                                                     trace=trace,
+                                                                                     decimal_as=columnar_decimal_as,
+                                                                                     cache_ttl=cache_ttl),
+                       decimal_as=decimal_as,
+                       output_format=output_format,
+                       output_file=output_file,
+                       continued=bool(checkpoint and checkpoint.row_count > 0))
+
+
+def handle_data_output(load_rows: Callable[[], Iterator[Dict[str, Any]]],
+                       load_record_batches: Callable[[str], Iterator[Any]],
+                       decimal_as: Optional[str] = None,
+                       output_format: Optional[str] = None,
+                       output_file: Optional[str] = None,
+                       continued: bool = False):
+    """
+    Print or export the data
+
+    With the columnar formats, the data is written to the output file page by page as Arrow record batches.
+
+    :param load_rows: The function to start loading the data as rows
+    :param load_record_batches: The function to start loading the data as Arrow record batches, given the decimal
+                                representation
+    :param decimal_as: Decimal representation, i.e., "decimal", "string", or "float". By default, the decimal values
+                       are exported as the decimal types to the columnar formats, and printed as strings otherwise.
+    :param output_format: Output format (e.g., JSON, CSV, YAML, Parquet)
+    :param output_file: The path to the output file
+    :param continued: Whether the output continues the output of an interrupted run (see "show_iterator")
+    """
+    if output_format in OutputFormat.COLUMNAR:
+        if not output_file:
+            raise click.UsageError(f'--output-file is required for the "{output_format}" output format.')
+
+        row_count = write_record_batches(load_record_batches(decimal_as or 'decimal'), output_file, output_format)
+        click.secho(f'Exported {row_count} row{"s" if row_count != 1 else ""} to {output_file}',
+                    dim=True,
+                    err=True)
+    elif output_file:
+        with open(output_file, 'w') as f:
+            with redirect_stdout(f):
+                show_iterator(output_format, load_rows(), decimal_as=decimal_as, sort_keys=False, continued=continued)
+    else:
+        show_iterator(output_format, load_rows(), decimal_as=decimal_as, sort_keys=False, continued=continued)
+
+
+def _load_checkpoint(checkpoint_file: str, query: str) -> Optional[ResultCheckpoint]:
+    """ Load the checkpoint from the file, if it exists """
+    if not os.path.exists(checkpoint_file):
+        return None
+
+    with open(checkpoint_file, 'r') as f:
+        checkpoint = ResultCheckpoint(**json.load(f))
+
+    if checkpoint.position.get('query') != query:
+        raise click.UsageError(f'The checkpoint file ({checkpoint_file}) is for a different query.')
+
+    return checkpoint
+
+
+def _iterate_with_checkpoint(data_connect: DataConnectClient,
+                             query: str,
+                             checkpoint_file: str,
+                             checkpoint: Optional[ResultCheckpoint],
+                             no_auth: bool,
+                             trace: Optional[Span]) -> Iterator[Dict[str, Any]]:
+    """ Iterate the query result, from the checkpoint if given, while saving the checkpoint to the file after each
+        page
+    """
+    if checkpoint:
+        click.secho(f'Resuming the query after {checkpoint.row_count} row{"s" if checkpoint.row_count != 1 else ""}',
+                    dim=True,
+                    err=True)
+        iterator = data_connect.resume(checkpoint, no_auth=no_auth, trace=trace)
+    else:
+        iterator = data_connect.query(query, no_auth=no_auth, trace=trace)
+
+    for page in iterator.iter_pages():
+        yield from page
+
+        # NOTE: The rows of the page must be written out before the progress is saved so that no rows are lost if the
+        #       process is interrupted.
+        sys.stdout.flush()
+        _save_checkpoint(checkpoint_file, iterator.checkpoint())
+
+    # The query is completed.
+    if os.path.exists(checkpoint_file):
+        os.unlink(checkpoint_file)
+
+
+def _save_checkpoint(checkpoint_file: str, checkpoint: ResultCheckpoint):
+    temp_file_path = f'{checkpoint_file}.swap'
+    with open(temp_file_path, 'w') as f:
+        f.write(checkpoint.json())
+    os.replace(temp_file_path, checkpoint_file)
@@ -0,0 +1,10 @@
+from dnastack.cli.commands.debug.circuit_breakers import circuit_breaker_command_group
+from dnastack.cli.core.group import formatted_group
+
+
+@formatted_group("debug")
+def debug_command_group():
+    """ Inspect the internal state of the client for troubleshooting """
+
+# Register sub-groups
+debug_command_group.add_command(circuit_breaker_command_group)
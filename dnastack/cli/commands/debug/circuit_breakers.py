@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Optional
+
+import click
+from imagination import container
+
+from dnastack.cli.core.command import formatted_command
+from dnastack.cli.core.command_spec import ArgumentSpec, ArgumentType, RESOURCE_OUTPUT_ARG
+from dnastack.cli.core.group import formatted_group
+from dnastack.cli.helpers.iterator_printer import show_iterator
+from dnastack.http.circuit_breaker import CircuitBreakerRegistry, CircuitBreakerSnapshot
+
+
+@formatted_group("circuit-breakers")
+def circuit_breaker_command_group():
+    """ Inspect the circuit breakers stopping the requests to the failing hosts """
+
+
+@formatted_command(
+    group=circuit_breaker_command_group,
+    name='list',
+    specs=[
+        RESOURCE_OUTPUT_ARG,
+    ]
+)
+def list_circuit_breakers(output: Optional[str] = None):
+    """ List the hosts with open circuits """
+    registry: CircuitBreakerRegistry = container.get(CircuitBreakerRegistry)
+    show_iterator(output, registry.list_snapshots(), transform=_transform_snapshot)
+
+
+@formatted_command(
+    group=circuit_breaker_command_group,
+    name='reset',
+    specs=[
+        ArgumentSpec(
+            name='host',
+            arg_type=ArgumentType.POSITIONAL,
+            help='The host (e.g., "api.dnastack.com") or the URL to reset. By default, all circuits are reset.',
+            required=False,
+        ),
+    ]
+)
+def reset_circuit_breakers(host: Optional[str] = None):
+    """ Close the circuits so that the requests are sent to the hosts again """
+    registry: CircuitBreakerRegistry = container.get(CircuitBreakerRegistry)
+    reset_count = registry.reset(host)
+    click.secho(f'Reset {reset_count} circuit{"s" if reset_count != 1 else ""}', fg='green', err=True)
+
+
+def _transform_snapshot(snapshot: CircuitBreakerSnapshot):
+    return dict(
+        host=snapshot.host,
+        state=snapshot.state.value,
+        call_count=snapshot.call_count,
+        failure_count=snapshot.failure_count,
+        slow_call_count=snapshot.slow_call_count,
+        last_failure=snapshot.last_failure,
+        opened_at=datetime.fromtimestamp(snapshot.opened_at).isoformat() if snapshot.opened_at else None,
+        retry_at=datetime.fromtimestamp(snapshot.retry_at).isoformat() if snapshot.retry_at else None,
+    )
@@ -4,12 +4,14 @@ from typing import List, Dict, Optional
 
 import click
 from click import Group
+from imagination import container
 
-from dnastack.cli.commands.drs.utils import _get
+from dnastack.cli.commands.drs.utils import _get, _parse_byte_size, _format_byte_size
 from dnastack.cli.core.command import formatted_command
 from dnastack.cli.core.command_spec import ArgumentSpec, ArgumentType, CONTEXT_ARG, SINGLE_ENDPOINT_ID_ARG
 from dnastack.cli.helpers.printer import echo_result
-from dnastack.client.drs import DownloadOkEvent, DownloadFailureEvent, DownloadProgressEvent
+from dnastack.client.drs_blob_cache import BlobCache
+from dnastack.client.drs import DownloadOkEvent, DownloadFailureEvent, DownloadProgressEvent, DownloadSkippedEvent
 from dnastack.feature_flags import in_interactive_shell
 
 
@@ -44,6 +46,70 @@ def init_drs_commands(group: Group):
                 help='Output directory',
                 required=False,
             ),
+            ArgumentSpec(
+                name='parallel',
+                arg_names=['--parallel', '-n'],
+                help='The maximum number of files downloaded concurrently. By default, it is the number of CPUs.',
+                type=int,
+                required=False,
+            ),
+            ArgumentSpec(
+                name='limit_rate',
+                arg_names=['--limit-rate'],
+                help='The maximum total download speed in bytes per second, e.g., 10M',
+                required=False,
+            ),
+            ArgumentSpec(
+                name='part_size',
+                arg_names=['--part-size'],
+                help='The size of each part of a large file downloaded in parts, e.g., 32M',
+                required=False,
+            ),
+            ArgumentSpec(
+                name='part_concurrency',
+                arg_names=['--part-concurrency'],
+                help='The maximum number of parts of a large file downloaded concurrently. '
+                     'Set to 1 to download each file over a single connection.',
+                type=int,
+                required=False,
+            ),
+            ArgumentSpec(
+                name='part_threshold',
+                arg_names=['--part-threshold'],
+                help='The minimum size of a file to download in parts, e.g., 64M. A file is only downloaded in parts '
+                     'if the server accepts range requests.',
+                required=False,
+            ),
+            ArgumentSpec(
+                name='resume',
+                arg_names=['--resume'],
+                help='Continue the interrupted downloads from their partial files (*.part) in the output directory',
+                type=bool,
+                required=False,
+            ),
+            ArgumentSpec(
+                name='skip_existing',
+                arg_names=['--skip-existing', '--sync'],
+                help='Skip the files already in the output directory with the same size and checksum as provided by '
+                     'the server. With --no-verify, only the sizes are compared.',
+                type=bool,
+                required=False,
+            ),
+            ArgumentSpec(
+                name='use_cache',
+                arg_names=['--use-cache'],
+                help='Use the local blob cache. The cached files are linked into the output directory instead of being '
+                     'downloaded again, and the downloaded files are added to the cache.',
+                type=bool,
+                required=False,
+            ),
+            ArgumentSpec(
+                name='no_verify',
+                arg_names=['--no-verify'],
+                help='Skip the verification of the checksums of the downloaded files',
+                type=bool,
+                required=False,
+            ),
             ArgumentSpec(
                 name='no_auth',
                 arg_names=['--no-auth'],
@@ -62,6 +128,15 @@ def init_drs_commands(group: Group):
                  output_dir: str = os.getcwd(),
                  input_file: str = None,
                  quiet: bool = False,
+                 parallel: Optional[int] = None,
+                 limit_rate: Optional[str] = None,
+                 part_size: Optional[str] = None,
+                 part_concurrency: Optional[int] = None,
+                 part_threshold: Optional[str] = None,
+                 resume: bool = False,
+                 skip_existing: bool = False,
+                 use_cache: bool = False,
+                 no_verify: bool = False,
                  no_auth: bool = False):
         """
         Download files with either DRS IDs or URLs, e.g., drs://<hostname>/<drs_id>.
@@ -69,6 +144,15 @@ def init_drs_commands(group: Group):
         You can find out more about DRS URLs from the Data Repository Service Specification 1.1.0 at
         https://ga4gh.github.io/data-repository-service-schemas/preview/release/drs-1.1.0/docs/#_drs_uris.
         """
+        download_options = dict(part_size=_parse_byte_size(part_size),
+                                part_concurrency=part_concurrency,
+                                part_threshold=_parse_byte_size(part_threshold),
+                                resume=resume,
+                                verify=not no_verify,
+                                parallel=parallel,
+                                limit_rate=_parse_byte_size(limit_rate),
+                                skip_existing=skip_existing)
+
         output_lock = Lock()
         download_urls = []
         full_output = not quiet and in_interactive_shell
@@ -95,6 +179,9 @@ def init_drs_commands(group: Group):
 
         drs = _get(context, endpoint_id)
 
+        if use_cache:
+            drs.blob_cache = container.get(BlobCache)
+
         def display_ok(event: DownloadOkEvent):
             with output_lock:
                 if full_output:
@@ -113,35 +200,53 @@ def init_drs_commands(group: Group):
                 if event.error:
                     click.secho(f' ● Error: {type(event.error).__name__}: {event.error}', dim=True)
 
+        skipped = dict(count=0, byte_count=0)
+
+        def count_skipped(event: DownloadSkippedEvent):
+            with output_lock:
+                skipped['count'] += 1
+                skipped['byte_count'] += event.byte_count or 0
+
         drs.events.on('download-ok', display_ok)
         drs.events.on('download-failure', display_failure)
+        drs.events.on('download-skipped', count_skipped)
 
         stats: Dict[str, DownloadProgressEvent] = dict()
+        aggregate = dict(position=0, total=0)
 
         if not full_output:
             drs._download_files(id_or_urls=download_urls,
                                 output_dir=output_dir,
-                                no_auth=no_auth)
+                                no_auth=no_auth,
+                                **download_options)
         else:
             with click.progressbar(label='Downloading...', color=True, length=1) as progress:
                 def update_progress(event: DownloadProgressEvent):
-                    stats[event.drs_url] = event
+                    with output_lock:
+                        # Replace the previous progress of the same download in the aggregate.
+                        previous_event = stats.get(event.drs_url)
+                        if previous_event:
+                            aggregate['position'] -= previous_event.read_byte_count
+                            aggregate['total'] -= previous_event.total_byte_count
 
-                    # Update the progress bar.
-                    position = 0
-                    total = 0
+                        stats[event.drs_url] = event
+                        aggregate['position'] += event.read_byte_count
+                        aggregate['total'] += event.total_byte_count
 
-                    for e in stats.values():
-                        position += e.read_byte_count
-                        total += e.total_byte_count
+                        # Update the progress bar.
+                        progress.pos = aggregate['position']
+                        progress.length = aggregate['total'] if aggregate['total'] > 0 else 1
 
-                    progress.pos = position
-                    progress.length = total if total > 0 else 1
-
-                    progress.render_progress()
+                        progress.render_progress()
 
                 drs.events.on('download-progress', update_progress)
                 drs._download_files(id_or_urls=download_urls,
                                     output_dir=output_dir,
-                                    no_auth=no_auth)
+                                    no_auth=no_auth,
+                                    **download_options)
             print('DONE')
+
+        if skipped['count'] and not quiet:
+            click.secho(f'Skipped {skipped["count"]} file(s) already downloaded '
+                        f'({_format_byte_size(skipped["byte_count"])} not transferred)',
+                        dim=True)
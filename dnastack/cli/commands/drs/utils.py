@@ -1,11 +1,43 @@
+import re
 from typing import Optional
 
+import click
 from imagination import container
 
 from dnastack.cli.helpers.client_factory import ConfigurationBasedClientFactory
 from dnastack.client.drs import DrsClient
 
+_BYTE_SIZE_UNITS = {
+    '': 1,
+    'K': 1024,
+    'M': 1024 ** 2,
+    'G': 1024 ** 3,
+    'T': 1024 ** 4,
+}
+
 
 def _get(context: Optional[str], id: Optional[str] = None) -> DrsClient:
     factory: ConfigurationBasedClientFactory = container.get(ConfigurationBasedClientFactory)
     return factory.get(DrsClient, context_name=context, endpoint_id=id)
+
+
+def _parse_byte_size(value: Optional[str]) -> Optional[int]:
+    """ Parse the size in bytes, optionally with a binary unit suffix, e.g., "1048576", "512K", "64M", or "1G" """
+    if not value:
+        return None
+
+    matches = re.match(r'^\s*(\d+)\s*([KMGT]?)(i?B)?\s*$', value, re.IGNORECASE)
+    if not matches:
+        raise click.BadParameter(f'The given size ({value}) is not valid. Use a number of bytes, optionally with '
+                                 f'a unit (K, M, G, or T), e.g., 64M.')
+
+    return int(matches.group(1)) * _BYTE_SIZE_UNITS[matches.group(2).upper()]
+
+
+def _format_byte_size(size: int) -> str:
+    """ Format the size in bytes with a binary unit, e.g., "64.0 MiB" """
+    for unit in ['B', 'KiB', 'MiB', 'GiB']:
+        if size < 1024:
+            return f'{size} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} TiB'
@@ -4,12 +4,14 @@ from typing import Optional, List
 import click
 from click import Group
 
-from dnastack.cli.commands.dataconnect.utils import DECIMAL_POINT_OUTPUT_ARG, handle_query
+from dnastack.cli.commands.dataconnect.utils import DECIMAL_POINT_OUTPUT_ARG, CACHE_TTL_ARG, \
+    CHECKPOINT_FILE_ARG, handle_query
 from dnastack.cli.commands.publisher.collections.utils import _filter_collection_fields, _get_collection_service_client, \
     _transform_to_public_collection, COLLECTION_ID_ARG, _switch_to_data_connect, \
     _get_context
 from dnastack.cli.core.command import formatted_command
-from dnastack.cli.core.command_spec import ArgumentSpec, RESOURCE_OUTPUT_ARG, DATA_OUTPUT_ARG, ArgumentType
+from dnastack.cli.core.command_spec import ArgumentSpec, RESOURCE_OUTPUT_ARG, DATA_EXPORT_OUTPUT_ARG, \
+    OUTPUT_FILE_ARG, ArgumentType
 from dnastack.cli.helpers.exporter import to_json, normalize
 from dnastack.cli.helpers.iterator_printer import show_iterator
 from dnastack.client.collections.model import Collection, Tag, CollectionValidationStatus, CollectionStatus
@@ -49,14 +51,20 @@ def init_collections_commands(group: Group):
             ),
             COLLECTION_ID_ARG,
             DECIMAL_POINT_OUTPUT_ARG,
-            DATA_OUTPUT_ARG,
+            DATA_EXPORT_OUTPUT_ARG,
+            OUTPUT_FILE_ARG,
+            CACHE_TTL_ARG,
+            CHECKPOINT_FILE_ARG,
         ]
     )
     def query_collection(collection: str,
                          query: str,
-                         decimal_as: str = 'string',
+                         decimal_as: Optional[str] = None,
                          no_auth: bool = False,
-                         output: Optional[str] = None):
+                         output: Optional[str] = None,
+                         output_file: Optional[str] = None,
+                         cache_ttl: Optional[int] = None,
+                         checkpoint_file: Optional[str] = None):
         """ Query data """
         trace = Span(origin='cli.collections.query')
         client = _switch_to_data_connect(_get_context(), _get_collection_service_client(), collection, no_auth=no_auth)
@@ -64,6 +72,9 @@ def init_collections_commands(group: Group):
                             decimal_as=decimal_as,
                             no_auth=no_auth,
                             output_format=output,
+                            output_file=output_file,
+                            cache_ttl=cache_ttl,
+                            checkpoint_file=checkpoint_file,
                             trace=trace)
 
 
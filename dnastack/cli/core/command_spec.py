@@ -88,3 +88,17 @@ DATA_OUTPUT_ARG = ArgumentSpec(
     help='Output format',
     default=OutputFormat.JSON,
 )
+
+DATA_EXPORT_OUTPUT_ARG = ArgumentSpec(
+    name='output',
+    arg_names=['--output', '-o'],
+    choices=[OutputFormat.CSV, OutputFormat.JSON, OutputFormat.YAML, *OutputFormat.COLUMNAR],
+    help='Output format. The columnar formats (parquet, feather, and arrow-ipc) require --output-file.',
+    default=OutputFormat.JSON,
+)
+
+OUTPUT_FILE_ARG = ArgumentSpec(
+    name='output_file',
+    arg_names=['--output-file'],
+    help='The path to the output file. If not provided, the output is printed to the standard output.',
+)
@@ -11,6 +11,7 @@ from dnastack.configuration.manager import ConfigurationManager
 from dnastack.configuration.models import DEFAULT_CONTEXT
 from dnastack.configuration.wrapper import ConfigurationWrapper
 from dnastack.context.models import Context
+from dnastack.http.client_factory import HttpTransportRegistry
 
 
 class ServiceEndpointNotFound(RuntimeError):
@@ -43,6 +44,7 @@ class ConfigurationBasedClientFactory:
     def __init__(self, config_manager: ConfigurationManager):
         self._config_manager = config_manager
         self._logger = get_logger(type(self).__name__)
+        self._transport_registry = HttpTransportRegistry.get_default()
 
     def get(self,
             cls: Type[SERVICE_CLIENT_CLASS],
@@ -59,7 +61,9 @@ class ConfigurationBasedClientFactory:
         :return: an instance of the given class
         """
         context = self._get_context(context_name)
-        return cls.make(self._get_endpoint(context, cls, endpoint_id), **kwargs)
+        client = cls.make(self._get_endpoint(context, cls, endpoint_id), **kwargs)
+        client.transport_registry = self._transport_registry
+        return client
 
     def _get_context(self, context_name: Optional[str]):
         config = self._config_manager.load()
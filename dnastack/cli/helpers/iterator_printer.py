@@ -19,8 +19,14 @@ def show_iterator(output_format: str,
                   limit: Optional[int] = None,
                   item_marker: Optional[Callable[[Any], Optional[str]]] = None,
                   decimal_as: str = 'string',
-                  sort_keys: bool = True) -> int:
-    """ Display the result from the iterator """
+                  sort_keys: bool = True,
+                  continued: bool = False) -> int:
+    """ Display the result from the iterator
+
+        :param continued: Whether the output continues the output of an interrupted iteration, which has already
+                          printed at least one item. If so, the opening bracket (JSON) or the header (CSV) is not
+                          printed again so that both outputs can be concatenated.
+    """
     if output_format == OutputFormat.JSON:
         printer = JsonIteratorPrinter()
     elif output_format == OutputFormat.YAML:
@@ -35,13 +41,19 @@ def show_iterator(output_format: str,
                          limit=limit,
                          item_marker=item_marker,
                          decimal_as=decimal_as,
-                         sort_keys=sort_keys)
+                         sort_keys=sort_keys,
+                         continued=continued)
 
 
 class OutputFormat:
     JSON = 'json'
     YAML = 'yaml'
     CSV = 'csv'
+    PARQUET = 'parquet'
+    FEATHER = 'feather'
+    ARROW_IPC = 'arrow-ipc'
+
+    COLUMNAR = [PARQUET, FEATHER, ARROW_IPC]
 
     DEFAULT_FOR_RESOURCE = YAML
     DEFAULT_FOR_DATA = JSON
@@ -54,7 +66,8 @@ class BaseIteratorPrinter:
               limit: Optional[int] = None,
               item_marker: Optional[Callable[[Any], Optional[str]]] = None,
               decimal_as: str = 'string',
-              sort_keys: bool = True):
+              sort_keys: bool = True,
+              continued: bool = False):
         raise NotImplementedError()
 
 
@@ -65,14 +78,15 @@ class JsonIteratorPrinter(BaseIteratorPrinter):
               limit: Optional[int] = None,
               item_marker: Optional[Callable[[Any], Optional[str]]] = None,  # NOTE: Declared but ignored
               decimal_as: str = 'string',
-              sort_keys: bool = True) -> int:
+              sort_keys: bool = True,
+              continued: bool = False) -> int:
         row_count = 0
 
         for row in iterator:
             if limit and row_count >= limit:
                 break
 
-            if row_count == 0:
+            if row_count == 0 and not continued:
                 # First row
                 click.echo('[')
             else:
@@ -84,7 +98,7 @@ class JsonIteratorPrinter(BaseIteratorPrinter):
                 click.echo('')  # just a new line
 
             entry = transform(row) if transform else row
-            normalized = normalize(entry, map_decimal=str if decimal_as == 'string' else float, sort_keys=sort_keys)
+            normalized = normalize(entry, map_decimal=float if decimal_as == 'float' else str, sort_keys=sort_keys)
             encoded = to_json_string(normalized, indent=2, sort_keys=False)
 
             click.echo(
@@ -97,7 +111,7 @@ class JsonIteratorPrinter(BaseIteratorPrinter):
 
             row_count += 1
 
-        if row_count == 0:
+        if row_count == 0 and not continued:
             click.echo('[]')
         else:
             click.echo('\n]')
@@ -112,7 +126,8 @@ class CsvIteratorPrinter(BaseIteratorPrinter):
               limit: Optional[int] = None,
               item_marker: Optional[Callable[[Any], Optional[str]]] = None,  # NOTE: Declared but ignored
               decimal_as: str = 'string',
-              sort_keys: bool = True  # NOTE: Declared but ignored
+              sort_keys: bool = True,  # NOTE: Declared but ignored
+              continued: bool = False
               ) -> int:
         row_count = 0
 
@@ -124,11 +139,12 @@ class CsvIteratorPrinter(BaseIteratorPrinter):
                 break
 
             entry = transform(row) if transform else row
-            normalized = normalize(entry, map_decimal=str if decimal_as == 'string' else float, sort_keys=sort_keys)
+            normalized = normalize(entry, map_decimal=float if decimal_as == 'float' else str, sort_keys=sort_keys)
 
             if row_count == 0:
                 headers.extend(normalized.keys())
-                writer.writerow(headers)
+                if not continued:
+                    writer.writerow(headers)
 
             writer.writerow([normalized[h] if h in normalized else None for h in headers])
 
@@ -144,7 +160,8 @@ class YamlIteratorPrinter(BaseIteratorPrinter):
               limit: Optional[int] = None,
               item_marker: Optional[Callable[[Any], Optional[str]]] = None,
               decimal_as: str = 'string',
-              sort_keys: bool = True  # NOTE: Declared but ignored
+              sort_keys: bool = True,  # NOTE: Declared but ignored
+              continued: bool = False
               ) -> int:
         row_count = 0
 
@@ -183,7 +200,7 @@ class YamlIteratorPrinter(BaseIteratorPrinter):
 
             row_count += 1
 
-        if row_count == 0:
+        if row_count == 0 and not continued:
             click.echo('[]')
 
         return row_count
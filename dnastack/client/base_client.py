@@ -2,14 +2,20 @@ from abc import ABC
 from typing import Optional, List
 from uuid import uuid4
 
+from imagination import container
 from requests.auth import AuthBase
 
 from dnastack.client.models import ServiceEndpoint
 from dnastack.client.service_registry.models import ServiceType
+from dnastack.common.environments import flag
 from dnastack.common.events import EventSource
 from dnastack.common.logger import get_logger
 from dnastack.feature_flags import currently_in_debug_mode
 from dnastack.http.authenticators.factory import HttpAuthenticatorFactory
+from dnastack.http.async_session import AsyncHttpSession
+from dnastack.http.circuit_breaker import CircuitBreakerRegistry
+from dnastack.http.client_factory import HttpTransportRegistry
+from dnastack.http.http_cache import HttpCache
 from dnastack.http.session import HttpSession
 
 
@@ -26,6 +32,18 @@ class BaseServiceClient(ABC):
                                   if currently_in_debug_mode()
                                   else type(self).__name__)
         self._current_authenticator: Optional[AuthBase] = None
+        self._transport_registry = HttpTransportRegistry.get_default()
+        self._http_cache: Optional[HttpCache] = (
+            container.get(HttpCache)
+            if flag('DNASTACK_HTTP_CACHE', description='Enable the local cache of the HTTP GET responses')
+            else None
+        )
+        self._circuit_breakers: Optional[CircuitBreakerRegistry] = (
+            None
+            if flag('DNASTACK_HTTP_CIRCUIT_BREAKER_DISABLED',
+                    description='Disable the circuit breakers stopping the requests to the failing hosts')
+            else container.get(CircuitBreakerRegistry)
+        )
         self._events = EventSource(['authentication-before',
                                     'authentication-ok',
                                     'authentication-failure',
@@ -74,6 +92,33 @@ class BaseServiceClient(ABC):
     def get_default_service_type(cls) -> ServiceType:
         return cls.get_supported_service_types()[0]
 
+    @property
+    def transport_registry(self) -> HttpTransportRegistry:
+        """ The registry of pooled HTTP transports shared with other clients """
+        return self._transport_registry
+
+    @transport_registry.setter
+    def transport_registry(self, transport_registry: HttpTransportRegistry):
+        self._transport_registry = transport_registry
+
+    @property
+    def http_cache(self) -> Optional[HttpCache]:
+        """ The local cache of the HTTP GET responses, or None if it is disabled """
+        return self._http_cache
+
+    @http_cache.setter
+    def http_cache(self, http_cache: Optional[HttpCache]):
+        self._http_cache = http_cache
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakerRegistry]:
+        """ The circuit breakers of the hosts, or None if they are disabled """
+        return self._circuit_breakers
+
+    @circuit_breakers.setter
+    def circuit_breakers(self, circuit_breakers: Optional[CircuitBreakerRegistry]):
+        self._circuit_breakers = circuit_breakers
+
     @property
     def url(self):
         """The base URL to the endpoint"""
@@ -89,7 +134,24 @@ class BaseServiceClient(ABC):
         session = HttpSession(self._endpoint.id,
                               HttpAuthenticatorFactory.create_multiple_from(endpoint=self._endpoint),
                               suppress_error=suppress_error,
-                              enable_auth=(not no_auth))
+                              enable_auth=(not no_auth),
+                              transport_registry=self._transport_registry,
+                              http_cache=self._http_cache,
+                              retry_policy=self._endpoint.retry_policy,
+                              circuit_breakers=self._circuit_breakers)
+        self.events.set_passthrough(session.events)
+        return session
+
+    def create_async_http_session(self,
+                                  suppress_error: bool = False,
+                                  no_auth: bool = False) -> AsyncHttpSession:
+        """Create asynchronous HTTP session wrapper (requires httpx)"""
+        session = AsyncHttpSession(self._endpoint.id,
+                                   HttpAuthenticatorFactory.create_multiple_from(endpoint=self._endpoint),
+                                   suppress_error=suppress_error,
+                                   enable_auth=(not no_auth),
+                                   retry_policy=self._endpoint.retry_policy,
+                                   circuit_breakers=self._circuit_breakers)
         self.events.set_passthrough(session.events)
         return session
 
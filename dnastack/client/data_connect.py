@@ -1,22 +1,26 @@
 import re
-from copy import deepcopy
 from dataclasses import dataclass
 from datetime import datetime, time, date, timedelta
 from decimal import Decimal
 from pprint import pformat
-from typing import Optional, Any, Dict, List, Iterator, Union, Callable, Iterable
+from typing import Optional, Any, Dict, List, Iterator, Union, Callable, Iterable, Tuple
 from urllib.parse import urljoin
 
+from imagination import container
 from pydantic import BaseModel, ValidationError, Field
 from requests import exceptions as requests_exc, Response
 
 from dnastack.client.base_client import BaseServiceClient
 from dnastack.client.base_exceptions import UnauthenticatedApiAccessError, UnauthorizedApiAccessError, \
     MissingResourceError, DataConnectError
-from dnastack.client.result_iterator import ResultLoader, ResultIterator, InactiveLoaderError
+from dnastack.client.data_connect_cache import QueryResultCache, CachedResultLoader, CachingResultLoader
+from dnastack.client.result_iterator import ResultLoader, ResultIterator, InactiveLoaderError, UrlHistory, \
+    ResultCheckpoint, AsyncResultIterator
 from dnastack.client.service_registry.models import ServiceType
 from dnastack.common.logger import get_logger
 from dnastack.common.tracing import Span
+from dnastack.http.authenticators.factory import HttpAuthenticatorFactory
+from dnastack.http.async_session import AsyncHttpSession
 from dnastack.http.session import HttpSession, HttpError, ClientError
 
 _logger = get_logger('module/data_connect')
@@ -86,18 +90,33 @@ class InterruptedLoadingError(RuntimeError):
 class PageableResultLoader(ResultLoader):
     def __init__(self,
                  initial_url: str,
-                 http_session: Optional[HttpSession] = None):
+                 http_session: Optional[Union[HttpSession, AsyncHttpSession]] = None):
         self._http_session = http_session
         self._initial_url = initial_url
         self._current_url: Optional[str] = None
         self._active = True
-        self._visited_urls: List[str] = list()
+        self._interrupted = False
+        self._visited_urls = UrlHistory()
+
+    @property
+    def interrupted(self) -> bool:
+        """ Whether the loading is interrupted by an error from the server, i.e., the result is incomplete """
+        return self._interrupted
+
+    def close(self):
+        if self._http_session:
+            self._http_session.close()
+
+    async def close_async(self):
+        if self._http_session:
+            await self._http_session.close()
 
     def _post_request(self, api_response: Union[ListTablesResponse, TableDataResponse]):
         if api_response.errors:
             extracted_errors = [e.title for e in api_response.errors]
 
             self._active = False
+            self._interrupted = True
 
             if self._current_url:
                 # The iterator encounters an unexpected error while iterating the result. Return an empty list.
@@ -134,64 +153,64 @@ class TableListLoader(PageableResultLoader):
         if not self._active:
             raise InactiveQuerySessionError(self._initial_url)
 
-        with self._http_session as session:
-            current_url = self._current_url or self._initial_url
-
-            try:
-                response = session.get(current_url)
-            except HttpError as e:
-                status_code = e.response.status_code
-                response_text = e.response.text
+        session = self._http_session
+        current_url = self._current_url or self._initial_url
 
-                self._visited_urls.append(current_url)
+        try:
+            response = session.get(current_url)
+        except HttpError as e:
+            status_code = e.response.status_code
+            response_text = e.response.text
 
-                if status_code == 401:
-                    raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_text))
-                elif status_code == 403:
-                    raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_text))
-                elif status_code >= 400:  # Catch all errors
-                    raise DataConnectError(
-                        f'Unexpected error: {response_text}',
-                        status_code,
-                        response_text,
-                        urls=self._visited_urls
-                    )
-
-            status_code = response.status_code
-            response_text = response.text
+            self._visited_urls.append(current_url)
 
-            try:
-                response_body = response.json() if response_text else dict()
-            except Exception:
-                self.logger.error(f'{self._initial_url}: Unexpectedly non-JSON response body from {current_url}')
+            if status_code == 401:
+                raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_text))
+            elif status_code == 403:
+                raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_text))
+            elif status_code >= 400:  # Catch all errors
                 raise DataConnectError(
-                    f'Unable to deserialize JSON from {response_text}.',
+                    f'Unexpected error: {response_text}',
                     status_code,
                     response_text,
                     urls=self._visited_urls
                 )
 
-            try:
-                if isinstance(response_body, list):
-                    api_response = ListTablesResponse(tables=response_body)
-                else:
-                    api_response = ListTablesResponse(**response_body)
-            except ValidationError:
-                raise DataConnectError(
-                    f'Invalid Response Body: {response_body}',
-                    status_code,
-                    response_text,
-                    urls=self._visited_urls
-                )
+        status_code = response.status_code
+        response_text = response.text
+
+        try:
+            response_body = response.json() if response_text else dict()
+        except Exception:
+            self.logger.error(f'{self._initial_url}: Unexpectedly non-JSON response body from {current_url}')
+            raise DataConnectError(
+                f'Unable to deserialize JSON from {response_text}.',
+                status_code,
+                response_text,
+                urls=self._visited_urls
+            )
+
+        try:
+            if isinstance(response_body, list):
+                api_response = ListTablesResponse(tables=response_body)
+            else:
+                api_response = ListTablesResponse(**response_body)
+        except ValidationError:
+            raise DataConnectError(
+                f'Invalid Response Body: {response_body}',
+                status_code,
+                response_text,
+                urls=self._visited_urls
+            )
 
-            self.logger.debug(f'Response:\n{pformat(response_body, indent=2)}')
+        self.logger.debug(f'Response:\n{pformat(response_body, indent=2)}')
 
-            try:
-                self._post_request(api_response)
-            except InterruptedLoadingError:
-                return []
+        try:
+            self._post_request(api_response)
+        except InterruptedLoadingError:
+            return []
 
-            return api_response.tables or []
+        return api_response.tables or []
 
     def has_more(self) -> bool:
         return self._active or self._current_url
@@ -222,6 +241,10 @@ class DataMapper:
             logger.warning(f'Unable to do pattern matching on:\n({type(content).__name__}) {content}')
             return True
 
+    def map_match(self, match: re.Match) -> Any:
+        """ Convert the content that has already been matched with the pattern """
+        return self.map(match.string)
+
 
 class IntervalDayToSecondMapper(DataMapper):
     def __init__(self):
@@ -231,10 +254,12 @@ class IntervalDayToSecondMapper(DataMapper):
         )
 
     def _map(self, s: Any) -> Any:
-        raw_delta = self.str_pattern.match(s).groupdict()
+        return self.map_match(self.str_pattern.match(s))
+
+    def map_match(self, match: re.Match) -> Any:
         return timedelta(**{
             p: int(v) if v is not None else 0
-            for p, v in raw_delta.items()
+            for p, v in match.groupdict().items()
         })
 
 
@@ -247,6 +272,41 @@ class DataMapperGroup:
     def can_handle(self, given_json_types: List[str], given_data_format: str) -> bool:
         return self.json_type in given_json_types and given_data_format in self.formats
 
+    def compile(self) -> Callable[[Any], Any]:
+        """ Compile the mappers into a single converter which matches each value against at most one pattern """
+        mappers = self.mappers
+
+        if len(mappers) == 1:
+            match_pattern = mappers[0].str_pattern.match
+        else:
+            # Each alternative is wrapped in a named group so that the matched mapper can be identified without
+            # running the other patterns.
+            match_pattern = re.compile('|'.join([
+                f'(?P<_{mapper_index}>{mapper.str_pattern.pattern})'
+                for mapper_index, mapper in enumerate(mappers)
+            ])).match
+
+        def convert(value: Any) -> Any:
+            if not isinstance(value, (str, bytes)):
+                _logger.warning(f'Unable to do pattern matching on:\n({type(value).__name__}) {value}')
+                return mappers[0].map(value)
+
+            match = match_pattern(value)
+
+            if match is None:
+                return value
+
+            mapper_index = int(match.lastgroup[1:]) if len(mappers) > 1 else 0
+            mapper = mappers[mapper_index]
+
+            try:
+                return mapper.map_match(match)
+            except Exception:
+                raise DataConversionError(f'{self}#{mapper_index}: Unexpected error during data '
+                                          f'conversion with {mapper.str_pattern.pattern}')
+
+        return convert
+
     def __str__(self):
         return f'{type(self).__name__}(json_type={self.json_type}, formats={self.formats})'
 
@@ -254,10 +314,10 @@ class DataMapperGroup:
 class UnexpectedRequestError(RuntimeError):
     """Unexpected Request Error"""
 
-    def __init__(self, current_url: str, visited_urls: List[str], response: Response, trace: Span):
+    def __init__(self, current_url: str, visited_urls: Iterable[str], response: Response, trace: Span):
         super().__init__()
         self._current_url = current_url
-        self._visited_urls = deepcopy(visited_urls)
+        self._visited_urls = list(visited_urls)
         self._response = response
         self._trace = trace
 
@@ -287,7 +347,7 @@ class InvalidQueryError(UnexpectedRequestError):
 
     def __init__(self,
                  current_url: str,
-                 visited_urls: List[str],
+                 visited_urls: Iterable[str],
                  response: Response,
                  query: str,
                  trace: Span):
@@ -320,7 +380,7 @@ class QueryLoader(PageableResultLoader):
             ['bigint'],
             [
                 DataMapper.init(
-                    re.compile(r'^\d+$'),
+                    re.compile(r'^[-+]?\d+$'),
                     lambda s: int(s)
                 )
             ]
@@ -330,7 +390,7 @@ class QueryLoader(PageableResultLoader):
             ['decimal'],
             [
                 DataMapper.init(
-                    re.compile(r'^(\d+\.\d+|\d+|\.\d+)$'),
+                    re.compile(r'^[-+]?(\d+\.\d+|\d+|\.\d+)$'),
                     lambda s: Decimal(s)
                 )
             ]
@@ -420,169 +480,244 @@ class QueryLoader(PageableResultLoader):
     def __init__(self,
                  initial_url: str,
                  query: Optional[str] = None,
-                 http_session: Optional[HttpSession] = None,
-                 trace: Optional[Span] = None):
+                 http_session: Optional[Union[HttpSession, AsyncHttpSession]] = None,
+                 trace: Optional[Span] = None,
+                 page_url: Optional[str] = None,
+                 data_model: Optional[Dict[str, Any]] = None):
+        """
+        :param initial_url: The URL of the first page
+        :param query: The SQL query. If not defined, the first page is loaded with a GET request, e.g., table data.
+        :param http_session: The HTTP session. The asynchronous session is only used with "load_async".
+        :param trace: Distributed Trace Context
+        :param page_url: The URL of the page to start from (to resume the loading)
+        :param data_model: The data model of the result, if it is already known (to resume the loading)
+        """
         super(QueryLoader, self).__init__(initial_url=initial_url, http_session=http_session)
 
         self.__query = query
         self.__schema: Dict[str, Any] = dict()
+        self.__row_converter: Optional[Callable[[Any], Any]] = None
         self.__trace = trace
 
+        self._current_url = page_url
+
+        if data_model:
+            self.__schema = data_model
+            self.__row_converter = self.compile_converter(self.__schema)
+
     def load(self) -> List[Dict[str, Any]]:
+        method, url, request_kwargs = self.__prepare_request()
+
+        try:
+            response = getattr(self._http_session, method)(url, trace_context=self.__trace, **request_kwargs)
+        except HttpError as e:
+            self.__raise_loading_error(e)
+
+        self._visited_urls.append(url)
+
+        return self.__handle_response(response.json())
+
+    async def load_async(self) -> List[Dict[str, Any]]:
+        method, url, request_kwargs = self.__prepare_request()
+
+        try:
+            response = await getattr(self._http_session, method)(url, trace_context=self.__trace, **request_kwargs)
+        except HttpError as e:
+            self.__raise_loading_error(e)
+
+        self._visited_urls.append(url)
+
+        return self.__handle_response(response.json())
+
+    def __prepare_request(self) -> Tuple[str, str, Dict[str, Any]]:
+        """ Prepare the request for the next page
+
+            :return: the HTTP method, the URL, and the other arguments of the request
+        """
         if not self._active:
             raise InactiveQuerySessionError(self._initial_url)
 
-        with self._http_session as session:
-            try:
+        if not self._current_url:
+            # Load the initial page.
+            if self.__query:
+                # Send a search request
+                self.logger.debug(f'Initial Page: QUERY: {self._initial_url}: {self.__query}')
+                return 'post', self._initial_url, dict(json=dict(query=self.__query))
+            else:
+                # Fetch the table data
+                self.logger.debug(f'Initial Page: URL: {self._initial_url}')
+                return 'get', self._initial_url, dict()
+        else:
+            # Load a follow-up page.
+            self.logger.debug(f'Follow-up: URL: {self._current_url}')
+            return 'get', self._current_url, dict()
+
+    def __raise_loading_error(self, e: HttpError):
+        if isinstance(e, ClientError):
+            status_code = e.response.status_code
+            common_error_properties = dict(
+                visited_urls=self._visited_urls,
+                response=e.response,
+                trace=e.trace,
+            )
+            if status_code == 400:
                 if not self._current_url:
-                    # Load the initial page.
                     if self.__query:
-                        # Send a search request
-                        self.logger.debug(f'Initial Page: QUERY: {self._initial_url}: {self.__query}')
-                        response = session.post(self._initial_url,
-                                                json=dict(query=self.__query),
-                                                trace_context=self.__trace)
+                        raise InvalidQueryError(self._initial_url,
+                                                query=self.__query,
+                                                **common_error_properties) from e
                     else:
-                        # Fetch the table data
-                        self.logger.debug(f'Initial Page: URL: {self._initial_url}')
-                        response = session.get(self._initial_url,
-                                               trace_context=self.__trace)
-                    self._visited_urls.append(self._initial_url)
+                        raise InvalidDataLoadingError(self._initial_url,
+                                                      **common_error_properties) from e
                 else:
-                    # Load a follow-up page.
-                    self.logger.debug(f'Follow-up: URL: {self._current_url}')
-                    response = session.get(self._current_url,
-                                           trace_context=self.__trace)
-                    self._visited_urls.append(self._current_url)
-            except ClientError as e:
-                status_code = e.response.status_code
-                common_error_properties = dict(
-                    visited_urls=self._visited_urls,
-                    response=e.response,
-                    trace=e.trace,
-                )
-                if status_code == 400:
-                    if not self._current_url:
-                        if self.__query:
-                            raise InvalidQueryError(self._initial_url,
-                                                    query=self.__query,
-                                                    **common_error_properties) from e
-                        else:
-                            raise InvalidDataLoadingError(self._initial_url,
-                                                          **common_error_properties) from e
+                    if self.__query:
+                        raise InvalidQueryError(self._current_url,
+                                                query=self.__query,
+                                                **common_error_properties) from e
                     else:
-                        if self.__query:
-                            raise InvalidQueryError(self._current_url,
-                                                    query=self.__query,
-                                                    **common_error_properties) from e
-                        else:
-                            raise InvalidDataLoadingError(self._current_url,
-                                                          **common_error_properties) from e
-                else:
-                    raise UnexpectedRequestError(self._current_url,
-                                                 **common_error_properties) from e
-            except HttpError as e:
-                status_code = e.response.status_code
-                response_body = e.response.text
-                self.logger.debug(f'Response (JSON):\n{response_body}')
+                        raise InvalidDataLoadingError(self._current_url,
+                                                      **common_error_properties) from e
+            else:
+                raise UnexpectedRequestError(self._current_url,
+                                             **common_error_properties) from e
+        else:
+            status_code = e.response.status_code
+            response_body = e.response.text
+            self.logger.debug(f'Response (JSON):\n{response_body}')
+
+            if status_code == 401:
+                raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_body))
+            elif status_code == 403:
+                raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_body))
+            elif status_code == 404:
+                raise TableNotFoundError(self.__generate_api_error_feedback(response_body))
+            else:
+                # noinspection PyBroadException
+                try:
+                    error_response = TableDataResponse(**e.response.json())
+                    error_feedback = ', '.join([e.get_message() for e in error_response.errors])
+                except requests_exc.JSONDecodeError:
+                    error_feedback = response_body
+                except Exception:
+                    error_feedback = response_body
 
-                if status_code == 401:
-                    raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_body))
-                elif status_code == 403:
-                    raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_body))
-                elif status_code == 404:
-                    raise TableNotFoundError(self.__generate_api_error_feedback(response_body))
-                else:
-                    # noinspection PyBroadException
-                    try:
-                        error_response = TableDataResponse(**e.response.json())
-                        error_feedback = ', '.join([e.get_message() for e in error_response.errors])
-                    except requests_exc.JSONDecodeError:
-                        error_feedback = response_body
-                    except Exception:
-                        error_feedback = response_body
-
-                    raise DataConnectError(
-                        error_feedback,
-                        status_code,
-                        response_body,
-                        urls=self._visited_urls
-                    ) from e
-
-            api_response = TableDataResponse(**response.json())
+                raise DataConnectError(
+                    error_feedback,
+                    status_code,
+                    response_body,
+                    urls=self._visited_urls
+                ) from e
 
-            try:
-                self._post_request(api_response)
-            except InterruptedLoadingError:
-                return []
+    def __handle_response(self, response_body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        api_response = TableDataResponse(**response_body)
+
+        try:
+            self._post_request(api_response)
+        except InterruptedLoadingError:
+            return []
 
-            if not self.__schema and api_response.data_model:
-                self.__schema = api_response.data_model
+        if not self.__schema and api_response.data_model:
+            self.__schema = api_response.data_model
+            self.__row_converter = self.compile_converter(self.__schema)
 
-            return self.__remap_array(self.__schema, api_response.data)
+        if self.__row_converter:
+            row_converter = self.__row_converter
+            return [row_converter(row) for row in api_response.data]
+        else:
+            return api_response.data
 
     def has_more(self) -> bool:
         return self._active or self._current_url
 
-    def __remap_array(self, schema: Dict[str, Any], array: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        if not schema:
-            return array
-        else:
-            return [self.__remap_obj(schema, row) for row in array]
+    @property
+    def data_model(self) -> Dict[str, Any]:
+        """ The data model of the result (only available after the first page is loaded) """
+        return self.__schema
+
+    def get_position(self) -> Optional[Dict[str, Any]]:
+        return dict(initial_url=self._initial_url,
+                    query=self.__query,
+                    page_url=self._current_url,
+                    data_model=self.__schema or None)
+
+    @classmethod
+    def compile_converter(cls, schema: Optional[Dict[str, Any]]) -> Optional[Callable[[Any], Any]]:
+        """
+        Compile the JSON schema of the data model into a converter
+
+        The schema is only walked once. The returned converter only visits the properties that require conversion.
 
-    def __remap_obj(self, schema: Dict[str, Any], obj: Any) -> Any:
+        :return: the converter, or None if no conversion is required
+        """
         if not schema:
-            return obj
+            return None
 
-        obj_types = (
+        json_types = (
             ([schema['type']] if isinstance(schema['type'], str) else schema['type'])
             if 'type' in schema
             else ['object']
         )
 
-        if obj is None:
+        handles_array = 'array' in json_types
+        handles_object = 'object' in json_types
+
+        array_converter: Optional[Callable[[Any], Any]] = None
+        object_converter: Optional[Callable[[Any], Any]] = None
+        value_converter = cls.__compile_value_converter(json_types, schema.get('format'))
+
+        if handles_array:
+            item_converter = cls.compile_converter(schema.get('items'))
+            if item_converter:
+                def convert_array(array: Iterable[Any]) -> List[Any]:
+                    return [item_converter(item) for item in array]
+
+                array_converter = convert_array
+
+        if handles_object and schema.get('properties'):
+            property_converters = {
+                property_name: property_converter
+                for property_name, property_converter in [
+                    (property_name, cls.compile_converter(property_schema))
+                    for property_name, property_schema in schema['properties'].items()
+                ]
+                if property_converter
+            }
+
+            if property_converters:
+                def convert_object(obj: Dict[str, Any]) -> Dict[str, Any]:
+                    converted_obj = dict(obj)
+                    for property_name, property_converter in property_converters.items():
+                        if property_name in converted_obj:
+                            converted_obj[property_name] = property_converter(converted_obj[property_name])
+                    return converted_obj
+
+                object_converter = convert_object
+
+        if not (array_converter or object_converter or value_converter):
+            # No-op fast path
             return None
-        if 'array' in obj_types and isinstance(obj, (tuple, list)):
-            return self.__remap_array(schema['items'], obj)
-        elif 'object' in obj_types and isinstance(obj, dict):
-            if schema.get('properties'):
-                return {
-                    property_name: (
-                        self.__remap_obj(schema['properties'][property_name], property_value)
-                        if property_name in schema['properties'] and schema['properties'][property_name]
-                        else property_value
-                    )
-                    for property_name, property_value in obj.items()
-                }
+
+        def convert(obj: Any) -> Any:
+            if obj is None:
+                return None
+            elif handles_array and isinstance(obj, (tuple, list)):
+                return array_converter(obj) if array_converter else obj
+            elif handles_object and isinstance(obj, dict):
+                return object_converter(obj) if object_converter else obj
             else:
-                return obj
-        else:
-            return self.__remap_value(obj_types, schema.get('format'), obj)
+                return value_converter(obj) if value_converter else obj
+
+        return convert
 
-    def __remap_value(self, json_types: List[str], data_format: str, value: Any):
+    @classmethod
+    def __compile_value_converter(cls, json_types: List[str], data_format: Optional[str]) -> Optional[Callable[[Any], Any]]:
         # Source: https://github.com/ga4gh-discovery/data-connect/blob/develop/SPEC.md#correspondence-between-sql-and-json-data-types-in-the-search-result
         # NOTE: Non-standard data type will also not be handled and the original value will be returned.
-        for mapper_group in self._data_mapper_groups:
-            if not mapper_group.can_handle(json_types, data_format):
-                continue
-
-            mapper_index = 0
-            for mapper in mapper_group.mappers:
-                if not mapper.can_handle(value):
-                    mapper_index += 1
-                    continue
-
-                if not mapper.map:
-                    raise NotImplementedError(
-                        f'The mapper #{mapper_index} is not fully implemented for {mapper_group.formats}.')
-
-                try:
-                    return mapper.map(value)
-                except Exception:
-                    raise DataConversionError(f'{mapper_group}#{mapper_index}: Unexpected error during data '
-                                              f'conversion with {mapper.str_pattern.pattern}')
+        for mapper_group in cls._data_mapper_groups:
+            if mapper_group.can_handle(json_types, data_format):
+                return mapper_group.compile()
 
-        return value
+        return None
 
     def __generate_api_error_feedback(self, response_body=None) -> str:
         if self.__query:
@@ -640,12 +775,23 @@ class Table:
         return ResultIterator(QueryLoader(http_session=self.__http_session,
                                           initial_url=urljoin(self.__url, 'data')))
 
+    def iterate_record_batches(self, decimal_as: str = 'float') -> Iterator[Any]:
+        """ Iterate the data in the table as Arrow record batches, one per page (requires pyarrow) """
+        # NOTE: The module is imported here as it depends on this module.
+        from dnastack.client.data_connect_arrow import iterate_record_batches
+
+        return iterate_record_batches(QueryLoader(http_session=self.__http_session,
+                                                  initial_url=urljoin(self.__url, 'data')),
+                                      decimal_as=decimal_as)
+
 
 class DataConnectClient(BaseServiceClient):
     """
     A Client for the GA4GH Data Connect standard
     """
 
+    _query_cache: Optional[QueryResultCache] = None
+
     @staticmethod
     def get_adapter_type() -> str:
         return 'data_connect'
@@ -656,12 +802,135 @@ class DataConnectClient(BaseServiceClient):
             DATA_CONNECT_TYPE_V1_0,
         ]
 
-    def query(self, query: str, no_auth: bool = False, trace: Optional[Span] = None) -> Iterator[Dict[str, Any]]:
-        """ Run an SQL query """
+    def query(self,
+              query: str,
+              no_auth: bool = False,
+              trace: Optional[Span] = None,
+              prefetch: int = 0,
+              cache_ttl: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """ Run an SQL query
+
+            :param query: The SQL query
+            :param no_auth: Trigger this method without invoking authentication even if it is required.
+            :param trace: Distributed Trace Context
+            :param prefetch: The number of pages to load ahead on a background thread (disabled by default)
+            :param cache_ttl: The number of seconds to keep the result in the local query cache. If the same query
+                              has been cached by the same principal and has not expired yet, the cached result is
+                              returned without sending any requests. (disabled by default)
+        """
+        return ResultIterator(self.__create_query_loader(query, no_auth, trace, cache_ttl), prefetch=prefetch)
+
+    def query_async(self,
+                    query: str,
+                    no_auth: bool = False,
+                    trace: Optional[Span] = None) -> AsyncResultIterator:
+        """ Run an SQL query without blocking the event loop (requires httpx)
+
+            The result is iterated with "async for", e.g., "async for row in client.query_async(query): ...".
+
+            :param query: The SQL query
+            :param no_auth: Trigger this method without invoking authentication even if it is required.
+            :param trace: Distributed Trace Context
+        """
+        return AsyncResultIterator(QueryLoader(http_session=self.create_async_http_session(no_auth=no_auth),
+                                               initial_url=urljoin(self.url, r'search'),
+                                               query=query,
+                                               trace=trace or Span(origin=self)))
+
+    @property
+    def query_cache(self) -> QueryResultCache:
+        """ The local query cache """
+        if self._query_cache is None:
+            self._query_cache = container.get(QueryResultCache)
+        return self._query_cache
+
+    @query_cache.setter
+    def query_cache(self, query_cache: QueryResultCache):
+        self._query_cache = query_cache
+
+    def __create_query_loader(self,
+                              query: str,
+                              no_auth: bool,
+                              trace: Optional[Span],
+                              cache_ttl: Optional[float]) -> ResultLoader:
+        if cache_ttl and cache_ttl > 0:
+            principal = self._get_cache_principal(no_auth)
+            cache_key = self.query_cache.make_key(self.url, query, principal)
+            cache_entry = self.query_cache.get(cache_key)
+
+            if cache_entry:
+                self._logger.debug(f'Query Cache: HIT: {cache_key}')
+                return CachedResultLoader(self.query_cache, cache_entry)
+
+            self._logger.debug(f'Query Cache: MISS: {cache_key}')
+            return CachingResultLoader(self.__create_query_loader(query, no_auth, trace, None),
+                                       self.query_cache.open_writer(self.url, query, principal, cache_ttl))
+
+        return QueryLoader(http_session=self.create_http_session(no_auth=no_auth),
+                           initial_url=urljoin(self.url, r'search'),
+                           query=query,
+                           trace=trace or Span(origin=self))
+
+    def _get_cache_principal(self, no_auth: bool) -> str:
+        """ Identify the principal of the queries for the query cache
+
+            NOTE: The session IDs are derived from the authentication configuration, which is also how the local
+                  sessions are stored.
+        """
+        if no_auth:
+            return 'anonymous'
+
+        session_ids = sorted([
+            authenticator.session_id
+            for authenticator in HttpAuthenticatorFactory.create_multiple_from(endpoint=self._endpoint)
+        ])
+
+        return ','.join(session_ids) or 'anonymous'
+
+    def query_record_batches(self,
+                             query: str,
+                             no_auth: bool = False,
+                             trace: Optional[Span] = None,
+                             decimal_as: str = 'float',
+                             cache_ttl: Optional[float] = None) -> Iterator[Any]:
+        """ Run an SQL query and iterate the result as Arrow record batches, one per page (requires pyarrow)
+
+            :param query: The SQL query
+            :param no_auth: Trigger this method without invoking authentication even if it is required.
+            :param trace: Distributed Trace Context
+            :param decimal_as: The Arrow type for decimal values, either "float" (float64), "decimal" (decimal128),
+                               or "string"
+            :param cache_ttl: The number of seconds to keep the result in the local query cache (see "query")
+        """
+        # NOTE: The module is imported here as it depends on this module.
+        from dnastack.client.data_connect_arrow import iterate_record_batches
+
+        return iterate_record_batches(self.__create_query_loader(query, no_auth, trace, cache_ttl),
+                                      decimal_as=decimal_as)
+
+    def resume(self,
+               checkpoint: ResultCheckpoint,
+               no_auth: bool = False,
+               trace: Optional[Span] = None,
+               prefetch: int = 0) -> ResultIterator:
+        """ Resume the iteration of a query result (or table data) from the checkpoint
+
+            The checkpoint is taken with the "checkpoint" method of the iterator returned by "query".
+
+            :param checkpoint: The checkpoint
+            :param no_auth: Trigger this method without invoking authentication even if it is required.
+            :param trace: Distributed Trace Context
+            :param prefetch: The number of pages to load ahead on a background thread (disabled by default)
+        """
+        position = checkpoint.position
         return ResultIterator(QueryLoader(http_session=self.create_http_session(no_auth=no_auth),
-                                          initial_url=urljoin(self.url, r'search'),
-                                          query=query,
-                                          trace=trace or Span(origin=self)))
+                                          initial_url=position['initial_url'],
+                                          query=position.get('query'),
+                                          trace=trace or Span(origin=self),
+                                          page_url=position.get('page_url'),
+                                          data_model=position.get('data_model')),
+                              prefetch=prefetch,
+                              checkpoint=checkpoint)
 
     def iterate_tables(self, no_auth: bool = False) -> Iterator[TableInfo]:
         """ Iterate the list of tables """
@@ -0,0 +1,364 @@
+"""
+Columnar (Apache Arrow) materialization of Data Connect results
+
+The column types are derived from the data model of the result. Each page is converted into one record batch as soon
+as it arrives so that the rows (as dictionaries) of a page can be released before the next page is loaded.
+
+pyarrow is an optional dependency and only imported when it is required.
+"""
+import importlib.util
+import json
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dnastack.client.data_connect import DataConversionError
+from dnastack.client.result_iterator import ResultLoader
+from dnastack.common.exceptions import DependencyError
+from dnastack.common.logger import get_logger
+
+DECIMAL_PRECISION = 38
+DECIMAL_SCALE = 9
+
+COLUMNAR_FILE_FORMATS = ('parquet', 'feather', 'arrow-ipc')
+
+
+def import_pyarrow():
+    try:
+        # We delay the import as late as possible so that the optional dependency (pyarrow)
+        # does not block the other functionalities of the library.
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise DependencyError('pyarrow')
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _to_float(value: Any) -> Any:
+    return float(value) if value is not None else None
+
+
+def _to_int(value: Any) -> Any:
+    # NOTE: The values which do not look like integers are left as they are by the converter of the query loader.
+    return int(value) if isinstance(value, str) else value
+
+
+def _to_decimal(value: Any) -> Any:
+    return Decimal(value) if isinstance(value, (str, int, float)) else value
+
+
+def _get_decimal_digits(value: Decimal) -> Tuple[int, int]:
+    """ The numbers of the integer digits and the fractional digits of the decimal value """
+    _, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise ValueError(f'{value} is not a finite number')
+    return max(len(digits) + exponent, 0), max(-exponent, 0)
+
+
+def _to_string(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    elif isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, default=str)
+    elif hasattr(value, 'isoformat'):
+        return value.isoformat()
+    else:
+        return str(value)
+
+
+def get_arrow_type(schema: Optional[Dict[str, Any]], decimal_as: str = 'float') -> Tuple[Any, Callable[[Any], Any]]:
+    """
+    Get the Arrow data type of the given JSON schema from a Data Connect data model
+
+    :param schema: The JSON schema of a column
+    :param decimal_as: Either "float" (float64), "decimal" (decimal128), or "string"
+    :return: the Arrow data type and the function adapting a converted value to that type
+
+    With decimal_as="decimal", the precision and the scale are taken from the schema ("precision" and "scale") if
+    available. Otherwise, the scale is adjusted to the values of the first page (see RecordBatchBuilder).
+    """
+    pa = import_pyarrow()
+
+    schema = schema or dict()
+    json_types = (
+        ([schema['type']] if isinstance(schema['type'], str) else schema['type'])
+        if 'type' in schema
+        else ['object']
+    )
+    data_format = schema.get('format')
+
+    if 'array' in json_types:
+        item_type, item_adapter = get_arrow_type(schema.get('items'), decimal_as)
+        return (
+            pa.list_(item_type),
+            lambda value: [item_adapter(item) for item in value] if value is not None else None
+        )
+    elif 'object' in json_types and schema.get('properties'):
+        field_types = {
+            property_name: get_arrow_type(property_schema, decimal_as)
+            for property_name, property_schema in schema['properties'].items()
+        }
+        return (
+            pa.struct([(property_name, arrow_type) for property_name, (arrow_type, _) in field_types.items()]),
+            lambda value: (
+                {
+                    property_name: adapter(value.get(property_name))
+                    for property_name, (_, adapter) in field_types.items()
+                }
+                if value is not None
+                else None
+            )
+        )
+    elif 'string' in json_types and data_format == 'bigint':
+        return pa.int64(), _to_int
+    elif 'string' in json_types and data_format == 'decimal':
+        if decimal_as == 'decimal':
+            return (
+                pa.decimal128(schema.get('precision') or DECIMAL_PRECISION,
+                              schema.get('scale') if schema.get('scale') is not None else DECIMAL_SCALE),
+                _to_decimal
+            )
+        elif decimal_as == 'string':
+            return pa.string(), _to_string
+        else:
+            return pa.float64(), _to_float
+    elif 'string' in json_types and data_format == 'date':
+        return pa.date32(), _identity
+    elif 'string' in json_types and data_format in ('time', 'time without time zone'):
+        return pa.time64('us'), _identity
+    elif 'string' in json_types and data_format in ('timestamp', 'timestamp without time zone'):
+        return pa.timestamp('us'), _identity
+    elif 'string' in json_types and data_format == 'timestamp with time zone':
+        return pa.timestamp('us', tz='UTC'), _identity
+    elif 'string' in json_types and data_format == 'interval day to second':
+        return pa.duration('us'), _identity
+    elif 'integer' in json_types:
+        return pa.int64(), _identity
+    elif 'number' in json_types:
+        return pa.float64(), _to_float
+    elif 'boolean' in json_types:
+        return pa.bool_(), _identity
+    else:
+        # NOTE: Arrow has no time-with-time-zone type. That and any other types are represented as strings.
+        return pa.string(), _to_string
+
+
+class RecordBatchBuilder:
+    """
+    Build Arrow record batches from pages of converted rows
+
+    NOTE: A decimal column whose values do not fit into its decimal type, e.g., with more fractional digits than the
+          scale, falls back to strings so that no precision is lost. Unless the data model defines the scale, the
+          scale is first adjusted to the values of the first page. Once a column falls back, the record batches
+          built afterwards have a different schema from the ones built before.
+    """
+
+    def __init__(self, data_model: Optional[Dict[str, Any]] = None, decimal_as: str = 'float'):
+        self.__pa = import_pyarrow()
+        self.__logger = get_logger(type(self).__name__)
+        self.__decimal_as = decimal_as
+        self.__schema = None
+        self.__adapters: List[Callable[[Any], Any]] = []
+        self.__adjustable_decimal_field_names: List[str] = []
+        self.__built_batch_count = 0
+
+        if data_model:
+            self.set_data_model(data_model)
+
+    @property
+    def schema(self):
+        """ The Arrow schema, or None if it is not yet known """
+        return self.__schema
+
+    def set_data_model(self, data_model: Dict[str, Any]):
+        pa = self.__pa
+        fields = []
+        self.__adapters.clear()
+        self.__adjustable_decimal_field_names.clear()
+
+        for property_name, property_schema in (data_model.get('properties') or dict()).items():
+            arrow_type, adapter = get_arrow_type(property_schema, self.__decimal_as)
+            fields.append(pa.field(property_name, arrow_type))
+            self.__adapters.append(adapter)
+
+            if pa.types.is_decimal(arrow_type) and (property_schema or dict()).get('scale') is None:
+                self.__adjustable_decimal_field_names.append(property_name)
+
+        self.__schema = pa.schema(fields) if fields else None
+
+    def build(self, rows: List[Dict[str, Any]]):
+        """ Build a record batch from a page of rows """
+        pa = self.__pa
+
+        if self.__schema is None:
+            # Without a data model, the schema is inferred from the first page and reused for the following pages.
+            batch = pa.RecordBatch.from_pylist(rows)
+            self.__schema = batch.schema
+            self.__adapters = [_identity for _ in self.__schema]
+            self.__built_batch_count += 1
+            return batch
+
+        columns = []
+        for field_index, (field, adapter) in enumerate(zip(self.__schema, self.__adapters)):
+            name = field.name
+            try:
+                values = [adapter(row.get(name)) for row in rows]
+
+                if pa.types.is_decimal(field.type):
+                    field = self.__fit_decimal_field(field_index, values)
+
+                columns.append(pa.array(values if not pa.types.is_string(field.type) else
+                                        [_to_string(value) for value in values],
+                                        type=field.type))
+            except (pa.ArrowException, TypeError, ValueError, ArithmeticError) as e:
+                raise DataConversionError(f'Unable to convert the column "{name}" to {field.type}: {e}') from e
+
+        self.__built_batch_count += 1
+
+        return pa.RecordBatch.from_arrays(columns, schema=self.__schema)
+
+    def __fit_decimal_field(self, field_index: int, values: List[Any]):
+        """ Adjust the decimal type of the field to the values, or fall back to strings if they do not fit """
+        pa = self.__pa
+        field = self.__schema.field(field_index)
+        precision, scale = field.type.precision, field.type.scale
+        digits = [_get_decimal_digits(value) for value in values if value is not None]
+        max_integer_digits = max([i for i, _ in digits], default=0)
+        max_fractional_digits = max([f for _, f in digits], default=0)
+
+        if self.__built_batch_count == 0 and field.name in self.__adjustable_decimal_field_names:
+            scale = min(max(scale, max_fractional_digits), precision)
+
+        if max_integer_digits <= precision - scale and max_fractional_digits <= scale:
+            new_field = field.with_type(pa.decimal128(precision, scale))
+        else:
+            self.__logger.warning(f'The values of the column "{field.name}" do not fit into {field.type}. The column '
+                                  f'is represented as strings.')
+            new_field = field.with_type(pa.string())
+            self.__adapters[field_index] = _to_string
+
+        if new_field.type != field.type:
+            self.__schema = self.__schema.set(field_index, new_field)
+
+        return new_field
+
+
+def iterate_record_batches(loader: ResultLoader, decimal_as: str = 'float') -> Iterator[Any]:
+    """
+    Load the result page by page and yield one record batch per page
+
+    The loader is expected to provide the data model of the result like QueryLoader. Otherwise, the schema is inferred
+    from the first page.
+
+    An empty record batch is yielded if the result is empty but the data model is available.
+    """
+    builder = RecordBatchBuilder(decimal_as=decimal_as)
+    batch_count = 0
+
+    try:
+        while loader.has_more():
+            try:
+                rows = loader.load()
+            except StopIteration:
+                break
+
+            data_model = getattr(loader, 'data_model', None)
+            if builder.schema is None and data_model:
+                builder.set_data_model(data_model)
+
+            if rows:
+                batch_count += 1
+                yield builder.build(rows)
+
+        if batch_count == 0 and builder.schema is not None:
+            yield import_pyarrow().RecordBatch.from_pylist([], schema=builder.schema)
+    finally:
+        loader.close()
+
+
+def to_arrow_table(batches: Iterator[Any]):
+    """ Combine the record batches into a table
+
+        The record batches built before a decimal column fell back to strings are converted to the final schema.
+    """
+    pa = import_pyarrow()
+    collected_batches = list(batches)
+
+    if not collected_batches:
+        return pa.table(dict())
+
+    schema = collected_batches[-1].schema
+
+    return pa.Table.from_batches([
+        batch if batch.schema.equals(schema) else pa.Table.from_batches([batch]).cast(schema).to_batches()[0]
+        for batch in collected_batches
+    ], schema=schema)
+
+
+def write_record_batches(batches: Iterator[Any], file_path: str, file_format: str) -> int:
+    """
+    Write the record batches to a file as they arrive
+
+    Only one record batch is held in memory at a time. With Parquet, each record batch becomes one row group.
+
+    :param batches: The record batches sharing the same schema
+    :param file_path: The output file path
+    :param file_format: One of "parquet", "feather" (Feather V2, i.e., Arrow IPC file), or "arrow-ipc" (Arrow IPC stream)
+    :return: the number of written rows
+    """
+    pa = import_pyarrow()
+
+    if file_format not in COLUMNAR_FILE_FORMATS:
+        raise ValueError(f'The given file format ({file_format}) is not available.')
+
+    batch_iterator = iter(batches)
+    first_batch = next(batch_iterator, None)
+    schema = first_batch.schema if first_batch is not None else pa.schema([])
+
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(file_path, schema)
+    elif file_format == 'feather':
+        writer = pa.ipc.new_file(file_path, schema)
+    else:
+        writer = pa.ipc.new_stream(file_path, schema)
+
+    row_count = 0
+
+    with writer:
+        if first_batch is not None:
+            writer.write_batch(first_batch)
+            row_count += first_batch.num_rows
+
+        for batch in batch_iterator:
+            if not batch.schema.equals(schema):
+                raise DataConversionError(f'The schema of the result changed after the first page was written to '
+                                          f'{file_path}, e.g., the decimal values do not fit into the decimal type. '
+                                          f'Please represent the decimal values as strings instead.')
+            writer.write_batch(batch)
+            row_count += batch.num_rows
+
+    return row_count
+
+
+def to_data_frame(table):
+    """ Convert the Arrow table to a pandas data frame """
+    # NOTE: pandas is imported by pyarrow. It is an optional dependency which is only checked here.
+    if importlib.util.find_spec('pandas') is None:
+        raise DependencyError('pandas')
+
+    return table.to_pandas()
+
+
+def rows_to_data_frame(rows: Iterable[Dict[str, Any]]):
+    """ Convert the rows to a pandas data frame without pyarrow, i.e., the column types are inferred by pandas """
+    try:
+        # We delay the import as late as possible so that the optional dependency (pandas)
+        # does not block the other functionalities of the library.
+        import pandas as pd
+    except ImportError:
+        raise DependencyError('pandas')
+
+    return pd.DataFrame(rows)
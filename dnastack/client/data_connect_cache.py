@@ -0,0 +1,425 @@
+"""
+On-disk cache for Data Connect query results
+
+Each cached result is stored as two files: the converted pages as gzip-compressed JSON lines (one line per page), and
+the information of the entry as JSON. A result is only cached once all pages have been loaded successfully.
+
+The values which JSON cannot represent (e.g., decimals and dates) are stored as single-key objects tagged with the type,
+e.g., {"$decimal": "1.50"}. The keys of the other objects starting with "$" are escaped with another "$".
+
+The entries are evicted when they expire or, in the least-recently-used order, when the total size of the cache
+exceeds the limit.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import date, datetime, time as time_of_day, timedelta
+from decimal import Decimal
+from time import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from imagination.decorator import service
+from pydantic import BaseModel
+
+from dnastack.client.result_iterator import ResultLoader, InactiveLoaderError
+from dnastack.common.environments import env
+from dnastack.common.logger import get_logger
+from dnastack.constants import LOCAL_STORAGE_DIRECTORY
+
+CACHE_FORMAT_VERSION = 2
+
+_VALUE_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    '$bytes': lambda v: base64.b64decode(v),
+    '$date': lambda v: date.fromisoformat(v),
+    '$datetime': lambda v: datetime.fromisoformat(v),
+    '$decimal': lambda v: Decimal(v),
+    '$time': lambda v: time_of_day.fromisoformat(v),
+    '$timedelta': lambda v: timedelta(days=v[0], seconds=v[1], microseconds=v[2]),
+}
+
+
+def _encode_value(value: Any) -> Any:
+    """ Convert the value into the JSON-compatible value """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    elif isinstance(value, dict):
+        return {
+            (f'${k}' if isinstance(k, str) and k.startswith('$') else k): _encode_value(v)
+            for k, v in value.items()
+        }
+    elif isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    elif isinstance(value, Decimal):
+        return {'$decimal': str(value)}
+    # NOTE: The datetime must be checked before the date as it is a subclass of the date.
+    elif isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    elif isinstance(value, date):
+        return {'$date': value.isoformat()}
+    elif isinstance(value, time_of_day):
+        return {'$time': value.isoformat()}
+    elif isinstance(value, timedelta):
+        return {'$timedelta': [value.days, value.seconds, value.microseconds]}
+    elif isinstance(value, bytes):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+    else:
+        raise TypeError(f'{type(value).__name__} cannot be cached')
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    """ Convert the JSON object back into the original value (used as the object hook of the JSON decoder) """
+    if len(obj) == 1:
+        k, v = next(iter(obj.items()))
+        if k in _VALUE_DECODERS:
+            return _VALUE_DECODERS[k](v)
+
+    if any(k.startswith('$$') for k in obj):
+        return {(k[1:] if k.startswith('$$') else k): v for k, v in obj.items()}
+
+    return obj
+
+
+class QueryCacheEntry(BaseModel):
+    """ The information of a cached query result """
+    key: str
+    endpoint_url: str
+    query: str
+    principal: str
+    created_at: float  # Epoch timestamp
+    expires_at: float  # Epoch timestamp
+    last_used_at: float  # Epoch timestamp
+    size: int  # Bytes
+    row_count: int
+    data_model: Optional[Dict[str, Any]] = None
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now or time()) >= self.expires_at
+
+
+@service.registered()
+class QueryResultCache:
+    """
+    Storage of the cached query results
+
+    :param dir_path: The cache directory. By default, it is "query-cache" under the local storage directory.
+    :param max_size: The maximum total size of the cache in bytes.
+    """
+
+    _PAGE_FILE_EXTENSION = '.pages'
+    _INFO_FILE_EXTENSION = '.json'
+
+    def __init__(self, dir_path: Optional[str] = None, max_size: Optional[int] = None):
+        self.__logger = get_logger(type(self).__name__)
+        self.__dir_path = dir_path or env('DNASTACK_QUERY_CACHE_DIR',
+                                          default=os.path.join(LOCAL_STORAGE_DIRECTORY, 'query-cache'),
+                                          description='The directory of the cached Data Connect query results')
+        self.__max_size = max_size or env('DNASTACK_QUERY_CACHE_MAX_SIZE',
+                                          default=1024 * 1024 * 1024,
+                                          transform=int,
+                                          description='The maximum total size (in bytes) of the cached Data Connect '
+                                                      'query results')
+
+    @property
+    def dir_path(self) -> str:
+        return self.__dir_path
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """ Normalize the query so that insignificant differences in whitespaces do not affect the cache key """
+        return re.sub(r'\s+', ' ', query).strip().rstrip(';').strip()
+
+    @classmethod
+    def make_key(cls, endpoint_url: str, query: str, principal: str) -> str:
+        return hashlib.sha256(json.dumps([endpoint_url, cls.normalize_query(query), principal]).encode('utf-8')) \
+            .hexdigest()
+
+    def get(self, key: str) -> Optional[QueryCacheEntry]:
+        """ Get the entry if it exists and has not expired yet. The entry is marked as recently used. """
+        entry = self.__read_entry(key)
+
+        if entry is None:
+            return None
+        elif entry.is_expired():
+            self.remove(key)
+            return None
+
+        # NOTE: The modification time of the page file is used as the last access time for the LRU eviction.
+        page_file_path = self.__get_page_file_path(key)
+        os.utime(page_file_path)
+        entry.last_used_at = os.path.getmtime(page_file_path)
+
+        return entry
+
+    def iterate_pages(self, key: str) -> Iterator[List[Any]]:
+        """ Iterate the cached pages """
+        with gzip.open(self.__get_page_file_path(key), 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line, object_hook=_decode_object)
+
+    def open_writer(self, endpoint_url: str, query: str, principal: str, ttl: float) -> 'QueryCacheWriter':
+        """ Open the writer for a new entry """
+        key = self.make_key(endpoint_url, query, principal)
+        return QueryCacheWriter(self,
+                                self.__get_page_file_path(key),
+                                self.__get_info_file_path(key),
+                                dict(version=CACHE_FORMAT_VERSION,
+                                     key=key,
+                                     endpoint_url=endpoint_url,
+                                     query=self.normalize_query(query),
+                                     principal=principal,
+                                     created_at=time(),
+                                     expires_at=time() + ttl))
+
+    def list_entries(self) -> List[QueryCacheEntry]:
+        """ List all entries, including the expired ones, from the least recently used """
+        entries = [
+            entry
+            for entry in [self.__read_entry(key) for key in self.__list_keys()]
+            if entry is not None
+        ]
+        return sorted(entries, key=lambda e: e.last_used_at)
+
+    def size(self) -> int:
+        """ The total size of the cache in bytes """
+        return sum([entry.size for entry in self.list_entries()])
+
+    def prune(self) -> List[QueryCacheEntry]:
+        """
+        Remove the expired entries, then the least recently used entries until the cache fits in the size limit
+
+        :return: the removed entries
+        """
+        removed_entries: List[QueryCacheEntry] = []
+        remaining_entries: List[QueryCacheEntry] = []
+        now = time()
+
+        for entry in self.list_entries():
+            if entry.is_expired(now):
+                self.remove(entry.key)
+                removed_entries.append(entry)
+            else:
+                remaining_entries.append(entry)
+
+        total_size = sum([entry.size for entry in remaining_entries])
+
+        for entry in remaining_entries:
+            if total_size <= self.__max_size:
+                break
+
+            self.remove(entry.key)
+            removed_entries.append(entry)
+            total_size -= entry.size
+
+        return removed_entries
+
+    def remove(self, key: str):
+        # NOTE: The info file is removed first so that the entry is never visible without its pages.
+        self.__remove(self.__get_info_file_path(key))
+        self.__remove(self.__get_page_file_path(key))
+
+    def clear(self) -> int:
+        """ Remove all entries
+
+            :return: the number of removed entries
+        """
+        keys = self.__list_keys()
+        for key in keys:
+            self.remove(key)
+        return len(keys)
+
+    def __list_keys(self) -> List[str]:
+        if not os.path.isdir(self.__dir_path):
+            return []
+
+        return [
+            file_name[:-len(self._INFO_FILE_EXTENSION)]
+            for file_name in os.listdir(self.__dir_path)
+            if file_name.endswith(self._INFO_FILE_EXTENSION)
+        ]
+
+    def __get_page_file_path(self, key: str) -> str:
+        return os.path.join(self.__dir_path, f'{key}{self._PAGE_FILE_EXTENSION}')
+
+    def __get_info_file_path(self, key: str) -> str:
+        return os.path.join(self.__dir_path, f'{key}{self._INFO_FILE_EXTENSION}')
+
+    def __read_entry(self, key: str) -> Optional[QueryCacheEntry]:
+        info_file_path = self.__get_info_file_path(key)
+
+        try:
+            with open(info_file_path, 'r') as f:
+                info: Dict[str, Any] = json.load(f)
+            page_file_stat = os.stat(self.__get_page_file_path(key))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.__logger.warning(f'{info_file_path}: Removed the unreadable entry ({type(e).__name__}: {e})')
+            self.remove(key)
+            return None
+
+        if info.get('version') != CACHE_FORMAT_VERSION:
+            self.remove(key)
+            return None
+
+        return QueryCacheEntry(key=key,
+                               endpoint_url=info['endpoint_url'],
+                               query=info['query'],
+                               principal=info['principal'],
+                               created_at=info['created_at'],
+                               expires_at=info['expires_at'],
+                               last_used_at=page_file_stat.st_mtime,
+                               size=page_file_stat.st_size,
+                               row_count=info['row_count'],
+                               data_model=info.get('data_model'))
+
+    @staticmethod
+    def __remove(file_path: str):
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+
+
+class QueryCacheWriter:
+    """
+    Writer of a new cache entry
+
+    The pages are written to a temporary file, which only replaces the entry when the writer is committed.
+    """
+
+    def __init__(self, cache: QueryResultCache, page_file_path: str, info_file_path: str, info: Dict[str, Any]):
+        self.__cache = cache
+        self.__page_file_path = page_file_path
+        self.__info_file_path = info_file_path
+        self.__temp_file_path = f'{page_file_path}.{os.getpid()}.{time()}.swap'
+        self.__info = info
+        self.__row_count = 0
+        self.__done = False
+
+        os.makedirs(os.path.dirname(page_file_path), exist_ok=True)
+        self.__stream = gzip.open(self.__temp_file_path, 'wt', encoding='utf-8', compresslevel=1)
+
+    def write(self, page: List[Any]):
+        if self.__done:
+            return
+
+        try:
+            line = json.dumps(_encode_value(page), separators=(',', ':'))
+        except (TypeError, ValueError) as e:
+            get_logger(type(self).__name__).warning(f'The result is not cached ({e})')
+            self.abort()
+            return
+
+        self.__stream.write(line)
+        self.__stream.write('\n')
+        self.__row_count += len(page)
+
+    def commit(self, data_model: Optional[Dict[str, Any]] = None):
+        """ Save the entry and evict the old entries if necessary """
+        if self.__done:
+            return
+
+        self.__done = True
+        self.__stream.close()
+
+        temp_info_file_path = f'{self.__info_file_path}.{os.getpid()}.{time()}.swap'
+        with open(temp_info_file_path, 'w') as f:
+            json.dump(dict(self.__info, row_count=self.__row_count, data_model=data_model), f)
+
+        os.replace(self.__temp_file_path, self.__page_file_path)
+        os.replace(temp_info_file_path, self.__info_file_path)
+
+        self.__cache.prune()
+
+    def abort(self):
+        """ Discard the entry """
+        if self.__done:
+            return
+
+        self.__done = True
+        self.__stream.close()
+
+        if os.path.exists(self.__temp_file_path):
+            os.unlink(self.__temp_file_path)
+
+
+class CachedResultLoader(ResultLoader):
+    """ Loader of the pages from a cache entry """
+
+    def __init__(self, cache: QueryResultCache, entry: QueryCacheEntry):
+        self.__key = entry.key
+        self.__data_model = entry.data_model
+        self.__pages = cache.iterate_pages(entry.key)
+        self.__next_page: Optional[List[Any]] = None
+        self.__active = True
+        self.__prepare_next_page()
+
+    @property
+    def data_model(self) -> Optional[Dict[str, Any]]:
+        return self.__data_model
+
+    def has_more(self) -> bool:
+        return self.__active
+
+    def load(self) -> List[Any]:
+        if not self.__active:
+            raise InactiveLoaderError(self.__key)
+
+        page = self.__next_page
+        self.__prepare_next_page()
+        return page
+
+    def close(self):
+        self.__active = False
+        self.__pages.close()
+
+    def __prepare_next_page(self):
+        try:
+            self.__next_page = next(self.__pages)
+        except StopIteration:
+            self.__next_page = None
+            self.__active = False
+
+
+class CachingResultLoader(ResultLoader):
+    """ Loader saving the pages loaded by the given loader into the cache """
+
+    def __init__(self, loader: ResultLoader, writer: QueryCacheWriter):
+        self.__loader = loader
+        self.__writer = writer
+
+    @property
+    def data_model(self) -> Optional[Dict[str, Any]]:
+        return getattr(self.__loader, 'data_model', None)
+
+    def has_more(self) -> bool:
+        return self.__loader.has_more()
+
+    def load(self) -> List[Any]:
+        try:
+            page = self.__loader.load()
+        except BaseException:
+            self.__writer.abort()
+            raise
+
+        if getattr(self.__loader, 'interrupted', False):
+            # The result is incomplete.
+            self.__writer.abort()
+        else:
+            self.__writer.write(page)
+            if not self.__loader.has_more():
+                self.__writer.commit(self.data_model)
+
+        return page
+
+    def close(self):
+        # NOTE: If the result is not fully loaded, the partial result is discarded.
+        self.__writer.abort()
+        self.__loader.close()
@@ -1,26 +1,50 @@
+import json
 import os
 import re
 import threading
-from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import AbstractContextManager
 from datetime import datetime
 from enum import Enum
 from io import TextIOWrapper
-from typing import Optional, List, Dict
+from time import perf_counter
+from typing import Optional, List, Dict, Tuple, Iterator, Iterable, Any
 from urllib.parse import urlparse, urljoin
 
 import urllib3
-from pydantic import BaseModel, Field
+from imagination import container
+from pydantic import BaseModel, Field, validator
 
 from .base_client import BaseServiceClient
+from .drs_blob_cache import BlobCache
+from .drs_cache import DrsResolutionCache
+from .drs_reader import BlobReader, DEFAULT_BLOCK_SIZE, DEFAULT_MAX_CACHED_BLOCK_COUNT, \
+    DEFAULT_MAX_READAHEAD_BLOCK_COUNT
+from .drs_scheduler import BandwidthLimiter, DownloadScheduler
+from .drs_checksum import ChecksumCalculator, ChecksumMismatchError, OrderedChecksumFeeder
 from .models import ServiceEndpoint
 from .service_registry.models import ServiceType
-from ..common.events import Event
+from ..common.environments import env, flag
+from ..common.events import Event, EventSource
 from ..common.logger import get_logger
 from ..http.session import HttpSession, HttpError
 
 DRS_TYPE_V1_1 = ServiceType(group='org.ga4gh', artifact='drs', version='1.1.0')
 
+MIN_READ_SIZE = 64 * 1024
+MAX_READ_SIZE = 4 * 1024 * 1024
+PROGRESS_EVENT_INTERVAL = 0.2  # Seconds
+PROGRESS_EVENT_BYTE_INTERVAL = 64 * 1024 * 1024
+DEFAULT_PART_SIZE = 32 * 1024 * 1024
+DEFAULT_PART_CONCURRENCY = 4
+DEFAULT_PART_THRESHOLD = 64 * 1024 * 1024
+
+# The minimum number of connections kept in the transfer pool for each storage server
+DEFAULT_TRANSFER_POOL_SIZE = 10
+
+# The HTTP statuses of the responses to the bulk requests meaning that the server does not support them
+_BULK_REQUEST_UNSUPPORTED_STATUSES = (400, 404, 405, 501)
+
 
 class MissingOptionalRequirementError(RuntimeError):
     """ Raised when a optional requirement is not available """
@@ -133,6 +157,16 @@ class DrsObjectAccessUrl(BaseModel):
     headers: Optional[Dict[str, str]] = Field(default_factory=dict)
     url: str
 
+    @validator('headers', pre=True)
+    def parse_header_list(cls, headers: Any):
+        # NOTE: The DRS specification defines the headers as a list of strings, e.g., ["Authorization: Basic xyz"].
+        if isinstance(headers, list):
+            return {
+                name.strip(): value.strip()
+                for name, value in [header.split(':', 1) for header in headers if ':' in header]
+            }
+        return headers
+
 
 class DrsObjectAccessMethod(BaseModel):
     access_id: Optional[str] = None
@@ -168,6 +202,46 @@ class DrsObject(BaseModel):
 
 
 
+def get_object_version(drs_object: DrsObject) -> str:
+    """ Get the version of the object, or the update time if the version is not provided """
+    return drs_object.version or drs_object.updated_time.isoformat()
+
+
+def get_blob_cache_key(drs_url: str, drs_object: DrsObject) -> str:
+    """ Get the key of the object in the blob cache """
+    return BlobCache.make_key(drs_url,
+                              get_object_version(drs_object),
+                              drs_object.size,
+                              [(checksum.type, checksum.checksum) for checksum in drs_object.checksums])
+
+
+class ResolvedDrsObject(BaseModel):
+    """ The result of the resolution of a DRS object and its access URL """
+    drs_url: Optional[str] = None
+    drs_object: Optional[DrsObject] = None
+    access_url: Optional[DrsObjectAccessUrl] = None
+    error: Optional[str] = None
+
+
+def select_access_method(drs_object: DrsObject) -> DrsObjectAccessMethod:
+    """
+    Select the access method to download the object, i.e., the first one with either the access URL or the access ID
+    of the HTTPS access URL
+
+    :raises NoUsableAccessMethodError: if there is no usable access methods
+    """
+    for access_method in drs_object.access_methods or []:
+        if access_method.access_url:
+            # if we have a direct access_url for the access_method, use that
+            return access_method
+        elif access_method.access_id and access_method.type == 'https':
+            # the access_id can be used to get the download url
+            return access_method
+
+    # we couldn't find a download url, exit unsuccessful
+    raise NoUsableAccessMethodError()
+
+
 class DownloadOkEvent(Event):
     @property
     def drs_url(self):
@@ -222,23 +296,289 @@ class DownloadFailureEvent(Event):
         return cls(details=kwargs)
 
 
+class DownloadSkippedEvent(Event):
+    @property
+    def drs_url(self):
+        return self.details.get('drs_url')
+
+    @property
+    def output_file_path(self):
+        return self.details.get('output_file_path')
+
+    @property
+    def byte_count(self):
+        return self.details.get('byte_count')
+
+    @classmethod
+    def make(cls, **kwargs):
+        return cls(details=kwargs)
+
+
 class DownloadStatus(Enum):
     """An Enum to Describe the current status of a DRS download"""
 
     SUCCESS = 0
     FAIL = 1
+    SKIPPED = 2
+
+
+class AdaptiveStreamReader:
+    """
+    Reader of a response stream into a reusable buffer
+
+    The read size is adjusted to the throughput so that each read takes about the target duration, starting with the
+    minimum read size. This keeps the number of reads (and Python iterations) low on a fast connection while still
+    yielding data frequently on a slow one.
+    """
+
+    TARGET_READ_DURATION = 0.1  # Seconds
+
+    def __init__(self, response: urllib3.HTTPResponse, min_read_size: int = MIN_READ_SIZE,
+                 max_read_size: int = MAX_READ_SIZE):
+        self.__response = response
+        self.__min_read_size = min_read_size
+        self.__max_read_size = max_read_size
+        self.__read_size = min_read_size
+        self.__buffer = bytearray(min_read_size)
+
+    @property
+    def read_size(self) -> int:
+        return self.__read_size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        """ Iterate the chunks of the content
+
+            Each chunk is a view of the reusable buffer, which is only valid until the next chunk is read.
+        """
+        view = memoryview(self.__buffer)
+
+        while True:
+            if self.__read_size > len(self.__buffer):
+                # NOTE: The buffer only grows. The previous chunk is no longer used at this point.
+                self.__buffer = bytearray(self.__read_size)
+                view = memoryview(self.__buffer)
+
+            started_at = perf_counter()
+            read_byte_count = self.__response.readinto(view[:self.__read_size])
+
+            if not read_byte_count:
+                return
+
+            duration = perf_counter() - started_at
+
+            if read_byte_count == self.__read_size and duration < self.TARGET_READ_DURATION / 2:
+                self.__read_size = min(self.__read_size * 2, self.__max_read_size)
+            elif duration > self.TARGET_READ_DURATION * 2:
+                self.__read_size = max(self.__read_size // 2, self.__min_read_size)
+
+            yield view[:read_byte_count]
+
+
+class DownloadProgressReporter:
+    """
+    Dispatcher of the progress events of a download
+
+    An event is only dispatched when the given interval has passed or when the given number of bytes has been read since
+    the last event, unless the download is complete. This is thread-safe.
+    """
+
+    def __init__(self,
+                 events: EventSource,
+                 drs_url: str,
+                 total_byte_count: int,
+                 read_byte_count: int = 0,
+                 interval: float = PROGRESS_EVENT_INTERVAL,
+                 byte_interval: int = PROGRESS_EVENT_BYTE_INTERVAL):
+        self.__events = events
+        self.__drs_url = drs_url
+        self.__total_byte_count = total_byte_count
+        self.__read_byte_count = read_byte_count
+        self.__interval = interval
+        self.__byte_interval = byte_interval
+        self.__last_reported_at = perf_counter()
+        self.__last_reported_byte_count = read_byte_count
+        self.__lock = threading.Lock()
+
+    @property
+    def read_byte_count(self) -> int:
+        return self.__read_byte_count
+
+    def add(self, size: int):
+        with self.__lock:
+            self.__read_byte_count += size
+
+            now = perf_counter()
+            if (
+                    now - self.__last_reported_at >= self.__interval
+                    or self.__read_byte_count - self.__last_reported_byte_count >= self.__byte_interval
+                    or self.__read_byte_count >= self.__total_byte_count
+            ):
+                self.__report(now)
+
+    def flush(self):
+        """ Dispatch the event for the current progress """
+        with self.__lock:
+            self.__report(perf_counter())
+
+    def __report(self, now: float):
+        self.__last_reported_at = now
+        self.__last_reported_byte_count = self.__read_byte_count
+        self.__events.dispatch('download-progress',
+                               DownloadProgressEvent.make(drs_url=self.__drs_url,
+                                                          read_byte_count=self.__read_byte_count,
+                                                          total_byte_count=self.__total_byte_count))
+
+
+class DownloadJournal:
+    """
+    Sidecar journal of the byte ranges already written into a partially downloaded file
+
+    The journal is saved after each completed range so that an interrupted download can be continued from where it
+    stopped. It only applies to the same DRS object with the same size.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, file_path: str, drs_url: str, total_size: int):
+        self.__file_path = file_path
+        self.__drs_url = drs_url
+        self.__total_size = total_size
+        self.__completed_ranges: List[Tuple[int, int]] = []
+        self.__lock = threading.Lock()
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    @property
+    def completed_ranges(self) -> List[Tuple[int, int]]:
+        with self.__lock:
+            return list(self.__completed_ranges)
+
+    @property
+    def completed_byte_count(self) -> int:
+        return sum([end - start + 1 for start, end in self.completed_ranges])
+
+    def load(self) -> bool:
+        """ Load the journal if it exists and belongs to the same object
+
+            :return: True if the journal is loaded
+        """
+        try:
+            with open(self.__file_path, 'r') as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (
+                content.get('version') != self.FORMAT_VERSION
+                or content.get('drs_url') != self.__drs_url
+                or content.get('total_size') != self.__total_size
+        ):
+            return False
+
+        with self.__lock:
+            self.__completed_ranges = self.__merge([(start, end) for start, end in content.get('completed_ranges')])
+
+        return True
+
+    def add(self, start: int, end: int):
+        """ Record the range (inclusive) as completed and save the journal """
+        with self.__lock:
+            self.__completed_ranges = self.__merge(self.__completed_ranges + [(start, end)])
+            self.__save()
+
+    def get_missing_ranges(self, part_size: int) -> List[Tuple[int, int]]:
+        """ Get the ranges (inclusive) not yet completed, split into parts of the given size """
+        missing_ranges: List[Tuple[int, int]] = []
+        position = 0
+
+        for start, end in self.completed_ranges + [(self.__total_size, self.__total_size)]:
+            for part_start in range(position, start, part_size):
+                missing_ranges.append((part_start, min(part_start + part_size, start) - 1))
+            position = max(position, end + 1)
+
+        return missing_ranges
+
+    def remove(self):
+        with self.__lock:
+            self.__completed_ranges = []
+            try:
+                os.unlink(self.__file_path)
+            except FileNotFoundError:
+                pass
+
+    def __save(self):
+        temp_file_path = f'{self.__file_path}.{os.getpid()}.swap'
+        with open(temp_file_path, 'w') as f:
+            json.dump(dict(version=self.FORMAT_VERSION,
+                           drs_url=self.__drs_url,
+                           total_size=self.__total_size,
+                           completed_ranges=self.__completed_ranges),
+                      f)
+        os.replace(temp_file_path, self.__file_path)
+
+    @staticmethod
+    def __merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        merged_ranges: List[Tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            if merged_ranges and start <= merged_ranges[-1][1] + 1:
+                merged_ranges[-1] = (merged_ranges[-1][0], max(merged_ranges[-1][1], end))
+            else:
+                merged_ranges.append((start, end))
+        return merged_ranges
+
+
+def _to_object_api_error(e: HttpError, api_url: str) -> DrsApiError:
+    """ Convert the HTTP error on the request for a DRS object """
+    object_info_status_code = e.response.status_code
+
+    if object_info_status_code == 404:
+        return DrsApiError(f'DRS object does not exist (HTTP 404 on {api_url})')
+    elif object_info_status_code == 403:
+        return DrsApiError(f'Access Denied (HTTP 403 on {api_url}')
+    else:
+        return DrsApiError("There was an error getting object info from the DRS Client")
 
 
 class Blob(AbstractContextManager):
-    def __init__(self, drs_url: str, session: HttpSession):
+    """
+    DRS object as a blob
+
+    The object and its access URL are resolved through the given resolution cache, which is usually shared by all blobs
+    of the same DRS client. The access URL is resolved again when the cached one is about to expire.
+
+    The content is transferred through the given connection pool, which is usually shared by all blobs of the same DRS
+    client so that the connections to the storage servers are reused. Without the pool, the blob uses its own pool,
+    which is cleared when the blob is closed.
+
+    With the blob cache, the content is read from the cache if available, and stored into the cache once it is loaded.
+    """
+
+    def __init__(self,
+                 drs_url: str,
+                 session: HttpSession,
+                 drs_object: Optional[DrsObject] = None,
+                 access_url: Optional[DrsObjectAccessUrl] = None,
+                 resolution_cache: Optional[DrsResolutionCache] = None,
+                 pool: Optional[urllib3.PoolManager] = None,
+                 blob_cache: Optional[BlobCache] = None):
         self._logger = get_logger(f'{type(self).__name__}/{drs_url}')
         self.__drs_url = drs_url
         self.__metadata = DrsMinimalMetadata(self.__drs_url)
-        self.__object: Optional[DrsObject] = None
+        self.__object: Optional[DrsObject] = drs_object
         self.__session = session
-        self.__pool: Optional[urllib3.PoolManager] = None
+        self.__pool: Optional[urllib3.PoolManager] = pool
+        self.__owns_pool = pool is None
         self.__connection: Optional[TextIOWrapper] = None
         self.__cache_data: Optional[bytes] = None
+        self.__resolution_cache = resolution_cache or DrsResolutionCache()
+        self.__blob_cache = blob_cache
+
+        if drs_object:
+            self.__resolution_cache.put_object(drs_url, drs_object)
+            if access_url:
+                self.__resolution_cache.put_access_url(drs_url, get_object_version(drs_object), access_url)
 
     def __enter__(self):
         return self
@@ -272,70 +612,95 @@ class Blob(AbstractContextManager):
     @property
     def data(self) -> bytes:
         if not self.__cache_data:
-            self.__cache_data = self._connection.read()
-            self.__connection.close()
+            blob_cache_key = get_blob_cache_key(self.__drs_url, self.drs_object) if self.__blob_cache else None
+
+            if blob_cache_key:
+                self.__cache_data = self.__blob_cache.read(blob_cache_key)
+
+            if not self.__cache_data:
+                self.__cache_data = self._connection.read()
+                self.__connection.close()
+
+                if blob_cache_key:
+                    self.__blob_cache.put_data(blob_cache_key, self.__cache_data)
         return self.__cache_data
 
     @property
     def name(self) -> str:
         return urlparse(self.get_download_url()).path.split(r'/')[-1]
 
+    def open(self,
+             mode: str = 'rb',
+             block_size: int = DEFAULT_BLOCK_SIZE,
+             max_cached_block_count: int = DEFAULT_MAX_CACHED_BLOCK_COUNT,
+             max_readahead_block_count: int = DEFAULT_MAX_READAHEAD_BLOCK_COUNT) -> BlobReader:
+        """
+        Open the blob as a seekable read-only file-like object, backed by HTTP range requests
+
+        Only the parts of the blob actually read are downloaded. For example, the header of a large VCF file can be
+        read with "pandas.read_csv(blob.open(), nrows=100, ...)" without downloading the whole file.
+
+        :param mode: Only "rb" is supported.
+        :param block_size: The size of each block in bytes
+        :param max_cached_block_count: The maximum number of blocks kept in memory
+        :param max_readahead_block_count: The maximum number of blocks read ahead when the blob is read sequentially
+        """
+        if mode != 'rb':
+            raise ValueError(f'The mode ({mode}) is not supported. Only "rb" is supported.')
+
+        return BlobReader(self.__drs_url,
+                          self.drs_object.size,
+                          self._pool,
+                          self.get_access_url_object,
+                          block_size=block_size,
+                          max_cached_block_count=max_cached_block_count,
+                          max_readahead_block_count=max_readahead_block_count)
+
     def close(self):
         if self.__connection and not self.__connection.closed:
             self.__connection.close()
-        if self.__pool:
+        if self.__pool and self.__owns_pool:
             self.__pool.clear()
 
     def get_object(self) -> DrsObject:
-        """ Get the DRS Access URL Object """
-        if self.__object:
-            return self.__object
-        else:
-            api_url = urljoin(self.__metadata.drs_server_url, f'objects/{self.__metadata.object_id}')
-
-            try:
-                object_info_response = self.__session.get(api_url)
-            except HttpError as e:
-                object_info_status_code = e.response.status_code
+        """ Get the DRS Object """
+        if not self.__object:
+            self.__object = self.__resolution_cache.get_object(self.__drs_url, self.__fetch_object)
+        return self.__object
 
-                if object_info_status_code == 404:
-                    raise DrsApiError(f'DRS object does not exist (HTTP 404 on {api_url})')
-                elif object_info_status_code == 403:
-                    raise DrsApiError(f'Access Denied (HTTP 403 on {api_url}')
-                else:
-                    raise DrsApiError("There was an error getting object info from the DRS Client")
+    def __fetch_object(self) -> DrsObject:
+        api_url = urljoin(self.__metadata.drs_server_url, f'objects/{self.__metadata.object_id}')
 
-            object_info = object_info_response.json()
+        try:
+            object_info_response = self.__session.get(api_url)
+        except HttpError as e:
+            raise _to_object_api_error(e, api_url)
 
-            self.__object = DrsObject(**object_info)
+        object_info = object_info_response.json()
 
-            return self.__object
+        return DrsObject(**object_info)
 
     def get_access_url_object(self) -> DrsObjectAccessUrl:
         """ Get the DRS Access URL Object """
+        return self.__resolution_cache.get_access_url(self.__drs_url,
+                                                      get_object_version(self.get_object()),
+                                                      self.__resolve_access_url_object)
+
+    def __resolve_access_url_object(self) -> DrsObjectAccessUrl:
         drs_obj = self.get_object()
         self._logger.debug(f'DRS Object:\n\n{drs_obj.json(indent=2)}\n')
 
-        if drs_obj.access_methods:
-            for access_method in drs_obj.access_methods:
-                if access_method.access_url:
-                    # if we have a direct access_url for the access_method, use that
-                    return access_method.access_url
-                elif access_method.access_id:
-                    # try to use the access_id to get the download url
-                    if access_method.type == 'https':
-                        object_access_response = self.__session.get(
-                            urljoin(self.__metadata.drs_server_url,
-                                    f'objects/{self.__metadata.object_id}/access/{access_method.access_id}')
-                        )
-                        return DrsObjectAccessUrl(**object_access_response.json())
-                    else:
-                        continue
+        access_method = select_access_method(drs_obj)
 
-            # we couldn't find a download url, exit unsuccessful
-            raise NoUsableAccessMethodError()
+        if access_method.access_url:
+            return access_method.access_url
         else:
-            raise NoUsableAccessMethodError()  # next page token, just return
+            # try to use the access_id to get the download url
+            object_access_response = self.__session.get(
+                urljoin(self.__metadata.drs_server_url,
+                        f'objects/{self.__metadata.object_id}/access/{access_method.access_id}')
+            )
+            return DrsObjectAccessUrl(**object_access_response.json())
 
     def get_download_url(self) -> str:
         """ Get the URL to download the DRS object """
@@ -353,7 +718,85 @@ class DrsClient(BaseServiceClient):
         # lock to prevent race conditions for file output
         self.__exit_code_lock = threading.Lock()
 
-        self._events.add_fixed_types('download-ok', 'download-progress', 'download-failure')
+        # The DRS servers not supporting the bulk requests
+        self.__servers_without_bulk_requests = set()
+
+        self.__resolution_cache = DrsResolutionCache()
+
+        # The connection pool shared by the blobs to transfer the content from the access URLs
+        self.__transfer_pool: Optional[urllib3.PoolManager] = None
+        self.__transfer_pool_size = 0
+        self.__transfer_pool_lock = threading.Lock()
+        self.__max_connections_per_host: Optional[int] = env('DNASTACK_DRS_MAX_CONNECTIONS_PER_HOST',
+                                                             transform=int,
+                                                             description='The maximum number of concurrent '
+                                                                         'connections to each storage server')
+
+        # The local cache of the blobs, only used when it is enabled
+        self.__blob_cache: Optional[BlobCache] = (
+            container.get(BlobCache)
+            if flag('DNASTACK_BLOB_CACHE', description='Enable the local cache of the DRS blobs')
+            else None
+        )
+
+        self._events.add_fixed_types('download-ok', 'download-progress', 'download-failure', 'download-skipped')
+
+    @property
+    def resolution_cache(self) -> DrsResolutionCache:
+        """ The cache of the DRS objects and their access URLs shared by the blobs of this client """
+        return self.__resolution_cache
+
+    @property
+    def blob_cache(self) -> Optional[BlobCache]:
+        """ The local cache of the blobs, or None if it is disabled """
+        return self.__blob_cache
+
+    @blob_cache.setter
+    def blob_cache(self, blob_cache: Optional[BlobCache]):
+        self.__blob_cache = blob_cache
+
+    @property
+    def max_connections_per_host(self) -> Optional[int]:
+        """ The maximum number of concurrent connections to each storage server, or None for no limit """
+        return self.__max_connections_per_host
+
+    @max_connections_per_host.setter
+    def max_connections_per_host(self, max_connections_per_host: Optional[int]):
+        with self.__transfer_pool_lock:
+            self.__max_connections_per_host = max_connections_per_host
+            # NOTE: The next transfer pool is created with the new limit.
+            self.__transfer_pool = None
+            self.__transfer_pool_size = 0
+
+    def get_transfer_pool(self, max_connections: Optional[int] = None) -> urllib3.PoolManager:
+        """
+        Get the connection pool shared by the blobs to transfer the content from the access URLs
+
+        The pool keeps up to the given number of connections to each storage server. If the current pool is smaller,
+        it is replaced with a larger one. When the maximum number of connections per host is set, the requests wait for
+        a free connection instead of opening more connections to the same server.
+
+        :param max_connections: The number of connections expected to be used concurrently
+        """
+        max_connections = max(max_connections or 1, DEFAULT_TRANSFER_POOL_SIZE)
+
+        with self.__transfer_pool_lock:
+            if self.__transfer_pool is None or self.__transfer_pool_size < max_connections:
+                # NOTE: The previous pool is not cleared as its connections may still be in use by other threads.
+                #       Its idle connections are closed once it is no longer referenced.
+                self.__transfer_pool = urllib3.PoolManager(
+                    maxsize=self.__max_connections_per_host or max_connections,
+                    block=self.__max_connections_per_host is not None,
+                )
+                self.__transfer_pool_size = max_connections
+            return self.__transfer_pool
+
+    def close(self):
+        if getattr(self, '_DrsClient__transfer_pool', None):
+            self.__transfer_pool.clear()
+            self.__transfer_pool = None
+            self.__transfer_pool_size = 0
+        super().close()
 
     @staticmethod
     def get_adapter_type():
@@ -378,50 +821,373 @@ class DrsClient(BaseServiceClient):
             with self.__exit_code_lock:
                 exit_codes[status][url] = message
 
+    def resolve_many(self,
+                     id_or_urls: Iterable[str],
+                     concurrency: int = 8,
+                     no_auth: bool = False,
+                     bulk_size: int = 1000) -> Dict[str, ResolvedDrsObject]:
+        """
+        Resolve the DRS objects and their access URLs
+
+        The bulk requests (POST /objects and /objects/access) are used when the DRS server supports them. Otherwise,
+        the objects are resolved one by one, with up to the given number of concurrent requests.
+
+        :param id_or_urls: DRS IDs or URLs
+        :param concurrency: The maximum number of concurrent requests when the bulk requests are not supported
+        :param no_auth: Skip automatic authentication if set
+        :param bulk_size: The maximum number of objects per bulk request
+        :return: the map of the given ID or URL to the result. Unlike the other methods, the failure to resolve an
+                 object is reported in the result instead of being raised.
+        """
+        results: Dict[str, ResolvedDrsObject] = dict()
+
+        # Map each server to the requested IDs or URLs of each object.
+        requested_object_map: Dict[str, Dict[str, List[str]]] = dict()
+        drs_url_map: Dict[Tuple[str, str], str] = dict()
+        for id_or_url in dict.fromkeys(id_or_urls):
+            try:
+                metadata = DrsMinimalMetadata(self.__to_drs_url(id_or_url))
+            except InvalidDrsUrlError as e:
+                results[id_or_url] = ResolvedDrsObject(error=f'{type(e).__name__}: {e}')
+                continue
+
+            cached_object: Optional[DrsObject] = self.__resolution_cache.get_object(metadata.url)
+            cached_access_url: Optional[DrsObjectAccessUrl] = (
+                self.__resolution_cache.get_access_url(metadata.url, get_object_version(cached_object))
+                if cached_object
+                else None
+            )
+            if cached_access_url:
+                results[id_or_url] = ResolvedDrsObject(drs_url=metadata.url,
+                                                       drs_object=cached_object,
+                                                       access_url=cached_access_url)
+                continue
+
+            requested_object_map.setdefault(metadata.drs_server_url, dict()) \
+                .setdefault(metadata.object_id, list()) \
+                .append(id_or_url)
+            drs_url_map[(metadata.drs_server_url, metadata.object_id)] = metadata.url
+
+        with self.create_http_session(no_auth=no_auth) as session:
+            for drs_server_url, object_id_map in requested_object_map.items():
+                drs_urls = {object_id: drs_url_map[(drs_server_url, object_id)] for object_id in object_id_map}
+
+                server_results = None
+                if drs_server_url not in self.__servers_without_bulk_requests:
+                    server_results = self.__resolve_in_bulk(session, drs_server_url, drs_urls, concurrency, bulk_size)
+                if server_results is None:
+                    server_results = self.__resolve_individually(session, drs_urls, concurrency)
+
+                for object_id, requested_id_or_urls in object_id_map.items():
+                    result = server_results[object_id]
+
+                    if result.drs_object:
+                        self.__resolution_cache.put_object(result.drs_url, result.drs_object)
+                        if result.access_url:
+                            self.__resolution_cache.put_access_url(result.drs_url,
+                                                                   get_object_version(result.drs_object),
+                                                                   result.access_url)
+
+                    for id_or_url in requested_id_or_urls:
+                        results[id_or_url] = result
+
+        return results
+
+    def __resolve_in_bulk(self,
+                          session: HttpSession,
+                          drs_server_url: str,
+                          drs_urls: Dict[str, str],
+                          concurrency: int,
+                          bulk_size: int) -> Optional[Dict[str, ResolvedDrsObject]]:
+        """ Resolve the objects with the bulk requests, or return None if the server does not support them """
+        object_ids = list(drs_urls.keys())
+        drs_objects: Dict[str, DrsObject] = dict()
+        access_urls: Dict[str, DrsObjectAccessUrl] = dict()
+        access_ids: Dict[str, str] = dict()
+        errors: Dict[str, str] = dict()
+
+        try:
+            for offset in range(0, len(object_ids), bulk_size):
+                response = session.post(urljoin(drs_server_url, 'objects'),
+                                        json=dict(bulk_object_ids=object_ids[offset:offset + bulk_size]))
+                content = response.json()
+
+                for object_info in content.get('resolved_drs_object') or []:
+                    drs_objects[object_info['id']] = DrsObject(**object_info)
+
+                errors.update(self.__get_bulk_errors(content))
+        except HttpError as e:
+            if e.response.status_code in _BULK_REQUEST_UNSUPPORTED_STATUSES:
+                self._logger.debug(f'{drs_server_url}: The bulk requests are not supported '
+                                   f'(HTTP {e.response.status_code})')
+                self.__servers_without_bulk_requests.add(drs_server_url)
+                return None
+            raise
+
+        for object_id, drs_object in drs_objects.items():
+            try:
+                access_method = select_access_method(drs_object)
+            except NoUsableAccessMethodError as e:
+                errors[object_id] = f'{type(e).__name__}: No usable access method'
+                continue
+
+            if access_method.access_url:
+                access_urls[object_id] = access_method.access_url
+            else:
+                access_ids[object_id] = access_method.access_id
+
+        if access_ids:
+            pending_object_ids = list(access_ids.keys())
+            try:
+                for offset in range(0, len(pending_object_ids), bulk_size):
+                    response = session.post(
+                        urljoin(drs_server_url, 'objects/access'),
+                        json=dict(bulk_object_access_ids=[
+                            dict(bulk_object_id=object_id, bulk_access_ids=[access_ids[object_id]])
+                            for object_id in pending_object_ids[offset:offset + bulk_size]
+                        ])
+                    )
+                    content = response.json()
+
+                    for access_url_info in content.get('resolved_drs_object_access_urls') or []:
+                        access_urls[access_url_info['drs_object_id']] = DrsObjectAccessUrl(
+                            url=access_url_info['url'],
+                            headers=access_url_info.get('headers') or dict(),
+                        )
+
+                    errors.update(self.__get_bulk_errors(content))
+            except HttpError as e:
+                if e.response.status_code not in _BULK_REQUEST_UNSUPPORTED_STATUSES:
+                    raise
+
+                self._logger.debug(f'{drs_server_url}: The bulk access requests are not supported '
+                                   f'(HTTP {e.response.status_code})')
+                access_urls.update({
+                    object_id: result.access_url
+                    for object_id, result in self.__resolve_individually(session,
+                                                                         {k: drs_urls[k] for k in access_ids},
+                                                                         concurrency,
+                                                                         drs_objects).items()
+                    if result.access_url
+                })
+
+        return {
+            object_id: ResolvedDrsObject(
+                drs_url=drs_url,
+                drs_object=drs_objects.get(object_id),
+                access_url=access_urls.get(object_id),
+                error=(
+                    None
+                    if object_id in access_urls
+                    else errors.get(object_id) or 'Unable to resolve the access URL'
+                )
+            )
+            for object_id, drs_url in drs_urls.items()
+        }
+
+    @staticmethod
+    def __get_bulk_errors(content: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            object_id: f'HTTP {unresolved_group.get("error_code")}'
+            for unresolved_group in content.get('unresolved_drs_objects') or []
+            for object_id in unresolved_group.get('object_ids') or []
+        }
+
+    def __resolve_individually(self,
+                               session: HttpSession,
+                               drs_urls: Dict[str, str],
+                               concurrency: int,
+                               drs_objects: Optional[Dict[str, DrsObject]] = None) -> Dict[str, ResolvedDrsObject]:
+        """ Resolve the objects with one request per object (and per access URL) """
+        drs_objects = drs_objects or dict()
+
+        def resolve(object_id: str) -> ResolvedDrsObject:
+            blob = Blob(drs_urls[object_id],
+                        session,
+                        drs_object=drs_objects.get(object_id),
+                        resolution_cache=self.__resolution_cache,
+                        pool=self.get_transfer_pool(),
+                        blob_cache=self.__blob_cache)
+            try:
+                return ResolvedDrsObject(drs_url=blob.drs_url,
+                                         drs_object=blob.get_object(),
+                                         access_url=blob.get_access_url_object())
+            except (DrsApiError, NoUsableAccessMethodError, HttpError) as e:
+                return ResolvedDrsObject(drs_url=blob.drs_url,
+                                         drs_object=drs_objects.get(object_id),
+                                         error=f'{type(e).__name__}: {e}')
+
+        object_ids = list(drs_urls.keys())
+        if not object_ids:
+            return dict()
+
+        # NOTE: The first object is resolved alone so that the session is authenticated before the concurrent requests.
+        results = {object_ids[0]: resolve(object_ids[0])}
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+            results.update(zip(object_ids[1:], pool.map(resolve, object_ids[1:])))
+
+        return results
+
+    def __to_drs_url(self, id_or_url: str) -> str:
+        if id_or_url.startswith('drs://'):
+            # It is assumed to be a DRS URL.
+            return id_or_url
+        else:
+            # It is assumed to be a DRS ID.
+            parsed_base_url = urlparse(self.endpoint.url)
+            return f'drs://{parsed_base_url.netloc}/{id_or_url}'
+
     def get_blob(self,
                  id_or_url: Optional[str] = None,
                  id: Optional[str] = None,
                  url: Optional[str] = None,
                  no_auth: bool = False) -> Blob:
+        return Blob(self.__get_drs_url(id_or_url, id, url),
+                    self.create_http_session(no_auth=no_auth),
+                    resolution_cache=self.__resolution_cache,
+                    pool=self.get_transfer_pool(),
+                    blob_cache=self.__blob_cache)
+
+    async def get_blob_async(self,
+                             id_or_url: Optional[str] = None,
+                             id: Optional[str] = None,
+                             url: Optional[str] = None,
+                             no_auth: bool = False) -> Blob:
+        """
+        Get the blob with its object and access URL resolved without blocking the event loop (requires httpx)
+
+        Please note that the content of the blob is still transferred synchronously.
+        """
+        drs_url = self.__get_drs_url(id_or_url, id, url)
+        metadata = DrsMinimalMetadata(drs_url)
+
+        drs_object: Optional[DrsObject] = self.__resolution_cache.get_object(drs_url)
+        access_url: Optional[DrsObjectAccessUrl] = (
+            self.__resolution_cache.get_access_url(drs_url, get_object_version(drs_object))
+            if drs_object
+            else None
+        )
+
+        if not access_url:
+            async with self.create_async_http_session(no_auth=no_auth) as session:
+                if not drs_object:
+                    api_url = urljoin(metadata.drs_server_url, f'objects/{metadata.object_id}')
+                    try:
+                        object_info_response = await session.get(api_url)
+                    except HttpError as e:
+                        raise _to_object_api_error(e, api_url)
+                    drs_object = DrsObject(**object_info_response.json())
+
+                access_method = select_access_method(drs_object)
+
+                if access_method.access_url:
+                    access_url = access_method.access_url
+                else:
+                    object_access_response = await session.get(
+                        urljoin(metadata.drs_server_url,
+                                f'objects/{metadata.object_id}/access/{access_method.access_id}')
+                    )
+                    access_url = DrsObjectAccessUrl(**object_access_response.json())
+
+        return Blob(drs_url,
+                    self.create_http_session(no_auth=no_auth),
+                    drs_object=drs_object,
+                    access_url=access_url,
+                    resolution_cache=self.__resolution_cache,
+                    pool=self.get_transfer_pool(),
+                    blob_cache=self.__blob_cache)
+
+    def __get_drs_url(self, id_or_url: Optional[str], id: Optional[str], url: Optional[str]) -> str:
         assert id_or_url or id or url, 'Please at least specify either "id_or_url" (first argument), "id", or "url".'
 
         method_logger = get_logger(f'{self._logger.name}/get_blob')
-        method_logger.debug('Invoked with (id_or_url={id_or_url}, id={id}, url={url}, no_auth={no_auth})')
+        method_logger.debug('Invoked with (id_or_url={id_or_url}, id={id}, url={url})')
 
         if id_or_url:
             method_logger.debug('Using implicit argument')
             if id_or_url.startswith('drs://'):
                 method_logger.debug('Assume to be a DRS URL')
                 # It is assumed to be a DRS URL.
-                drs_url = id_or_url
+                return id_or_url
             else:
                 method_logger.debug('Assume to be a DRS ID')
                 # It is assumed to be a DRS ID.
                 parsed_base_url = urlparse(self.endpoint.url)
-                drs_url = f'drs://{parsed_base_url.netloc}/{id_or_url}'
+                return f'drs://{parsed_base_url.netloc}/{id_or_url}'
         elif id:
             method_logger.debug('Using explicit argument (id)')
             # This is an explicit option for directly using the given ID as DRS ID.
             parsed_base_url = urlparse(self.endpoint.url)
-            drs_url = f'drs://{parsed_base_url.netloc}/{id}'
+            return f'drs://{parsed_base_url.netloc}/{id}'
         else:
             method_logger.debug('Using explicit argument (url)')
             # This is an explicit option for directly using the given URL as DRS URL.
-            drs_url = url
+            return url
 
-        return Blob(drs_url, self.create_http_session(no_auth=no_auth))
+    def get_blobs(self,
+                  id_or_urls: Iterable[str],
+                  concurrency: int = 8,
+                  no_auth: bool = False) -> Dict[str, Blob]:
+        """
+        Get the blobs with their objects and access URLs resolved in one pass (see "resolve_many")
+
+        The blob of an object that cannot be resolved is still returned, and raises the error when it is used.
+        """
+        session = self.create_http_session(no_auth=no_auth)
+        return {
+            id_or_url: Blob(result.drs_url or self.__to_drs_url(id_or_url),
+                            session,
+                            drs_object=result.drs_object,
+                            access_url=result.access_url,
+                            resolution_cache=self.__resolution_cache,
+                            pool=self.get_transfer_pool(),
+                            blob_cache=self.__blob_cache)
+            for id_or_url, result in self.resolve_many(id_or_urls, concurrency=concurrency, no_auth=no_auth).items()
+        }
 
     def __download_file(
             self,
             drs_id_or_url: str,
             output_dir: str,
             exit_codes: Optional[dict] = None,
-            no_auth: bool = False
+            no_auth: bool = False,
+            part_size: int = DEFAULT_PART_SIZE,
+            part_concurrency: int = DEFAULT_PART_CONCURRENCY,
+            part_threshold: int = DEFAULT_PART_THRESHOLD,
+            resume: bool = False,
+            verify: bool = True,
+            bandwidth_limiter: Optional[BandwidthLimiter] = None,
+            skip_existing: bool = False
     ) -> None:
         # TODO #182443607 Move this method to dnastack.cli.drs
         try:
             with self.get_blob(drs_id_or_url, no_auth=no_auth) as output:
                 output_file_path = os.path.join(output_dir, output.name)
+
+                if skip_existing and self.__is_downloaded(output_file_path, output.drs_object, verify):
+                    self._logger.debug(f'{drs_id_or_url}: Skipped as {output_file_path} is already downloaded')
+                    self._events.dispatch('download-skipped',
+                                          DownloadSkippedEvent.make(drs_url=output.drs_url,
+                                                                    output_file_path=output_file_path,
+                                                                    byte_count=output.drs_object.size))
+                    self.exit_download(drs_id_or_url, DownloadStatus.SKIPPED, "Already Downloaded", exit_codes)
+                    return
+
+                blob_cache_key = get_blob_cache_key(output.drs_url, output.drs_object) if self.__blob_cache else None
+
+                if blob_cache_key and self.__blob_cache.link_to(blob_cache_key, output_file_path):
+                    self._logger.debug(f'{drs_id_or_url}: Loaded from the blob cache')
+                    self._events.dispatch('download-progress',
+                                          DownloadProgressEvent.make(drs_url=drs_id_or_url,
+                                                                     read_byte_count=output.drs_object.size,
+                                                                     total_byte_count=output.drs_object.size))
+                    self._events.dispatch('download-ok',
+                                          DownloadOkEvent.make(drs_url=output.drs_url,
+                                                               output_file_path=output_file_path))
+                    self.exit_download(drs_id_or_url, DownloadStatus.SUCCESS, "Loaded from Cache", exit_codes)
+                    return
+
                 output_connection = output._connection
                 output_headers = output_connection.headers
                 host_service = output_headers.get("Server") or 'Known'
@@ -447,17 +1213,120 @@ class DrsClient(BaseServiceClient):
                         f'(headers = {output_headers})'
                     )
 
-                with open(output_file_path, "wb+") as dest:
-                    stream_size = int(output._connection.headers["Content-Length"])
-                    read_byte_count = 0
-                    for chunk in output._connection.stream(1024):
-                        read_byte_count += len(chunk)
-                        dest.write(chunk)
-                        self._events.dispatch('download-progress',
-                                              DownloadProgressEvent.make(drs_url=drs_id_or_url,
-                                                                         read_byte_count=read_byte_count,
-                                                                         total_byte_count=stream_size)
-                                              )
+                stream_size = int(output_headers["Content-Length"])
+                accepts_ranges = 'bytes' in (output_headers.get('Accept-Ranges') or '').lower()
+
+                # NOTE: The content is written into the partial file, which is only renamed to the output file once
+                #       the download is complete. The journal records the completed ranges of the partial file.
+                partial_file_path = f'{output_file_path}.part'
+                journal = DownloadJournal(f'{partial_file_path}.json', output.drs_url, stream_size)
+
+                resumable = (
+                        resume
+                        and accepts_ranges
+                        and os.path.exists(partial_file_path)
+                        and journal.load()
+                )
+
+                checksum_calculator: Optional[ChecksumCalculator] = None
+                if verify:
+                    checksum_calculator = ChecksumCalculator.create(
+                        [(checksum.type, checksum.checksum) for checksum in output.drs_object.checksums],
+                        stream_size
+                    )
+                    if not checksum_calculator:
+                        self._logger.debug(f'{drs_id_or_url}: No verifiable checksum')
+
+                if resume and not resumable:
+                    self._logger.info(f'{drs_id_or_url}: Unable to resume the previous download. '
+                                      f'Restarted from the beginning.')
+
+                if resumable:
+                    # The connection for the whole content is no longer needed.
+                    output_connection.close()
+
+                    # NOTE: The partial file of a single-stream download is not preallocated.
+                    with open(partial_file_path, 'r+b') as dest:
+                        dest.truncate(stream_size)
+
+                    self._logger.debug(f'{drs_id_or_url}: Resumed with {journal.completed_byte_count} byte(s) '
+                                       f'already downloaded')
+                    read_byte_count = self.__download_ranges(output,
+                                                             drs_id_or_url,
+                                                             partial_file_path,
+                                                             stream_size,
+                                                             journal.get_missing_ranges(part_size),
+                                                             part_concurrency if stream_size >= part_threshold else 1,
+                                                             journal,
+                                                             checksum_calculator,
+                                                             bandwidth_limiter)
+                elif (
+                        part_concurrency > 1
+                        and stream_size > part_size
+                        and stream_size >= part_threshold
+                        and accepts_ranges
+                ):
+                    # The content will be downloaded in parts. The connection for the whole content is no longer needed.
+                    output_connection.close()
+                    journal.remove()
+
+                    # Preallocate the partial file so that the parts can be written in any order.
+                    with open(partial_file_path, 'wb') as dest:
+                        dest.truncate(stream_size)
+
+                    read_byte_count = self.__download_ranges(output,
+                                                             drs_id_or_url,
+                                                             partial_file_path,
+                                                             stream_size,
+                                                             journal.get_missing_ranges(part_size),
+                                                             part_concurrency,
+                                                             journal,
+                                                             checksum_calculator,
+                                                             bandwidth_limiter)
+                else:
+                    journal.remove()
+
+                    progress_reporter = DownloadProgressReporter(self._events, drs_id_or_url, stream_size)
+
+                    with open(partial_file_path, "wb+") as dest:
+                        read_byte_count = 0
+                        journaled_byte_count = 0
+                        for chunk in AdaptiveStreamReader(output_connection):
+                            read_byte_count += len(chunk)
+                            dest.write(chunk)
+                            if checksum_calculator:
+                                checksum_calculator.update(chunk)
+                            progress_reporter.add(len(chunk))
+                            if bandwidth_limiter:
+                                bandwidth_limiter.acquire(len(chunk))
+
+                            if read_byte_count - journaled_byte_count >= part_size:
+                                dest.flush()
+                                journal.add(0, read_byte_count - 1)
+                                journaled_byte_count = read_byte_count
+
+                    if read_byte_count != stream_size:
+                        raise InvalidFileStreamingResponse(
+                            f'Expected {stream_size} byte(s) but received {read_byte_count} byte(s).'
+                        )
+
+                if checksum_calculator:
+                    try:
+                        checksum_calculator.verify()
+                    except ChecksumMismatchError:
+                        # The corrupted content cannot be resumed.
+                        os.unlink(partial_file_path)
+                        journal.remove()
+                        raise
+
+                os.replace(partial_file_path, output_file_path)
+                journal.remove()
+
+                if blob_cache_key:
+                    self.__blob_cache.put_file(blob_cache_key,
+                                               output_file_path,
+                                               verified=checksum_calculator is not None)
+
                 self._events.dispatch('download-progress',
                                       DownloadProgressEvent.make(drs_url=drs_id_or_url,
                                                                  read_byte_count=read_byte_count,
@@ -468,6 +1337,18 @@ class DrsClient(BaseServiceClient):
                                                            output_file_path=output_file_path))
 
             self.exit_download(drs_id_or_url, DownloadStatus.SUCCESS, "Download Successful", exit_codes)
+        except ChecksumMismatchError as e:
+            self._logger.info(f'failed to download from {drs_id_or_url}: {type(e).__name__}: {e}')
+            self._events.dispatch('download-failure',
+                                  DownloadFailureEvent.make(drs_url=drs_id_or_url,
+                                                            reason='checksum-mismatch',
+                                                            error=e))
+            self.exit_download(
+                drs_id_or_url,
+                DownloadStatus.FAIL,
+                f"{type(e).__name__}: {e}",
+                exit_codes,
+            )
         except InvalidDrsUrlError as e:
             self._logger.info(f'failed to download from {drs_id_or_url}: {type(e).__name__}: {e}')
             self._events.dispatch('download-progress',
@@ -520,41 +1401,251 @@ class DrsClient(BaseServiceClient):
                 exit_codes,
             )
 
+    @staticmethod
+    def __is_downloaded(file_path: str, drs_object: DrsObject, verify: bool) -> bool:
+        """
+        Check if the file has the same size as the object and, when the object has a verifiable checksum and the
+        verification is enabled, the same checksum
+        """
+        if not os.path.isfile(file_path) or os.path.getsize(file_path) != drs_object.size:
+            return False
+
+        if not verify:
+            return True
+
+        checksum_calculator = ChecksumCalculator.create(
+            [(checksum.type, checksum.checksum) for checksum in drs_object.checksums],
+            drs_object.size
+        )
+        if not checksum_calculator:
+            return True
+
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(MAX_READ_SIZE), b''):
+                checksum_calculator.update(block)
+
+        try:
+            checksum_calculator.verify()
+            return True
+        except ChecksumMismatchError:
+            return False
+
+    def __download_ranges(self,
+                          blob: Blob,
+                          drs_url: str,
+                          file_path: str,
+                          total_size: int,
+                          ranges: List[Tuple[int, int]],
+                          concurrency: int,
+                          journal: DownloadJournal,
+                          checksum_calculator: Optional[ChecksumCalculator] = None,
+                          bandwidth_limiter: Optional[BandwidthLimiter] = None) -> int:
+        """
+        Download the given byte ranges (inclusive) concurrently into the preallocated file
+
+        Each range is written in place at its offset and recorded in the journal once it is complete. If any range
+        fails, the remaining ranges are cancelled.
+
+        The content is fed into the checksum calculator in order, from the beginning of the file. The ranges completed
+        ahead of the content being fed are read back from the file when they are reached.
+
+        :return: the number of bytes in the file downloaded so far, including the ones downloaded previously
+        """
+        self._logger.debug(f'{drs_url}: Downloading {sum([end - start + 1 for start, end in ranges])} of {total_size} '
+                           f'bytes in {len(ranges)} part(s) with {concurrency} connection(s)')
+
+        cancelled = threading.Event()
+        progress_reporter = DownloadProgressReporter(self._events, drs_url, total_size, journal.completed_byte_count)
+
+        checksum_feeder = OrderedChecksumFeeder(checksum_calculator, file_path) if checksum_calculator else None
+        if checksum_feeder:
+            # Feed the content downloaded previously.
+            checksum_feeder.catch_up(journal.completed_ranges)
+
+        def download_part(start: int, end: int):
+            if cancelled.is_set():
+                return
+
+            # NOTE: The access URL is resolved again if the cached one is about to expire during a long download.
+            access_url = blob.get_access_url_object()
+            headers = dict(access_url.headers or dict())
+            headers['Range'] = f'bytes={start}-{end}'
+
+            response = pool.request('GET', access_url.url, headers=headers, preload_content=False)
+            completed = False
+
+            try:
+                if response.status != 206:
+                    raise InvalidFileStreamingResponse(
+                        f'The server responded with HTTP {response.status} to the range request (bytes={start}-{end}).'
+                    )
+
+                written_byte_count = 0
+                with open(file_path, 'r+b') as dest:
+                    dest.seek(start)
+                    for chunk in AdaptiveStreamReader(response):
+                        if cancelled.is_set():
+                            return
+                        dest.write(chunk)
+                        if checksum_feeder:
+                            checksum_feeder.update(start + written_byte_count, chunk)
+                        written_byte_count += len(chunk)
+                        progress_reporter.add(len(chunk))
+                        if bandwidth_limiter:
+                            bandwidth_limiter.acquire(len(chunk))
+
+                expected_byte_count = end - start + 1
+                if written_byte_count != expected_byte_count:
+                    raise InvalidFileStreamingResponse(
+                        f'Expected {expected_byte_count} byte(s) in the range (bytes={start}-{end}) '
+                        f'but received {written_byte_count} byte(s).'
+                    )
+
+                journal.add(start, end)
+                if checksum_feeder:
+                    checksum_feeder.catch_up(journal.completed_ranges)
+                completed = True
+            finally:
+                if completed:
+                    response.release_conn()
+                else:
+                    # NOTE: The unread content makes the connection unusable for the next request.
+                    response.close()
+
+        pool = blob._pool
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(download_part, start, end) for start, end in ranges]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                cancelled.set()
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return progress_reporter.read_byte_count
+
     def _download_files(
             self,
             id_or_urls: List[str],
             output_dir: str = os.getcwd(),
-            no_auth: bool = False
+            no_auth: bool = False,
+            part_size: Optional[int] = None,
+            part_concurrency: Optional[int] = None,
+            part_threshold: Optional[int] = None,
+            resume: bool = False,
+            verify: bool = True,
+            parallel: Optional[int] = None,
+            limit_rate: Optional[int] = None,
+            skip_existing: bool = False
     ) -> None:
+        """
+        Download the objects into the output directory
+
+        The objects are downloaded concurrently, largest first, according to the sizes in their DRS metadata. A quarter
+        of the workers only download the objects smaller than the part threshold so that the small objects are not
+        starved behind the large ones.
+
+        An object larger than or equal to the part threshold is downloaded in parts of the given size over multiple
+        connections, as long as the server of its access URL accepts range requests. Otherwise, it is downloaded over
+        a single connection.
+
+        An object is downloaded into a partial file ("<name>.part"), alongside the journal of the completed byte ranges
+        ("<name>.part.json"). The partial file is renamed to the actual name once the download is complete.
+
+        :param part_size: The size of each part in bytes
+        :param part_concurrency: The maximum number of parts of an object downloaded concurrently.
+                                 Set to 1 to always download the object over a single connection.
+        :param part_threshold: The minimum size of the object, in bytes, to download in parts
+        :param resume: Continue the interrupted downloads from their partial files, provided that the servers accept
+                       range requests. Otherwise, the downloads start from the beginning.
+        :param verify: Verify the downloaded content against the checksum provided by the DRS server, i.e., sha-256,
+                       md5, crc32c, or etag. The content is hashed as it is written.
+        :param parallel: The maximum number of objects downloaded concurrently. By default, it is the number of CPUs.
+        :param limit_rate: The maximum total download speed in bytes per second. By default, it is unlimited.
+        :param skip_existing: Skip the objects already in the output directory, i.e., the files with the same size and,
+                              unless the verification is disabled, the same checksum as the objects. The skipped
+                              objects are reported with the "download-skipped" events.
+        """
         # TODO #182443607 Move this method to dnastack.cli.drs
+        part_size = part_size or env('DNASTACK_DRS_PART_SIZE',
+                                     default=DEFAULT_PART_SIZE,
+                                     transform=int,
+                                     description='The size (in bytes) of each part of a DRS object downloaded in parts')
+        part_concurrency = part_concurrency or env('DNASTACK_DRS_PART_CONCURRENCY',
+                                                   default=DEFAULT_PART_CONCURRENCY,
+                                                   transform=int,
+                                                   description='The maximum number of parts of a DRS object '
+                                                               'downloaded concurrently')
+        part_threshold = part_threshold or env('DNASTACK_DRS_PART_THRESHOLD',
+                                               default=DEFAULT_PART_THRESHOLD,
+                                               transform=int,
+                                               description='The minimum size (in bytes) of a DRS object '
+                                                           'downloaded in parts')
+
         exit_codes = {status: {} for status in DownloadStatus}
-        unique_urls = set(id_or_urls)
+        unique_urls = list(dict.fromkeys(id_or_urls))
 
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        # Define the maximum number of workers, limited to the number of CPUs.
-        max_worker_count = os.cpu_count()
-        if max_worker_count < 2:
-            max_worker_count = 2
-
-        future_to_url_map: Dict[Future, str] = dict()
-
-        with ThreadPoolExecutor(max_workers=max_worker_count) as pool:
-            for url in unique_urls:
-                future = pool.submit(
-                    self.__download_file,
-                    drs_id_or_url=url,
-                    output_dir=output_dir,
-                    exit_codes=exit_codes,
-                    no_auth=no_auth
-                )
-                future_to_url_map[future] = url
+        # Define the maximum number of workers, limited to the number of CPUs by default.
+        max_worker_count = parallel or max(os.cpu_count() or 1, 2)
+        worker_count = max(min(max_worker_count, len(unique_urls)), 1)
+
+        # Every object may be downloaded over as many connections as its parts downloaded concurrently.
+        self.get_transfer_pool(worker_count * part_concurrency)
+
+        bandwidth_limiter = BandwidthLimiter(limit_rate) if limit_rate else None
+
+        sizes: Dict[str, int] = dict()
+        if len(unique_urls) > 1:
+            # NOTE: The resolved objects and access URLs are cached for the downloads.
+            try:
+                for id_or_url, result in self.resolve_many(unique_urls,
+                                                           concurrency=worker_count,
+                                                           no_auth=no_auth).items():
+                    if result.drs_object:
+                        sizes[id_or_url] = result.drs_object.size
+            except Exception as e:
+                self._logger.warning(f'Unable to get the sizes of the objects ({type(e).__name__}: {e}). '
+                                     f'The objects are downloaded in the given order.')
+
+        scheduler = DownloadScheduler([(url, sizes.get(url) or 0) for url in unique_urls], part_threshold)
+
+        def work(small_only: bool):
+            while True:
+                url = scheduler.next(small_only)
+                if url is None:
+                    return
+                self.__download_file(drs_id_or_url=url,
+                                     output_dir=output_dir,
+                                     exit_codes=exit_codes,
+                                     no_auth=no_auth,
+                                     part_size=part_size,
+                                     part_concurrency=part_concurrency,
+                                     part_threshold=part_threshold,
+                                     resume=resume,
+                                     verify=verify,
+                                     bandwidth_limiter=bandwidth_limiter,
+                                     skip_existing=skip_existing)
+
+        reserved_worker_count = scheduler.get_reserved_worker_count(worker_count)
+
+        with ThreadPoolExecutor(max_workers=worker_count) as pool:
+            futures = [pool.submit(work, i < reserved_worker_count) for i in range(worker_count)]
 
         # Wait for all tasks to complete
-        for future in as_completed(future_to_url_map.keys()):
+        for future in as_completed(futures):
             future.result()
 
+        skipped_downloads = exit_codes.get(DownloadStatus.SKIPPED)
+        if skipped_downloads:
+            self._logger.info(f'{len(skipped_downloads)} out of {len(unique_urls)} download(s) skipped '
+                              f'as already downloaded')
+
         # at least one download failed, create exceptions
         failed_downloads = [
             DRSException(msg=msg, url=url)
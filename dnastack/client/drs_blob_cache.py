@@ -0,0 +1,373 @@
+"""
+Local content-addressed cache of DRS blobs
+
+A blob is stored under the key derived from the checksum of its DRS object (SHA-256 or MD5) and its size so that the
+same content is only stored once, regardless of the DRS server or the directory it is downloaded into. Without such
+a checksum, the blob is stored under the key derived from its DRS URL and the version of its object.
+
+The downloaded files are reflinked (copy-on-write) into the cache when the file system supports it, otherwise copied, so
+that modifying them does not affect the cache. The cached blobs are read-only, and are linked into their destinations,
+i.e., reflinked when the file system supports it, otherwise hard-linked, otherwise copied. The modification time and
+the inode of every blob are recorded when the blob is stored. If they change, e.g., when a hard-linked destination is
+made writable and modified in place, the blob is verified again against the checksum in its key, or removed if the key
+is not derived from the content.
+
+The least recently used blobs, according to their last access time, are evicted when the total size of the cache
+exceeds the limit.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+from time import time, time_ns
+from typing import List, Optional, Tuple
+
+from imagination.decorator import service
+
+from dnastack.client.drs_checksum import ChecksumCalculator, ChecksumMismatchError, normalize_checksum_type
+from dnastack.common.environments import env
+from dnastack.common.logger import get_logger
+from dnastack.constants import LOCAL_STORAGE_DIRECTORY
+
+# The checksum types used as the content addresses, in the order of preference
+CONTENT_ADDRESS_CHECKSUM_TYPES = ('sha256', 'md5')
+
+_FICLONE = 0x40049409  # The ioctl request to reflink a file on Linux
+_READ_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def _to_hex_digest(checksum: str) -> Optional[str]:
+    """ Convert the checksum, either in hex or base64, to the hex digest """
+    checksum = checksum.strip().strip('"')
+
+    if re.match(r'^[0-9a-fA-F]+$', checksum) and len(checksum) % 2 == 0:
+        return checksum.lower()
+
+    try:
+        return base64.b64decode(checksum, validate=True).hex() or None
+    except (binascii.Error, ValueError):
+        return None
+
+
+def _reflink(source_path: str, destination_path: str):
+    # NOTE: fcntl is not available on Windows, and the ioctl fails if the file system does not support reflinks.
+    import fcntl
+
+    with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+        fcntl.ioctl(destination.fileno(), _FICLONE, source.fileno())
+
+
+def link_file(source_path: str, destination_path: str, allow_hard_link: bool = True) -> str:
+    """
+    Reflink, hard-link, or copy the source file to the destination, in the order of preference
+
+    The destination is replaced atomically if it already exists.
+
+    :param allow_hard_link: Whether the destination may be hard-linked, i.e., share the content with the source
+
+    :return: the method used, i.e., "reflink", "hardlink", or "copy"
+    """
+    temp_file_path = f'{destination_path}.{os.getpid()}.{time()}.swap'
+
+    try:
+        try:
+            _reflink(source_path, temp_file_path)
+            method = 'reflink'
+        except (ImportError, OSError):
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+
+            try:
+                if not allow_hard_link:
+                    raise OSError('Hard link not allowed')
+
+                os.link(source_path, temp_file_path)
+                method = 'hardlink'
+            except OSError:
+                shutil.copyfile(source_path, temp_file_path)
+                method = 'copy'
+
+        os.replace(temp_file_path, destination_path)
+    finally:
+        if os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
+
+    return method
+
+
+@service.registered()
+class BlobCache:
+    """
+    Storage of the cached blobs
+
+    :param dir_path: The cache directory. By default, it is "blob-cache" under the local storage directory.
+    :param max_size: The maximum total size of the cache in bytes.
+    """
+
+    _BLOB_FILE_EXTENSION = '.blob'
+    _STAT_FILE_EXTENSION = '.stat'
+
+    def __init__(self, dir_path: Optional[str] = None, max_size: Optional[int] = None):
+        self.__logger = get_logger(type(self).__name__)
+        self.__dir_path = dir_path or env('DNASTACK_BLOB_CACHE_DIR',
+                                          default=os.path.join(LOCAL_STORAGE_DIRECTORY, 'blob-cache'),
+                                          description='The directory of the cached DRS blobs')
+        self.__max_size = max_size or env('DNASTACK_BLOB_CACHE_MAX_SIZE',
+                                          default=10 * 1024 * 1024 * 1024,
+                                          transform=int,
+                                          description='The maximum total size (in bytes) of the cached DRS blobs')
+
+    @property
+    def dir_path(self) -> str:
+        return self.__dir_path
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @staticmethod
+    def make_key(drs_url: str, version: str, size: int, checksums: List[Tuple[str, str]]) -> str:
+        """
+        Make the key of the blob, i.e., "<checksum type>-<hex digest>-<size>" if the object has a SHA-256 or MD5
+        checksum, otherwise "drs-<hash of the DRS URL and the version>-<size>"
+        """
+        available_checksums = {
+            normalize_checksum_type(checksum_type): checksum
+            for checksum_type, checksum in checksums
+            if checksum_type and checksum
+        }
+
+        for checksum_type in CONTENT_ADDRESS_CHECKSUM_TYPES:
+            hex_digest = _to_hex_digest(available_checksums.get(checksum_type) or '')
+            if hex_digest:
+                return f'{checksum_type}-{hex_digest}-{size}'
+
+        return f'drs-{hashlib.sha256(json.dumps([drs_url, version]).encode("utf-8")).hexdigest()}-{size}'
+
+    def get(self, key: str) -> Optional[str]:
+        """ Get the path to the cached blob if it exists and is intact. The blob is marked as recently used. """
+        blob_file_path = self.__get_blob_file_path(key)
+
+        try:
+            blob_file_stat = os.stat(blob_file_path)
+
+            if blob_file_stat.st_size != self.__get_size(key) \
+                    or (self.__read_stat(key) != self.__make_stat(blob_file_stat) and not self.__reverify(key)):
+                self.__logger.warning(f'{blob_file_path}: Removed the blob modified outside of the cache')
+                self.remove(key)
+                return None
+
+            # NOTE: The access time of the blob file is used for the LRU eviction. The modification time is kept as it
+            #       is used to detect the changes made outside the cache.
+            os.utime(blob_file_path, ns=(time_ns(), os.stat(blob_file_path).st_mtime_ns))
+        except FileNotFoundError:
+            return None
+
+        return blob_file_path
+
+    def read(self, key: str) -> Optional[bytes]:
+        """ Read the cached blob """
+        blob_file_path = self.get(key)
+
+        if not blob_file_path:
+            return None
+
+        with open(blob_file_path, 'rb') as f:
+            return f.read()
+
+    def link_to(self, key: str, destination_path: str) -> bool:
+        """ Link the cached blob to the destination (see "link_file")
+
+            :return: True if the blob is cached, otherwise False
+        """
+        blob_file_path = self.get(key)
+
+        if not blob_file_path:
+            return False
+
+        try:
+            method = link_file(blob_file_path, destination_path)
+        except OSError as e:
+            self.__logger.warning(f'{key}: Unable to use the cached blob ({type(e).__name__}: {e})')
+            return False
+
+        self.__logger.debug(f'{key}: Linked to {destination_path} ({method})')
+        return True
+
+    def put_file(self, key: str, file_path: str, verified: bool = False) -> bool:
+        """
+        Store the content of the file
+
+        :param key: The key of the blob
+        :param file_path: The path to the file, which is reflinked or copied into the cache (see "link_file")
+        :param verified: Whether the content has been verified against the checksums of the object. If not, the content
+                         is verified against the checksum in the key, if any, before it is stored.
+        :return: True if the content is stored, otherwise False
+        """
+        try:
+            if os.path.getsize(file_path) != self.__get_size(key):
+                return False
+
+            if not verified and not self.__verify(key, file_path):
+                return False
+
+            os.makedirs(self.__dir_path, exist_ok=True)
+            blob_file_path = self.__get_blob_file_path(key)
+            self.__remove(blob_file_path)
+            method = link_file(file_path, blob_file_path, allow_hard_link=False)
+            self.__seal(key)
+        except OSError as e:
+            self.__logger.warning(f'{key}: Unable to cache the blob ({type(e).__name__}: {e})')
+            return False
+
+        self.__logger.debug(f'{key}: Cached ({method})')
+        self.prune()
+
+        return True
+
+    def put_data(self, key: str, data: bytes, verified: bool = False) -> bool:
+        """ Store the content (see "put_file") """
+        try:
+            os.makedirs(self.__dir_path, exist_ok=True)
+            temp_file_path = f'{self.__get_blob_file_path(key)}.{os.getpid()}.{time()}.swap'
+            with open(temp_file_path, 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            self.__logger.warning(f'{key}: Unable to cache the blob ({type(e).__name__}: {e})')
+            return False
+
+        try:
+            return self.put_file(key, temp_file_path, verified)
+        finally:
+            os.unlink(temp_file_path)
+
+    def size(self) -> int:
+        """ The total size of the cache in bytes """
+        return sum([entry.stat().st_size for entry in self.__list_entries()])
+
+    def prune(self) -> List[str]:
+        """
+        Remove the least recently used blobs until the cache fits in the size limit
+
+        :return: the keys of the removed blobs
+        """
+        entries = sorted(self.__list_entries(), key=lambda e: e.stat().st_atime)
+        total_size = sum([entry.stat().st_size for entry in entries])
+        removed_keys: List[str] = []
+
+        for entry in entries:
+            if total_size <= self.__max_size:
+                break
+
+            key = entry.name[:-len(self._BLOB_FILE_EXTENSION)]
+            self.remove(key)
+            removed_keys.append(key)
+            total_size -= entry.stat().st_size
+
+        return removed_keys
+
+    def remove(self, key: str):
+        self.__remove(self.__get_blob_file_path(key))
+        self.__remove(self.__get_stat_file_path(key))
+
+    def clear(self) -> int:
+        """ Remove all blobs
+
+            :return: the number of removed blobs
+        """
+        entries = self.__list_entries()
+        for entry in entries:
+            self.remove(entry.name[:-len(self._BLOB_FILE_EXTENSION)])
+        return len(entries)
+
+    def __list_entries(self) -> List[os.DirEntry]:
+        if not os.path.isdir(self.__dir_path):
+            return []
+
+        return [
+            entry
+            for entry in os.scandir(self.__dir_path)
+            if entry.name.endswith(self._BLOB_FILE_EXTENSION) and entry.is_file()
+        ]
+
+    def __get_blob_file_path(self, key: str) -> str:
+        return os.path.join(self.__dir_path, f'{key}{self._BLOB_FILE_EXTENSION}')
+
+    def __get_stat_file_path(self, key: str) -> str:
+        return os.path.join(self.__dir_path, f'{key}{self._STAT_FILE_EXTENSION}')
+
+    @staticmethod
+    def __make_stat(file_stat: os.stat_result) -> dict:
+        return dict(mtime_ns=file_stat.st_mtime_ns, inode=file_stat.st_ino)
+
+    def __read_stat(self, key: str) -> Optional[dict]:
+        try:
+            with open(self.__get_stat_file_path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def __seal(self, key: str):
+        """ Make the blob read-only, and record its modification time and inode """
+        blob_file_path = self.__get_blob_file_path(key)
+        os.chmod(blob_file_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+        # NOTE: The access time is set explicitly as the blob is now the most recently used one.
+        blob_file_stat = os.stat(blob_file_path)
+        os.utime(blob_file_path, ns=(time_ns(), blob_file_stat.st_mtime_ns))
+
+        stat_file_path = self.__get_stat_file_path(key)
+        temp_file_path = f'{stat_file_path}.{os.getpid()}.{time()}.swap'
+        with open(temp_file_path, 'w') as f:
+            json.dump(self.__make_stat(blob_file_stat), f)
+        os.replace(temp_file_path, stat_file_path)
+
+    def __reverify(self, key: str) -> bool:
+        """ Verify the blob which may have been modified outside the cache """
+        if key.split('-')[0] not in CONTENT_ADDRESS_CHECKSUM_TYPES:
+            # NOTE: The key is not derived from the content, so the blob cannot be verified.
+            return False
+
+        if not self.__verify(key, self.__get_blob_file_path(key)):
+            return False
+
+        self.__seal(key)
+        return True
+
+    @staticmethod
+    def __remove(file_path: str):
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            # NOTE: On Windows, the read-only files cannot be removed.
+            os.chmod(file_path, stat.S_IWRITE)
+            os.unlink(file_path)
+
+    @staticmethod
+    def __get_size(key: str) -> int:
+        return int(key.rsplit('-', 1)[-1])
+
+    def __verify(self, key: str, file_path: str) -> bool:
+        checksum_type, hex_digest, size = key.split('-')
+
+        if checksum_type not in CONTENT_ADDRESS_CHECKSUM_TYPES:
+            # NOTE: The key is not derived from the content.
+            return True
+
+        checksum_calculator = ChecksumCalculator(checksum_type, hex_digest, int(size))
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(_READ_BLOCK_SIZE), b''):
+                checksum_calculator.update(block)
+
+        try:
+            checksum_calculator.verify()
+            return True
+        except ChecksumMismatchError:
+            self.__logger.warning(f'{key}: The content does not match the checksum, and is not cached.')
+            return False
@@ -0,0 +1,222 @@
+"""
+In-memory cache of DRS objects and their access URLs
+
+The DRS objects rarely change, so they are kept for a long time. The access URLs are usually signed and only valid for
+a limited time, so they are evicted before the expiry advertised in the URL, e.g., by "X-Amz-Expires" (Amazon S3),
+"X-Goog-Expires" (Google Cloud Storage), "Expires", or "se" (Azure Blob Storage).
+
+Concurrent callers asking for the same entry share one request.
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from time import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_OBJECT_TTL = 3600  # Seconds
+DEFAULT_ACCESS_URL_TTL = 300  # Seconds, used when the access URL does not advertise its expiry
+DEFAULT_MAX_ENTRY_COUNT = 10000
+
+# The access URLs are evicted at least this many seconds (or 10% of their lifetime) before they expire.
+ACCESS_URL_EXPIRY_MARGIN = 60
+
+
+def get_signed_url_expiry(url: str) -> Optional[float]:
+    """ Get the expiry (epoch timestamp) advertised in the query string of a signed URL, or None if there is none """
+    parameters = {
+        name.lower(): values[0]
+        for name, values in parse_qs(urlparse(url).query).items()
+        if values
+    }
+
+    try:
+        for date_name, expires_name in [('x-amz-date', 'x-amz-expires'), ('x-goog-date', 'x-goog-expires')]:
+            if date_name in parameters and expires_name in parameters:
+                signed_at = datetime.strptime(parameters[date_name], '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+                return signed_at.timestamp() + int(parameters[expires_name])
+
+        if 'expires' in parameters:
+            return float(parameters['expires'])
+
+        if 'se' in parameters:
+            expires_at = parameters['se'].replace('Z', '+00:00')
+            if 'T' not in expires_at:
+                expires_at = f'{expires_at}T00:00:00+00:00'
+            return datetime.fromisoformat(expires_at).timestamp()
+    except ValueError:
+        # The parameter is in an unexpected format.
+        return None
+
+    return None
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ExpiringCache:
+    """
+    Thread-safe LRU cache with the expiry of each entry
+
+    :param max_entry_count: The maximum number of entries. The least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entry_count: int = DEFAULT_MAX_ENTRY_COUNT):
+        self.__max_entry_count = max_entry_count
+        self.__entries: Dict[Hashable, Tuple[Any, float]] = OrderedDict()
+        self.__in_flight_calls: Dict[Hashable, _InFlightCall] = dict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """ Get the value if it exists and has not expired yet """
+        with self.__lock:
+            return self.__get(key, time())
+
+    def put(self, key: Hashable, value: Any, expires_at: float):
+        with self.__lock:
+            self.__put(key, value, expires_at)
+
+    def get_or_load(self,
+                    key: Hashable,
+                    load: Callable[[], Any],
+                    get_expiry: Callable[[Any], float]) -> Any:
+        """
+        Get the value, or load it if it is not available
+
+        If the value of the same key is being loaded by another thread, this waits for and shares its result.
+
+        :param key: The key
+        :param load: The function loading the value
+        :param get_expiry: The function returning the expiry (epoch timestamp) of the loaded value
+        """
+        with self.__lock:
+            value = self.__get(key, time())
+            if value is not None:
+                return value
+
+            call = self.__in_flight_calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self.__in_flight_calls[key] = _InFlightCall()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = load()
+            with self.__lock:
+                self.__put(key, call.value, get_expiry(call.value))
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__in_flight_calls[key]
+            call.done.set()
+
+    def invalidate(self, key: Hashable):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def __get(self, key: Hashable, now: float) -> Optional[Any]:
+        entry = self.__entries.get(key)
+
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if now >= expires_at:
+            del self.__entries[key]
+            return None
+
+        self.__entries.move_to_end(key)
+        return value
+
+    def __put(self, key: Hashable, value: Any, expires_at: float):
+        if expires_at <= time():
+            # NOTE: The value is already expired or about to expire.
+            self.__entries.pop(key, None)
+            return
+
+        self.__entries[key] = (value, expires_at)
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__max_entry_count:
+            self.__entries.popitem(last=False)
+
+
+class DrsResolutionCache:
+    """
+    Cache of the DRS objects and their access URLs
+
+    The objects are keyed by their DRS URLs. The access URLs are keyed by the DRS URLs and the versions of the objects
+    so that the access URL of an outdated version is never used once the object is refreshed.
+
+    :param object_ttl: The number of seconds to keep the objects
+    :param access_url_ttl: The number of seconds to keep the access URLs not advertising their expiry. The other access
+                           URLs are kept until shortly before they expire.
+    :param max_entry_count: The maximum number of objects (and access URLs)
+    """
+
+    def __init__(self,
+                 object_ttl: float = DEFAULT_OBJECT_TTL,
+                 access_url_ttl: float = DEFAULT_ACCESS_URL_TTL,
+                 max_entry_count: int = DEFAULT_MAX_ENTRY_COUNT):
+        self.__object_ttl = object_ttl
+        self.__access_url_ttl = access_url_ttl
+        self.__objects = ExpiringCache(max_entry_count)
+        self.__access_urls = ExpiringCache(max_entry_count)
+
+    def get_object(self, drs_url: str, load: Optional[Callable[[], Any]] = None) -> Optional[Any]:
+        """ Get the object, or load it if the loader is given """
+        if load is None:
+            return self.__objects.get(drs_url)
+        return self.__objects.get_or_load(drs_url, load, lambda _: time() + self.__object_ttl)
+
+    def put_object(self, drs_url: str, drs_object: Any):
+        self.__objects.put(drs_url, drs_object, time() + self.__object_ttl)
+
+    def get_access_url(self, drs_url: str, version: str, load: Optional[Callable[[], Any]] = None) -> Optional[Any]:
+        """ Get the access URL of the given version of the object, or load it if the loader is given """
+        if load is None:
+            return self.__access_urls.get((drs_url, version))
+        return self.__access_urls.get_or_load((drs_url, version), load, self.__get_access_url_expiry)
+
+    def put_access_url(self, drs_url: str, version: str, access_url: Any):
+        self.__access_urls.put((drs_url, version), access_url, self.__get_access_url_expiry(access_url))
+
+    def invalidate(self, drs_url: str, version: Optional[str] = None):
+        """ Remove the object, or only the access URL of the given version """
+        if version is None:
+            self.__objects.invalidate(drs_url)
+        else:
+            self.__access_urls.invalidate((drs_url, version))
+
+    def clear(self):
+        self.__objects.clear()
+        self.__access_urls.clear()
+
+    def __get_access_url_expiry(self, access_url: Any) -> float:
+        now = time()
+        advertised_expiry = get_signed_url_expiry(access_url.url)
+
+        if advertised_expiry is None:
+            return now + self.__access_url_ttl
+
+        return advertised_expiry - min(ACCESS_URL_EXPIRY_MARGIN, max(advertised_expiry - now, 0) * 0.1)
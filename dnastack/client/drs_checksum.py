@@ -0,0 +1,244 @@
+"""
+Streaming verification of the checksums of DRS objects
+
+The content is hashed while it is being written so that the verification does not require another pass over the
+downloaded file. Only one checksum of an object is verified, picked by the order of CHECKSUM_TYPES.
+
+CRC32C requires either google-crc32c or crc32c, which is only imported when it is required.
+"""
+import base64
+import hashlib
+import threading
+from math import ceil
+from typing import Callable, List, Optional, Tuple
+
+from dnastack.common.exceptions import DependencyError
+
+# The supported checksum types (normalized), in the order of preference
+CHECKSUM_TYPES = ('sha256', 'md5', 'crc32c', 'etag')
+
+_ETAG_PART_SIZE_UNIT = 1024 * 1024
+_READ_BACK_BLOCK_SIZE = 1024 * 1024
+
+
+class ChecksumMismatchError(RuntimeError):
+    """ Raised when the checksum of the downloaded content does not match the one provided by the DRS server """
+
+    def __init__(self, checksum_type: str, expected: str, actual: str):
+        super().__init__(f'The {checksum_type} checksum of the downloaded content ({actual}) does not match '
+                         f'the expected one ({expected}).')
+        self.checksum_type = checksum_type
+        self.expected = expected
+        self.actual = actual
+
+
+def normalize_checksum_type(checksum_type: str) -> str:
+    """ Normalize the checksum type, e.g., "SHA-256" to "sha256" """
+    return checksum_type.lower().replace('-', '').replace('_', '')
+
+
+def _import_crc32c_extend() -> Callable[[int, bytes], int]:
+    try:
+        # We delay the import as late as possible so that the optional dependency
+        # does not block the other functionalities of the library.
+        import google_crc32c
+        return google_crc32c.extend
+    except ImportError:
+        pass
+
+    try:
+        import crc32c
+        return lambda value, data: crc32c.crc32c(data, value)
+    except ImportError:
+        raise DependencyError('google-crc32c')
+
+
+class _Crc32c:
+    def __init__(self):
+        self.__extend = _import_crc32c_extend()
+        self.__value = 0
+
+    def update(self, data: bytes):
+        self.__value = self.__extend(self.__value, data)
+
+    def digest(self) -> bytes:
+        return self.__value.to_bytes(4, 'big')
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+class _MultipartEtag:
+    """
+    ETag of an object uploaded in parts, i.e., the MD5 hash of the concatenated MD5 digests of the parts followed by
+    the number of parts, like "<hash>-<count>"
+    """
+
+    def __init__(self, part_size: int):
+        self.__part_size = part_size
+        self.__part_digests: List[bytes] = []
+        self.__current_part = hashlib.md5()
+        self.__current_part_size = 0
+
+    def update(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            size = min(len(view), self.__part_size - self.__current_part_size)
+            self.__current_part.update(view[:size])
+            self.__current_part_size += size
+            view = view[size:]
+
+            if self.__current_part_size == self.__part_size:
+                self.__complete_part()
+
+    def hexdigest(self) -> str:
+        part_digests = self.__part_digests + ([self.__current_part.digest()] if self.__current_part_size else [])
+        return f'{hashlib.md5(b"".join(part_digests)).hexdigest()}-{len(part_digests)}'
+
+    def __complete_part(self):
+        self.__part_digests.append(self.__current_part.digest())
+        self.__current_part = hashlib.md5()
+        self.__current_part_size = 0
+
+
+class ChecksumCalculator:
+    """
+    Calculator of the checksum of a stream
+
+    :param checksum_type: The normalized checksum type
+    :param expected: The expected checksum
+    :param total_size: The size of the content in bytes
+    """
+
+    def __init__(self, checksum_type: str, expected: str, total_size: int):
+        self.__checksum_type = checksum_type
+        self.__expected = expected.strip().strip('"')
+
+        if checksum_type == 'sha256':
+            self.__hash = hashlib.sha256()
+        elif checksum_type == 'md5':
+            self.__hash = hashlib.md5()
+        elif checksum_type == 'crc32c':
+            self.__hash = _Crc32c()
+        elif checksum_type == 'etag':
+            if '-' in self.__expected:
+                part_size = self.guess_etag_part_size(total_size, int(self.__expected.split('-')[-1]))
+                if part_size is None:
+                    raise ValueError(f'Unable to determine the part size of the ETag ({self.__expected}).')
+                self.__hash = _MultipartEtag(part_size)
+            else:
+                self.__hash = hashlib.md5()
+        else:
+            raise ValueError(f'The checksum type ({checksum_type}) is not supported.')
+
+    @property
+    def checksum_type(self) -> str:
+        return self.__checksum_type
+
+    @property
+    def expected(self) -> str:
+        return self.__expected
+
+    @classmethod
+    def create(cls, checksums: List[Tuple[str, str]], total_size: int) -> Optional['ChecksumCalculator']:
+        """
+        Create the calculator of the most preferred checksum that can be verified
+
+        :param checksums: The pairs of the checksum type and the expected checksum
+        :param total_size: The size of the content in bytes
+        :return: the calculator, or None if none of the checksums can be verified
+        """
+        available_checksums = {
+            normalize_checksum_type(checksum_type): checksum
+            for checksum_type, checksum in checksums
+            if checksum_type and checksum
+        }
+
+        for checksum_type in CHECKSUM_TYPES:
+            if checksum_type not in available_checksums:
+                continue
+
+            try:
+                return cls(checksum_type, available_checksums[checksum_type], total_size)
+            except (DependencyError, ValueError):
+                continue
+
+        return None
+
+    @staticmethod
+    def guess_etag_part_size(total_size: int, part_count: int) -> Optional[int]:
+        """ Guess the part size of a multipart upload, assuming that it is a whole number of MiB """
+        if part_count < 1:
+            return None
+
+        part_size = max(ceil(total_size / part_count / _ETAG_PART_SIZE_UNIT), 1) * _ETAG_PART_SIZE_UNIT
+
+        return part_size if ceil(total_size / part_size) == part_count else None
+
+    def update(self, data: bytes):
+        self.__hash.update(data)
+
+    def get_actual(self) -> str:
+        return self.__hash.hexdigest()
+
+    def verify(self):
+        """ Verify the checksum of the content so far
+
+            :raises ChecksumMismatchError: if the checksum does not match
+        """
+        actual = self.get_actual()
+
+        if self.__expected.lower() == actual:
+            return
+
+        # Some servers provide the checksum as a base64-encoded digest.
+        if self.__checksum_type != 'etag' and self.__expected == base64.b64encode(bytes.fromhex(actual)).decode():
+            return
+
+        raise ChecksumMismatchError(self.__checksum_type, self.__expected, actual)
+
+
+class OrderedChecksumFeeder:
+    """
+    Feeder of the content written at arbitrary offsets of a file into the calculator, in order
+
+    The content written at the current position is hashed right away. The content written ahead of the current position
+    is read back from the file once all the content before it is complete, e.g., when the file is downloaded in parts.
+    """
+
+    def __init__(self, calculator: ChecksumCalculator, file_path: str):
+        self.__calculator = calculator
+        self.__file_path = file_path
+        self.__position = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def calculator(self) -> ChecksumCalculator:
+        return self.__calculator
+
+    @property
+    def position(self) -> int:
+        return self.__position
+
+    def update(self, offset: int, data: bytes):
+        """ Feed the data just written at the given offset if it is at the current position """
+        with self.__lock:
+            if offset == self.__position:
+                self.__calculator.update(data)
+                self.__position += len(data)
+
+    def catch_up(self, completed_ranges: List[Tuple[int, int]]):
+        """ Feed the completed content (inclusive ranges) of the file continuing from the current position """
+        with self.__lock:
+            for start, end in completed_ranges:
+                if not (start <= self.__position <= end):
+                    continue
+
+                with open(self.__file_path, 'rb') as f:
+                    f.seek(self.__position)
+                    while self.__position <= end:
+                        block = f.read(min(_READ_BACK_BLOCK_SIZE, end - self.__position + 1))
+                        if not block:
+                            break
+                        self.__calculator.update(block)
+                        self.__position += len(block)
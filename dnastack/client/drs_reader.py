@@ -0,0 +1,223 @@
+"""
+Random-access reader of DRS blobs
+
+The content is read with HTTP range requests, one block or more at a time, so that only the parts of the blob actually
+read are downloaded, e.g., the header of a large VCF file or the index of a BAM file.
+
+The recently read blocks are kept in memory. When the blob is read sequentially, the following blocks are read ahead
+in the same request, with the readahead window doubling up to the limit. A random access resets the window.
+"""
+import io
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import urllib3
+
+from dnastack.common.logger import get_logger
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_MAX_CACHED_BLOCK_COUNT = 64
+DEFAULT_MAX_READAHEAD_BLOCK_COUNT = 16
+
+
+class BlobReader(io.RawIOBase):
+    """
+    Seekable read-only file-like object of a blob
+
+    :param name: The name of the blob, used in the logs
+    :param size: The size of the blob in bytes
+    :param pool: The connection pool
+    :param get_access_url: The function returning the access URL object (with "url" and "headers"). It is called for
+                           every request so that an expired access URL can be renewed.
+    :param block_size: The size of each block in bytes
+    :param max_cached_block_count: The maximum number of blocks kept in memory
+    :param max_readahead_block_count: The maximum number of blocks read ahead when the blob is read sequentially
+    """
+
+    def __init__(self,
+                 name: str,
+                 size: int,
+                 pool: urllib3.PoolManager,
+                 get_access_url: Callable[[], Any],
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 max_cached_block_count: int = DEFAULT_MAX_CACHED_BLOCK_COUNT,
+                 max_readahead_block_count: int = DEFAULT_MAX_READAHEAD_BLOCK_COUNT):
+        super().__init__()
+        self._logger = get_logger(f'{type(self).__name__}/{name}')
+        self.__name = name
+        self.__size = size
+        self.__pool = pool
+        self.__get_access_url = get_access_url
+        self.__block_size = block_size
+        self.__max_cached_block_count = max(max_cached_block_count, 1)
+        self.__max_readahead_block_count = max_readahead_block_count
+        self.__blocks: Dict[int, bytes] = OrderedDict()
+        self.__position = 0
+        self.__last_block_index: Optional[int] = None
+        self.__readahead_block_count = 0
+        self.__request_count = 0
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def request_count(self) -> int:
+        """ The number of range requests made so far """
+        return self.__request_count
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self.__check_not_closed()
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self.__check_not_closed()
+
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.__position + offset
+        elif whence == io.SEEK_END:
+            position = self.__size + offset
+        else:
+            raise ValueError(f'Invalid whence ({whence})')
+
+        if position < 0:
+            raise ValueError(f'Negative seek position ({position})')
+
+        self.__position = position
+        return self.__position
+
+    def readinto(self, buffer) -> int:
+        self.__check_not_closed()
+
+        view = memoryview(buffer).cast('B')
+        size = min(len(view), self.__size - self.__position)
+
+        if size <= 0:
+            return 0
+
+        first_block_index = self.__position // self.__block_size
+        last_block_index = (self.__position + size - 1) // self.__block_size
+        blocks = self.__get_blocks(first_block_index, last_block_index)
+
+        written_size = 0
+        for block_index in range(first_block_index, last_block_index + 1):
+            block = blocks[block_index]
+            offset = self.__position + written_size - block_index * self.__block_size
+            chunk_size = min(len(block) - offset, size - written_size)
+            view[written_size:written_size + chunk_size] = block[offset:offset + chunk_size]
+            written_size += chunk_size
+
+        self.__position += written_size
+
+        return written_size
+
+    def readall(self) -> bytes:
+        # NOTE: The rest of the blob is read with one request instead of many small reads.
+        return self.read(max(self.__size - self.__position, 0))
+
+    def close(self):
+        self.__blocks.clear()
+        super().close()
+
+    def __check_not_closed(self):
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+
+    def __get_blocks(self, first_block_index: int, last_block_index: int) -> Dict[int, bytes]:
+        """ Get the blocks in the given range (inclusive), reading the missing ones and the ones ahead """
+        if self.__last_block_index is None or first_block_index == self.__last_block_index:
+            # NOTE: Reading within the same block does not change the readahead window.
+            pass
+        elif first_block_index == self.__last_block_index + 1:
+            self.__readahead_block_count = min(max(self.__readahead_block_count * 2, 1),
+                                               self.__max_readahead_block_count)
+        else:
+            self.__readahead_block_count = 0
+
+        self.__last_block_index = last_block_index
+
+        blocks: Dict[int, bytes] = dict()
+        missing_block_indexes = []
+
+        for block_index in range(first_block_index, last_block_index + 1):
+            if block_index in self.__blocks:
+                self.__blocks.move_to_end(block_index)
+                blocks[block_index] = self.__blocks[block_index]
+            else:
+                missing_block_indexes.append(block_index)
+
+        if not missing_block_indexes:
+            return blocks
+
+        # NOTE: The blocks read ahead must fit in the cache along with the requested blocks.
+        readahead_block_count = min(self.__readahead_block_count,
+                                    max(self.__max_cached_block_count - (last_block_index - first_block_index + 1), 0))
+        max_block_index = (self.__size - 1) // self.__block_size
+        read_end_block_index = min(last_block_index + readahead_block_count, max_block_index)
+        while read_end_block_index > last_block_index and read_end_block_index in self.__blocks:
+            read_end_block_index -= 1
+
+        read_blocks = self.__read_blocks(missing_block_indexes[0], read_end_block_index)
+        blocks.update({i: block for i, block in read_blocks.items() if i <= last_block_index})
+
+        for block_index, block in read_blocks.items():
+            self.__blocks[block_index] = block
+            self.__blocks.move_to_end(block_index)
+
+        while len(self.__blocks) > self.__max_cached_block_count:
+            self.__blocks.popitem(last=False)
+
+        return blocks
+
+    def __read_blocks(self, first_block_index: int, last_block_index: int) -> Dict[int, bytes]:
+        start = first_block_index * self.__block_size
+        end = min((last_block_index + 1) * self.__block_size, self.__size) - 1
+
+        access_url = self.__get_access_url()
+        headers = dict(access_url.headers or dict())
+        headers['Range'] = f'bytes={start}-{end}'
+
+        self.__request_count += 1
+        self._logger.debug(f'Reading bytes={start}-{end}')
+
+        response: urllib3.HTTPResponse = self.__pool.request('GET',
+                                                             access_url.url,
+                                                             headers=headers,
+                                                             preload_content=False)
+        try:
+            if response.status == 206:
+                content = response.read()
+            elif response.status == 200 and start == 0:
+                # NOTE: The server ignores the range. Only the beginning of the content is used.
+                content = response.read(end + 1)
+            else:
+                raise IOError(f'The server responded with HTTP {response.status} to the range request '
+                              f'(bytes={start}-{end}) of {self.__name}.')
+        finally:
+            if response.status == 206:
+                response.release_conn()
+            else:
+                # NOTE: The unread content makes the connection unusable for the next request.
+                response.close()
+
+        if len(content) != end - start + 1:
+            raise IOError(f'Expected {end - start + 1} byte(s) in the range (bytes={start}-{end}) of {self.__name} '
+                          f'but received {len(content)} byte(s).')
+
+        return {
+            block_index: content[(block_index - first_block_index) * self.__block_size:
+                                 (block_index - first_block_index + 1) * self.__block_size]
+            for block_index in range(first_block_index, last_block_index + 1)
+        }
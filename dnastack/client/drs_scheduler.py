@@ -0,0 +1,85 @@
+"""
+Scheduling of concurrent DRS downloads
+
+The objects are downloaded largest first so that the largest objects do not stretch the tail of a run. Some workers
+only download the small objects so that they are not starved behind the large ones.
+
+The total bandwidth of all downloads can be capped with a token bucket shared by all workers.
+"""
+import threading
+from collections import deque
+from time import monotonic, sleep
+from typing import Deque, Iterable, Optional, Tuple
+
+
+class BandwidthLimiter:
+    """
+    Thread-safe token bucket limiting the number of bytes transferred per second
+
+    The bucket holds up to one second worth of tokens. A transfer larger than the available tokens is allowed to
+    proceed, and the next transfers wait until the tokens are paid back.
+
+    :param rate: The maximum number of bytes per second
+    """
+
+    def __init__(self, rate: int):
+        if rate <= 0:
+            raise ValueError(f'The rate must be positive (given: {rate}).')
+
+        self.__rate = rate
+        self.__tokens = float(rate)
+        self.__updated_time = monotonic()
+        self.__lock = threading.Lock()
+
+    @property
+    def rate(self) -> int:
+        return self.__rate
+
+    def acquire(self, size: int):
+        """ Take the tokens for the given number of bytes, blocking while the bucket is in debt """
+        with self.__lock:
+            now = monotonic()
+            self.__tokens = min(self.__rate, self.__tokens + (now - self.__updated_time) * self.__rate)
+            self.__updated_time = now
+            self.__tokens -= size
+            wait_time = -self.__tokens / self.__rate if self.__tokens < 0 else 0
+
+        if wait_time > 0:
+            sleep(wait_time)
+
+
+class DownloadScheduler:
+    """
+    Thread-safe queue of the downloads for a fixed number of workers
+
+    The general workers take the largest remaining object. The workers reserved for the small objects take the
+    smallest remaining small object, and stop once there are no small objects left.
+
+    :param items: The pairs of the DRS ID or URL and the size of the object (0 if unknown)
+    :param small_size_threshold: Objects smaller than this size (in bytes) are considered small.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, int]], small_size_threshold: int):
+        sorted_items = sorted(items, key=lambda item: item[1], reverse=True)
+
+        self.__large_items: Deque[Tuple[str, int]] = deque(i for i in sorted_items if i[1] >= small_size_threshold)
+        self.__small_items: Deque[Tuple[str, int]] = deque(i for i in sorted_items if i[1] < small_size_threshold)
+        self.__lock = threading.Lock()
+
+    def get_reserved_worker_count(self, worker_count: int) -> int:
+        """ The number of workers to reserve for the small objects, i.e., a quarter of the workers """
+        with self.__lock:
+            if worker_count < 2 or not self.__small_items or not self.__large_items:
+                return 0
+            return max(1, worker_count // 4)
+
+    def next(self, small_only: bool = False) -> Optional[str]:
+        """ Take the next object to download, or None if there is nothing left for the worker """
+        with self.__lock:
+            if small_only:
+                return self.__small_items.pop()[0] if self.__small_items else None
+
+            if self.__large_items:
+                return self.__large_items.popleft()[0]
+
+            return self.__small_items.popleft()[0] if self.__small_items else None
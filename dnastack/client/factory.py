@@ -7,6 +7,7 @@ from dnastack.client.service_registry.models import ServiceType
 from dnastack.common.events import Event, EventHandler
 from dnastack.common.logger import get_logger
 from dnastack.common.simple_stream import SimpleStream
+from dnastack.http.client_factory import HttpTransportRegistry
 
 
 class UnsupportedServiceTypeError(RuntimeError):
@@ -60,12 +61,14 @@ class EndpointRepository:
                  endpoints: Iterable[ServiceEndpoint],
                  cacheable=True,
                  additional_service_client_classes: Iterable[Type[BaseServiceClient]] = None,
-                 default_event_interceptors: Optional[Dict[str, Union[EventHandler, Callable[[Event], None]]]] = None):
+                 default_event_interceptors: Optional[Dict[str, Union[EventHandler, Callable[[Event], None]]]] = None,
+                 transport_registry: Optional[HttpTransportRegistry] = None):
         self.__logger = get_logger(f'EndpointRepository/{hash(self)}')
         self.__cacheable = cacheable
         self.__endpoints = self.__set_endpoints(endpoints)
         self.__additional_service_client_classes = additional_service_client_classes
         self.__default_event_interceptors = default_event_interceptors or dict()
+        self.__transport_registry = transport_registry or HttpTransportRegistry.get_default()
 
         self.__logger.debug('Initialized')
 
@@ -121,6 +124,7 @@ class EndpointRepository:
 
     def __create_client(self, endpoint: ServiceEndpoint) -> BaseServiceClient:
         client: BaseServiceClient = create(endpoint, self.__additional_service_client_classes)
+        client.transport_registry = self.__transport_registry
 
         for event_type, event_handler in self.__default_event_interceptors.items():
             self.__logger.debug(f'{type(client).__name__}: SET EVENT HANDLER: {event_type} => {event_handler}')
@@ -5,6 +5,7 @@ from pydantic import Field, BaseModel
 
 from dnastack.client.service_registry.models import ServiceType
 from dnastack.common.model_mixin import JsonModelMixin as HashableModel
+from dnastack.http.retry import RetryPolicy
 
 
 class EndpointSource(BaseModel):
@@ -58,6 +59,12 @@ class ServiceEndpoint(BaseModel, HashableModel):
     source: Optional[EndpointSource]
     """ The source of the endpoint configuration (e.g., service registry) """
 
+    retry_policy: Optional[RetryPolicy] = None
+    """ The retry policy of the HTTP requests to the endpoint
+
+        If not defined, the default retry policy is used.
+    """
+
     def get_authentications(self) -> List[Dict[str, Any]]:
         """ Get the list of authentication information """
         raw_auths = []
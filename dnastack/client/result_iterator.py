@@ -1,9 +1,14 @@
 from abc import ABC
+from collections import deque
+from hashlib import blake2b
 from logging import Logger
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from queue import Queue, Full, Empty
+from threading import Lock, Event, Thread
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
 from uuid import uuid4
 
+from pydantic import BaseModel
+
 from dnastack.common.logger import get_logger
 
 
@@ -11,6 +16,55 @@ class InactiveLoaderError(StopIteration):
     """ Raised when the loader has ended its session """
 
 
+class ResultCheckpoint(BaseModel):
+    """
+    Checkpoint of a result iterator, from which the iteration can be resumed
+
+    The checkpoint refers to the page being consumed and the number of items consumed from that page so that the
+    iteration resumes with the first item not yet consumed.
+    """
+    position: Dict[str, Any]  # The loader-specific position of the page being consumed
+    offset: int = 0  # The number of items consumed from that page
+    row_count: int = 0  # The total number of items consumed so far
+    completed: bool = False  # Whether all items have been consumed
+
+
+class UrlHistory:
+    """
+    History of the URLs visited by a loader
+
+    The membership test is based on the digests of all visited URLs while only the most recent URLs are kept for error
+    reporting, so that neither the memory usage nor the lookup time grows with the length of the URLs.
+    """
+
+    def __init__(self, max_recent_urls: int = 20):
+        self.__digests: Set[bytes] = set()
+        self.__recent_urls: Deque[str] = deque(maxlen=max_recent_urls)
+
+    def append(self, url: str):
+        self.__digests.add(self.__digest(url))
+        self.__recent_urls.append(url)
+
+    def __contains__(self, url: Any) -> bool:
+        return isinstance(url, str) and self.__digest(url) in self.__digests
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__recent_urls)
+
+    def __len__(self) -> int:
+        return len(self.__recent_urls)
+
+    def __getitem__(self, index: int) -> str:
+        return self.__recent_urls[index]
+
+    def __repr__(self):
+        return f'{type(self).__name__}({list(self.__recent_urls)})'
+
+    @staticmethod
+    def __digest(url: str) -> bytes:
+        return blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
 class ResultLoader(ABC):
     __uuid__: Optional[str] = None
     __logger__: Optional[Logger] = None
@@ -30,39 +84,372 @@ class ResultLoader(ABC):
     def load(self) -> List[Any]:
         raise NotImplementedError()
 
+    async def load_async(self) -> List[Any]:
+        """ Load the next page without blocking the event loop (see AsyncResultIterator) """
+        raise NotImplementedError()
+
     def has_more(self) -> bool:
         raise NotImplementedError()
 
+    def get_position(self) -> Optional[Dict[str, Any]]:
+        """
+        The position of the next page to load, from which a new loader can resume
+
+        The position must be JSON-serializable. None means that the loader cannot be resumed.
+        """
+        return None
+
+    def close(self):
+        """ Release the resources held by the loader, e.g., the HTTP session shared by all pages """
+        pass
+
+    async def close_async(self):
+        """ Release the resources held by the loader used by AsyncResultIterator """
+        self.close()
+
+
+class PagePrefetcher:
+    """
+    Load the pages from the given loader on a background thread
+
+    At most ``size`` pages are buffered ahead of the consumer. Errors raised by the loader are delivered in order,
+    after all pages loaded before the error.
+
+    The prefetcher owns the loader once it is started, i.e., the loader must be closed with :meth:`close` so that it is
+    never closed while the background thread is loading a page.
+    """
+
+    __END_OF_PAGES = object()
+
+    def __init__(self, loader: ResultLoader, size: int):
+        assert size > 0, 'The prefetch size must be at least ONE.'
+
+        self.__loader = loader
+        self.__queue: Queue = Queue(maxsize=size)
+        self.__cancelled = Event()
+        self.__finished = False
+        self.__state_lock = Lock()
+        self.__stopped = False
+        self.__close_on_stop = False
+        self.__thread = Thread(target=self.__run,
+                               name=f'{type(self).__name__}/{loader.uuid}',
+                               daemon=True)
+        self.__thread.start()
+
+    def next_page(self) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+        """ Get the next page and the position of the loader before the page was loaded
+
+            :raises StopIteration: when there are no more pages to load
+        """
+        if self.__finished:
+            raise StopIteration('No more result to iterate')
+
+        page, position, error = self.__queue.get()
+
+        if error is not None:
+            self.__finished = True
+            raise error
+        elif page is self.__END_OF_PAGES:
+            self.__finished = True
+            raise StopIteration('No more result to iterate')
+        else:
+            return page, position
+
+    def cancel(self):
+        """ Cancel the outstanding fetches """
+        self.__cancelled.set()
+
+        # Unblock the background thread if it is waiting for a free slot.
+        while True:
+            try:
+                self.__queue.get_nowait()
+            except Empty:
+                break
+
+    def close(self, timeout: float = 1):
+        """ Cancel the outstanding fetches and close the loader once the background thread has stopped
+
+            :param timeout: The number of seconds to wait for the background thread. If the thread is still loading a
+                            page afterwards, the loader is closed by the thread as soon as the page is loaded.
+        """
+        self.cancel()
+        self.__thread.join(timeout)
+
+        with self.__state_lock:
+            if not self.__stopped:
+                self.__close_on_stop = True
+                return
+
+        self.__loader.close()
+
+    def __run(self):
+        try:
+            self.__load_pages()
+        finally:
+            with self.__state_lock:
+                self.__stopped = True
+                close_loader = self.__close_on_stop
+
+            if close_loader:
+                self.__loader.close()
+
+    def __load_pages(self):
+        try:
+            while not self.__cancelled.is_set() and self.__loader.has_more():
+                position = self.__loader.get_position()
+                page = self.__loader.load()
+                if not self.__put((page, position, None)):
+                    return
+        except BaseException as e:
+            self.__put((None, None, e))
+            return
+
+        self.__put((self.__END_OF_PAGES, None, None))
+
+    def __put(self, entry: Tuple[Any, Optional[Dict[str, Any]], Optional[BaseException]]) -> bool:
+        while not self.__cancelled.is_set():
+            try:
+                self.__queue.put(entry, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
 
 class ResultIterator:
-    def __init__(self, loader: ResultLoader):
+    """
+    Result Iterator
+
+    The underlying loader (and its HTTP session) is kept alive until the iterator is depleted, closed explicitly, or
+    garbage-collected so that all pages are fetched through the same connection pool.
+
+    When ``prefetch`` is set to a positive number, up to that many pages are loaded ahead on a background thread while
+    the current page is being consumed.
+
+    Besides the item-by-item iteration, the result can be consumed page by page with :meth:`iter_pages` or in
+    fixed-size lists with :meth:`iter_batches`.
+
+    If the loader supports it, :meth:`checkpoint` captures the progress of the iteration. When the iterator is created
+    with a checkpoint, the loader is expected to be positioned at the page of the checkpoint, and the items of that
+    page consumed before the checkpoint are skipped.
+    """
+
+    def __init__(self, loader: ResultLoader, prefetch: int = 0, checkpoint: Optional[ResultCheckpoint] = None):
         self.__read_lock = Lock()
         self.__loader = loader
-        self.__buffer: List[Dict[str, Any]] = []
+        self.__buffer: Deque[Any] = deque()
         self.__depleted = False
+        self.__completed = bool(checkpoint and checkpoint.completed)
+        self.__closed = False
+        self.__prefetch = prefetch or 0
+        self.__prefetcher: Optional[PagePrefetcher] = None
+
+        # Progress
+        self.__page_position: Optional[Dict[str, Any]] = loader.get_position()
+        self.__page_offset = 0
+        self.__row_count = checkpoint.row_count if checkpoint else 0
+        self.__skipped_count = checkpoint.offset if checkpoint else 0
+
+        if self.__completed:
+            self.close()
 
     def __iter__(self):
         return self
 
-    def __next__(self):
-        if self.__depleted:
-            raise StopIteration('Already depleted')
+    def __enter__(self):
+        return self
 
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __next__(self):
+        # NOTE: The progress is updated within the lock so that the checkpoint is consistent with the buffer.
         with self.__read_lock:
             while not self.__buffer:
-                # Refill the buffer
-                if not self.__buffer and not self.__depleted:
-                    if self.__loader.has_more():
-                        try:
-                            self.__buffer.extend(self.__loader.load())
-                        except StopIteration as e:
-                            self.__depleted = True
-                            raise e
-                    else:
-                        self.__depleted = True
-                        raise StopIteration('No more result to iterate')
-
-            # Read within the lock
-            item = self.__buffer.pop(0)
-
-        return item
+                page = self.__load_next_page()
+                if page is None:
+                    raise StopIteration('No more result to iterate')
+                self.__buffer.extend(page)
+
+            item = self.__buffer.popleft()
+            self.__page_offset += 1
+            self.__row_count += 1
+            return item
+
+    def iter_pages(self) -> Iterator[List[Any]]:
+        """
+        Iterate the remaining result page by page
+
+        The items already buffered by the item-by-item iteration are yielded first as one page. Empty pages are skipped.
+        """
+        while True:
+            with self.__read_lock:
+                if self.__buffer:
+                    page = list(self.__buffer)
+                    self.__buffer.clear()
+                else:
+                    page = self.__load_next_page()
+
+                if page is not None:
+                    self.__page_offset += len(page)
+                    self.__row_count += len(page)
+
+            if page is None:
+                return
+            elif page:
+                yield page
+
+    def iter_batches(self, size: int) -> Iterator[List[Any]]:
+        """
+        Iterate the remaining result in lists of the given size
+
+        All lists have exactly ``size`` items, except the last one, which may be shorter.
+        """
+        assert size > 0, 'The batch size must be at least ONE.'
+
+        batch: List[Any] = []
+
+        for page in self.iter_pages():
+            if not batch and len(page) == size:
+                yield page
+                continue
+
+            offset = 0
+            while offset < len(page):
+                taken = page[offset:offset + size - len(batch)]
+                batch.extend(taken)
+                offset += len(taken)
+
+                if len(batch) == size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def checkpoint(self) -> ResultCheckpoint:
+        """
+        Capture the progress of the iteration
+
+        NOTE: The items handed out by :meth:`iter_batches` but not yet yielded are regarded as consumed.
+
+        :raises NotImplementedError: if the loader cannot be resumed
+        """
+        with self.__read_lock:
+            if self.__page_position is None:
+                raise NotImplementedError(f'{type(self.__loader).__name__} cannot be resumed.')
+
+            if not self.__buffer and not self.__prefetcher and not self.__depleted and self.__loader.has_more():
+                # The current page is fully consumed and the next page is not loaded yet. Start from the next page.
+                return ResultCheckpoint(position=self.__loader.get_position(),
+                                        offset=0,
+                                        row_count=self.__row_count,
+                                        completed=False)
+
+            return ResultCheckpoint(position=self.__page_position,
+                                    offset=self.__page_offset,
+                                    row_count=self.__row_count,
+                                    completed=self.__completed)
+
+    def close(self):
+        """ Stop the iteration, cancel the outstanding fetches, and release the underlying HTTP session """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        self.__depleted = True
+        self.__buffer.clear()
+
+        if self.__prefetcher:
+            self.__prefetcher.close()
+        else:
+            self.__loader.close()
+
+    def __load_next_page(self) -> Optional[List[Any]]:
+        """ Load the next page, or return None when the result is depleted (the iterator will be closed) """
+        # NOTE: This must be called within the read lock.
+        if self.__depleted:
+            return None
+
+        try:
+            if self.__prefetch > 0:
+                if not self.__prefetcher:
+                    self.__prefetcher = PagePrefetcher(self.__loader, self.__prefetch)
+                page, position = self.__prefetcher.next_page()
+            elif self.__loader.has_more():
+                position = self.__loader.get_position()
+                page = self.__loader.load()
+            else:
+                raise StopIteration()
+        except StopIteration:
+            self.__completed = True
+            self.__depleted = True
+            self.close()
+            return None
+
+        self.__page_position = position
+        self.__page_offset = 0
+
+        if self.__skipped_count:
+            # Skip the items consumed before the checkpoint.
+            self.__page_offset = min(self.__skipped_count, len(page))
+            page = page[self.__page_offset:]
+            self.__skipped_count = 0
+
+        return page
+
+    def __del__(self):
+        # NOTE: The constructor may fail before all attributes are set.
+        if hasattr(self, '_ResultIterator__loader'):
+            self.close()
+
+
+class AsyncResultIterator:
+    """
+    Asynchronous Result Iterator
+
+    The pages are loaded with :meth:`ResultLoader.load_async` so that the event loop is not blocked while waiting for
+    the responses. Like :class:`ResultIterator`, the underlying loader (and its HTTP session) is kept alive until the
+    iterator is depleted or closed explicitly.
+    """
+
+    def __init__(self, loader: ResultLoader):
+        self.__loader = loader
+        self.__buffer: Deque[Any] = deque()
+        self.__closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def __anext__(self):
+        while not self.__buffer:
+            if self.__closed:
+                raise StopAsyncIteration()
+
+            try:
+                if not self.__loader.has_more():
+                    raise StopIteration()
+                page = await self.__loader.load_async()
+            except StopIteration:
+                # NOTE: StopIteration cannot be raised from a coroutine.
+                await self.close()
+                raise StopAsyncIteration()
+
+            self.__buffer.extend(page)
+
+        return self.__buffer.popleft()
+
+    async def close(self):
+        """ Stop the iteration and release the underlying HTTP session """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        self.__buffer.clear()
+        await self.__loader.close_async()
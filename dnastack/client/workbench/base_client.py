@@ -1,17 +1,18 @@
 from abc import ABC
 from pprint import pformat
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict, Any, Union
 
 from pydantic import ValidationError
 
 from dnastack import ServiceEndpoint
 from dnastack.client.base_client import BaseServiceClient
 from dnastack.client.base_exceptions import UnauthenticatedApiAccessError, UnauthorizedApiAccessError
-from dnastack.client.result_iterator import ResultLoader, InactiveLoaderError
+from dnastack.client.result_iterator import ResultLoader, InactiveLoaderError, UrlHistory
 from dnastack.client.workbench.models import BaseListOptions, PaginatedResource
 from dnastack.common.tracing import Span
 from dnastack.http.authenticators.factory import HttpAuthenticatorFactory
 from dnastack.http.authenticators.oauth2 import OAuth2Authenticator
+from dnastack.http.async_session import AsyncHttpSession
 from dnastack.http.session import HttpSession, HttpError
 
 
@@ -64,7 +65,7 @@ class BaseWorkbenchClient(BaseServiceClient, ABC):
 class WorkbenchResultLoader(ResultLoader):
     def __init__(self,
                  service_url: str,
-                 http_session: HttpSession,
+                 http_session: Union[HttpSession, AsyncHttpSession],
                  trace: Optional[Span],
                  list_options: Optional[BaseListOptions] = None,
                  max_results: int = None):
@@ -74,7 +75,7 @@ class WorkbenchResultLoader(ResultLoader):
         self.__max_results = int(max_results) if max_results else None
         self.__loaded_results = 0
         self.__active = True
-        self.__visited_urls: List[str] = list()
+        self.__visited_urls = UrlHistory()
         self.__trace = trace
         self.__next_page_url = None
 
@@ -84,6 +85,14 @@ class WorkbenchResultLoader(ResultLoader):
     def has_more(self) -> bool:
         return self.__active
 
+    def close(self):
+        if self.__http_session:
+            self.__http_session.close()
+
+    async def close_async(self):
+        if self.__http_session:
+            await self.__http_session.close()
+
     def __generate_api_error_feedback(self, response_body) -> str:
         if self.__service_url:
             return f'Failed to load the next page of data from {self.__service_url}: ({response_body})'
@@ -97,76 +106,95 @@ class WorkbenchResultLoader(ResultLoader):
         pass
 
     def load(self) -> List[any]:
+        url, request_kwargs = self.__prepare_request()
+
+        try:
+            response = self.__http_session.get(url, trace_context=self.__trace, **request_kwargs)
+        except HttpError as e:
+            self.__raise_loading_error(e, url)
+
+        return self.__handle_response(response, url)
+
+    async def load_async(self) -> List[any]:
+        url, request_kwargs = self.__prepare_request()
+
+        try:
+            response = await self.__http_session.get(url, trace_context=self.__trace, **request_kwargs)
+        except HttpError as e:
+            self.__raise_loading_error(e, url)
+
+        return self.__handle_response(response, url)
+
+    def __prepare_request(self) -> Tuple[str, Dict[str, Any]]:
+        """ Prepare the request for the next page
+
+            :return: the URL and the other arguments of the request
+        """
         if not self.__active:
             raise InactiveLoaderError(self.__service_url)
 
-        with self.__http_session as session:
-            current_url = self.__service_url
-
-            try:
-
-                if not self.__next_page_url:
-                    response = session.get(current_url,
-                                           params=self.__list_options,
-                                           trace_context=self.__trace)
-                else:
-                    current_url = self.__next_page_url
-                    response = session.get(self.__next_page_url,
-                                           trace_context=self.__trace)
-            except HttpError as e:
-                status_code = e.response.status_code
-                response_text = e.response.text
-
-                self.__visited_urls.append(current_url)
-
-                if status_code == 401:
-                    raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_text))
-                elif status_code == 403:
-                    raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_text))
-                elif status_code >= 400:  # Catch all errors
-                    raise PageableApiError(
-                        f'Unexpected error: {response_text}',
-                        status_code,
-                        response_text,
-                        urls=self.__visited_urls
-                    )
-
-            status_code = response.status_code
-            response_text = response.text
-
-            try:
-                response_body = response.json() if response_text else dict()
-            except Exception as e:
-                self.logger.error(f'{self.__service_url}: Unexpectedly non-JSON response body from {current_url}')
-                raise PageableApiError(
-                    f'Unable to deserialize JSON from {response_text}.',
-                    status_code,
-                    response_text,
-                    urls=self.__visited_urls
-                )
-
-            try:
-                api_response = self.extract_api_response(response_body)
-            except ValidationError as e:
-                raise PageableApiError(
-                    f'Invalid Response Body: {response_body}',
-                    status_code,
-                    response_text,
-                    urls=self.__visited_urls
-                )
-
-            self.logger.debug(f'Response:\n{pformat(response_body, indent=2)}')
-
-            self.__next_page_url = api_response.pagination.next_page_url if api_response.pagination and api_response.pagination.next_page_url else None
-            if not self.__next_page_url:
-                self.__active = False
-
-            items = api_response.items()
-
-            if self.__max_results and (self.__loaded_results + len(items)) >= self.__max_results:
-                self.__active = False
-                num_of_loadable_results = self.__max_results - self.__loaded_results
-                return items[0:num_of_loadable_results]
-            else:
-                self.__loaded_results += len(items)
-                return items
+        if not self.__next_page_url:
+            return self.__service_url, dict(params=self.__list_options)
+        else:
+            return self.__next_page_url, dict()
+
+    def __raise_loading_error(self, e: HttpError, current_url: str):
+        status_code = e.response.status_code
+        response_text = e.response.text
+
+        self.__visited_urls.append(current_url)
+
+        if status_code == 401:
+            raise UnauthenticatedApiAccessError(self.__generate_api_error_feedback(response_text))
+        elif status_code == 403:
+            raise UnauthorizedApiAccessError(self.__generate_api_error_feedback(response_text))
+        elif status_code >= 400:  # Catch all errors
+            raise PageableApiError(
+                f'Unexpected error: {response_text}',
+                status_code,
+                response_text,
+                urls=self.__visited_urls
+            )
+
+        raise e
+
+    def __handle_response(self, response, current_url: str) -> List[any]:
+        status_code = response.status_code
+        response_text = response.text
+
+        try:
+            response_body = response.json() if response_text else dict()
+        except Exception as e:
+            self.logger.error(f'{self.__service_url}: Unexpectedly non-JSON response body from {current_url}')
+            raise PageableApiError(
+                f'Unable to deserialize JSON from {response_text}.',
+                status_code,
+                response_text,
+                urls=self.__visited_urls
+            )
+
+        try:
+            api_response = self.extract_api_response(response_body)
+        except ValidationError as e:
+            raise PageableApiError(
+                f'Invalid Response Body: {response_body}',
+                status_code,
+                response_text,
+                urls=self.__visited_urls
+            )
+
+        self.logger.debug(f'Response:\n{pformat(response_body, indent=2)}')
+
+        self.__next_page_url = api_response.pagination.next_page_url if api_response.pagination and api_response.pagination.next_page_url else None
+        if not self.__next_page_url:
+            self.__active = False
+
+        items = api_response.items()
+
+        if self.__max_results and (self.__loaded_results + len(items)) >= self.__max_results:
+            self.__active = False
+            num_of_loadable_results = self.__max_results - self.__loaded_results
+            return items[0:num_of_loadable_results]
+        else:
+            self.__loaded_results += len(items)
+            return items
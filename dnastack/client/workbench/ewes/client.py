@@ -2,7 +2,7 @@ from typing import List, Iterator, Optional, Union, Iterable
 from urllib.parse import urljoin
 
 from dnastack.client.models import ServiceEndpoint
-from dnastack.client.result_iterator import ResultIterator
+from dnastack.client.result_iterator import ResultIterator, AsyncResultIterator
 from dnastack.client.service_registry.models import ServiceType
 from dnastack.client.workbench.base_client import BaseWorkbenchClient, WorkbenchResultLoader
 from dnastack.client.workbench.ewes.models import ExtendedRunEvents, WesServiceInfo, ExtendedRunStatus, \
@@ -154,6 +154,20 @@ class EWesClient(BaseWorkbenchClient):
             trace=trace,
         ))
 
+    def list_runs_async(self,
+                        list_options: Optional[ExtendedRunListOptions] = None,
+                        max_results: int = None,
+                        trace: Optional[Span] = None) -> AsyncResultIterator:
+        """ List the runs without blocking the event loop (requires httpx), e.g., "async for run in ..." """
+        trace = trace or Span(origin=self)
+        return AsyncResultIterator(ExtendedRunListResultLoader(
+            service_url=urljoin(self.endpoint.url, f'{self.namespace}/ga4gh/wes/v1/runs'),
+            http_session=self.create_async_http_session(),
+            list_options=list_options,
+            max_results=max_results,
+            trace=trace,
+        ))
+
     def get_status(self, run_id: str, trace: Optional[Span] = None) -> MinimalExtendedRun:
         trace = trace or Span(origin=self)
         with self.create_http_session() as session:
@@ -169,6 +183,18 @@ class EWesClient(BaseWorkbenchClient):
                                    trace_context=trace)
             return ExtendedRun(**response.json())
 
+    async def get_run_async(self,
+                            run_id: str,
+                            include_tasks: bool = False,
+                            trace: Optional[Span] = None) -> ExtendedRun:
+        """ Get the run without blocking the event loop (requires httpx) """
+        trace = trace or Span(origin=self)
+        async with self.create_async_http_session() as session:
+            response = await session.get(urljoin(self.endpoint.url, f'{self.namespace}/ga4gh/wes/v1/runs/{run_id}'
+                                                                    f'?exclude_tasks={not include_tasks}'),
+                                         trace_context=trace)
+            return ExtendedRun(**response.json())
+
     def cancel_run(self, run_id: str, trace: Optional[Span] = None) -> Union[RunId, WorkbenchApiError]:
         with self.create_http_session() as session:
             response = session.post(urljoin(self.endpoint.url, f'{self.namespace}/ga4gh/wes/v1/runs/{run_id}/cancel'),
@@ -88,23 +88,32 @@ class EventSource(AbstractEventSource):
         self._raise_error_for_non_registered_event_type(event_type)
         actual_event = event if isinstance(event, Event) else Event.make(details=event)
 
-        event_logger = get_logger(
-            f'{self._event_logger.name}/{event_type}/{self._compute_event_hash(actual_event)}/DISPATCH',
-            self._event_logger.level
+        # NOTE: The dispatch logger (with the hash of the event) is only created when the debug logs are enabled as
+        #       some events, e.g., the progress of downloads, are dispatched at a high rate.
+        event_logger = (
+            get_logger(
+                f'{self._event_logger.name}/{event_type}/{self._compute_event_hash(actual_event)}/DISPATCH',
+                self._event_logger.level
+            )
+            if self._event_logger.isEnabledFor(logging.DEBUG)
+            else None
         )
 
-        event_logger.debug(f'BEGIN')
+        if event_logger:
+            event_logger.debug(f'BEGIN')
 
         if event_type in self._event_handlers:
             for handler in self._event_handlers[event_type]:
                 if not actual_event.propagated:
                     break
-                event_logger.debug(f'INVOKE {handler}')
+                if event_logger:
+                    event_logger.debug(f'INVOKE {handler}')
                 handler(actual_event)
         else:
             pass
 
-        event_logger.debug(f'END')
+        if event_logger:
+            event_logger.debug(f'END')
 
     def on(self, event_type: str, handler: Union[EventHandler, Callable[[Event], None]]):
         self._raise_error_for_non_registered_event_type(event_type)
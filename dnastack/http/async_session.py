@@ -0,0 +1,369 @@
+"""
+Asynchronous HTTP session
+
+The session works like HttpSession, i.e., the authenticator is invoked before every request. On HTTP 401, the
+session re-authenticates and then falls back to the next authenticator. The requests are sent with httpx
+(optional dependency) so that many requests can be in flight on the same event loop.
+
+As the authenticators are blocking, e.g., they may restore the session from the local storage or refresh the tokens,
+they are invoked on the default executor of the event loop.
+
+The responses with the retryable statuses are retried according to the retry policy, without blocking the event loop.
+"""
+import asyncio
+import functools
+import logging
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+from dnastack.common.environments import env
+from dnastack.common.events import EventSource
+from dnastack.common.exceptions import DependencyError
+from dnastack.common.logger import get_logger
+from dnastack.common.tracing import Span
+from dnastack.http.authenticators.abstract import Authenticator
+from dnastack.http.authenticators.constants import get_authenticator_log_level
+from dnastack.http.circuit_breaker import CircuitBreakerRegistry
+from dnastack.http.retry import RetryBudget, RetryPolicy
+from dnastack.http.session import AuthenticationError, ClientError, HttpSession, RetryHistoryEntry, ServerError, \
+    format_body_for_log
+
+
+def import_httpx():
+    try:
+        # We delay the import as late as possible so that the optional dependency (httpx)
+        # does not block the other functionalities of the library.
+        import httpx
+        return httpx
+    except ImportError:
+        raise DependencyError('httpx')
+
+
+class _RequestCredentials:
+    """ The object updated by the authenticator (see Authenticator.update_request) for a single request
+
+        NOTE: The authenticators only set the headers. Unlike HttpSession, the HTTP client is shared by the concurrent
+              requests, and it is not updated directly.
+    """
+
+    def __init__(self):
+        self.headers: Dict[str, str] = dict()
+
+
+def _to_query_params(params: Any) -> List[Tuple[str, str]]:
+    """ Convert the query parameters the same way as requests does, i.e., the None values are omitted and the lists
+        are expanded to repeated parameters.
+    """
+    if isinstance(params, BaseModel):
+        items = params.dict().items()
+    elif isinstance(params, dict):
+        items = params.items()
+    else:
+        items = params
+
+    query_params: List[Tuple[str, str]] = []
+
+    for name, value in items:
+        for item in (value if isinstance(value, (list, tuple, set)) else [value]):
+            if item is not None:
+                query_params.append((name, str(item)))
+
+    return query_params
+
+
+class AsyncHttpSession:
+    """
+    Asynchronous HTTP session (requires httpx)
+
+    :param client: The httpx.AsyncClient. By default, the session creates its own client, which is closed when the
+                   session is closed.
+    :param retry_policy: The retry policy. By default, it is the default retry policy.
+    :param retry_budget: The retry budget. By default, it is the process-wide budget.
+    :param circuit_breakers: The circuit breakers of the hosts. By default, the circuit breakers are not used.
+    """
+
+    def __init__(self,
+                 uuid: Optional[str] = None,
+                 authenticators: List[Authenticator] = None,
+                 suppress_error: bool = True,
+                 enable_auth: bool = True,
+                 client: Optional[Any] = None,
+                 log_body_max_size: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None):
+        self.__id = uuid or str(uuid4())
+        self.__logger = get_logger(f'{type(self).__name__}/{self.__id}')
+        self.__authenticators = authenticators
+        self.__client = client
+        self.__owns_client = client is None
+        self.__suppress_error = suppress_error
+        self.__enable_auth = enable_auth
+        self.__retry_policy = retry_policy or RetryPolicy()
+        self.__retry_budget = retry_budget
+        self.__circuit_breakers = circuit_breakers
+        self.__log_body_max_size = log_body_max_size or env('DNASTACK_HTTP_LOG_BODY_MAX_SIZE',
+                                                            default=4096,
+                                                            transform=int,
+                                                            description='Maximum number of bytes of the request and '
+                                                                        'response bodies in the debug log')
+
+        self.__events = EventSource(['authentication-before',
+                                     'authentication-ok',
+                                     'authentication-failure',
+                                     'authentication-ignored',
+                                     'blocking-response-required',
+                                     'blocking-response-ok',
+                                     'blocking-response-failed',
+                                     'initialization-before',
+                                     'refresh-before',
+                                     'refresh-ok',
+                                     'refresh-failure',
+                                     'session-restored',
+                                     'session-not-restored',
+                                     'session-revoked'],
+                                    origin=self)
+
+        if self.__authenticators:
+            for authenticator in self.__authenticators:
+                self.__events.set_passthrough(authenticator.events)
+
+    @property
+    def events(self) -> EventSource:
+        return self.__events
+
+    @property
+    def authenticators(self):
+        return self.__authenticators
+
+    @property
+    def _client(self):
+        if not self.__client:
+            httpx = import_httpx()
+
+            # NOTE: Like requests, there is no timeout by default.
+            self.__client = httpx.AsyncClient(headers={'User-Agent': HttpSession.generate_http_user_agent()},
+                                              timeout=None)
+
+        return self.__client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def submit(self,
+                     method: str,
+                     url: str,
+                     retry_with_reauthentication: bool = True,
+                     retry_with_next_authenticator: bool = False,
+                     authenticator_index: int = 0,
+                     retry_history: Optional[List[RetryHistoryEntry]] = None,
+                     trace_context: Optional[Span] = None,
+                     **kwargs):
+        trace_context = trace_context or Span(origin=self)
+
+        retry_history = retry_history or list()
+
+        logger = trace_context.create_span_logger(self.__logger)
+        params = kwargs.get('params', None)
+        logger.debug(f'{method.upper()} {url} {params or "(no params)"} '
+                     f'(AUTH: {"Enabled" if self.__enable_auth else "Disabled"})')
+
+        authenticator: Optional[Authenticator] = None
+        credentials = _RequestCredentials()
+
+        if self.__enable_auth:
+            if self.__authenticators:
+                if authenticator_index < len(self.__authenticators):
+                    authenticator = self.__authenticators[authenticator_index]
+                else:
+                    logger.error(f'Failed to authenticate for {url}')
+                    for counter, retry in enumerate(retry_history, start=1):
+                        logger.error(f'Retry #{counter}:\n\n{retry}\n')
+
+                    raise AuthenticationError('Exhausted all authentication methods but still unable to get successful '
+                                              f'authentication for {url}')
+
+                logger.debug(f'AUTH: session_id => {authenticator.session_id}')
+
+                await self.__run_blocking(authenticator.before_request, credentials, trace_context=trace_context)
+            else:
+                logger.debug('AUTH: no authenticators configured')
+        else:
+            logger.debug('AUTH: the authentication has been disabled')
+            self.events.dispatch('authentication-ignored', dict(method=method, url=url))
+
+        http_method = method.lower()
+
+        trace_metadata = {
+            'auth_enabled': self.__enable_auth,
+            'request': {
+                'method': http_method,
+                'url': url,
+            }
+        }
+
+        with trace_context.new_span(metadata=trace_metadata) as sub_span:
+            sub_logger = sub_span.create_span_logger(logger)
+
+            log_body = sub_logger.isEnabledFor(logging.DEBUG)
+
+            if log_body:
+                request_body = kwargs.get('json') if kwargs.get('json') is not None else kwargs.get('data')
+                sub_logger.debug(f'Request/{http_method.upper()} {url}'
+                                 f'\n{format_body_for_log(request_body, self.__log_body_max_size)}')
+
+            request_kwargs = dict(kwargs)
+            request_kwargs['headers'] = {
+                **(kwargs.get('headers') or dict()),
+                **credentials.headers,
+                **sub_span.create_http_headers(),
+            }
+            if params is not None:
+                request_kwargs['params'] = _to_query_params(params)
+
+            response = await self.__send_through_circuit_breaker(http_method.upper(), url, request_kwargs, sub_logger)
+
+            if log_body:
+                sub_logger.debug(f'HTTP {response.status_code} {method} {url} ({len(response.content)}B)'
+                                 f'\n{format_body_for_log(response.content, self.__log_body_max_size)}')
+
+        status_code = response.status_code
+
+        if status_code < 400:
+            return response
+        elif self.__suppress_error:
+            logger.debug('Error suppressed by the caller of this method.')
+            return response
+        elif self.__enable_auth and status_code == 401 and authenticator:
+            fallback_logger = trace_context.create_span_logger(logger, get_authenticator_log_level())
+
+            await self.__run_blocking(authenticator.clear_access_token)
+
+            retry = RetryHistoryEntry(url=url,
+                                      authenticator_index=authenticator_index,
+                                      with_reauthentication=retry_with_reauthentication,
+                                      with_next_authenticator=retry_with_next_authenticator,
+                                      encountered_http_status=status_code,
+                                      encountered_http_response=response.text,
+                                      resolution='')
+            retry_history.append(retry)
+
+            if retry_with_reauthentication:
+                fallback_logger.debug('Retry with re-authentication.')
+                retry.resolution = 'retry with re-authentication'
+
+                return await self.submit(method,
+                                         url,
+                                         retry_with_reauthentication=False,
+                                         retry_with_next_authenticator=True,
+                                         authenticator_index=authenticator_index,
+                                         retry_history=retry_history,
+                                         trace_context=trace_context,
+                                         **kwargs)
+            elif retry_with_next_authenticator:
+                fallback_logger.debug('Retry with the next authenticator.')
+                retry.resolution = 'retry with the next authenticator'
+
+                return await self.submit(method,
+                                         url,
+                                         retry_with_reauthentication=True,
+                                         retry_with_next_authenticator=False,
+                                         authenticator_index=authenticator_index + 1,
+                                         retry_history=retry_history,
+                                         trace_context=trace_context,
+                                         **kwargs)
+            else:
+                raise RuntimeError('Invalid state')
+        else:
+            raise (ClientError if status_code < 500 else ServerError)(response, trace_context=trace_context)
+
+    async def get(self, url, trace_context: Optional[Span] = None, **kwargs):
+        return await self.submit(method='get', url=url, trace_context=trace_context, **kwargs)
+
+    async def post(self, url, trace_context: Optional[Span] = None, **kwargs):
+        return await self.submit(method='post', url=url, trace_context=trace_context, **kwargs)
+
+    async def delete(self, url, trace_context: Optional[Span] = None, **kwargs):
+        return await self.submit(method='delete', url=url, trace_context=trace_context, **kwargs)
+
+    async def close(self):
+        if self.__client and self.__owns_client:
+            await self.__client.aclose()
+        self.__client = None
+
+    async def __send_through_circuit_breaker(self,
+                                             method: str,
+                                             url: str,
+                                             request_kwargs: Dict[str, Any],
+                                             logger: logging.Logger):
+        """ Send the request through the circuit breaker of the host, if enabled """
+        if not self.__circuit_breakers:
+            return await self.__send(method, url, request_kwargs, logger)
+
+        circuit_breaker = self.__circuit_breakers.get(url)
+        circuit_breaker.before_call()
+
+        started_time = perf_counter()
+
+        try:
+            response = await self.__send(method, url, request_kwargs, logger)
+        except Exception as e:
+            self.__circuit_breakers.record(circuit_breaker, f'{type(e).__name__}: {e}', perf_counter() - started_time)
+            raise
+        except BaseException:
+            # NOTE: The cancellation and the interruption say nothing about the health of the host.
+            circuit_breaker.release()
+            raise
+
+        self.__circuit_breakers.record(circuit_breaker,
+                                       f'HTTP {response.status_code}' if response.status_code >= 500 else None,
+                                       perf_counter() - started_time)
+        return response
+
+    async def __send(self, method: str, url: str, request_kwargs: Dict[str, Any], logger: logging.Logger):
+        """ Send the request, and retry according to the retry policy """
+        retry_policy = self.__retry_policy
+        retry_budget = self.__retry_budget or RetryBudget.get_default()
+        retry_count = 0
+        backoff = 0
+
+        while True:
+            if retry_policy.use_budget:
+                retry_budget.deposit()
+
+            response = await self._client.request(method, url, **request_kwargs)
+
+            if retry_count >= retry_policy.max_retries \
+                    or not retry_policy.is_retryable(method, response.status_code):
+                return response
+
+            retry_after = response.headers.get('Retry-After')
+
+            if retry_policy.exceeds_max_retry_after(retry_after):
+                logger.warning(f'{method} {url}: Not retried as Retry-After ({retry_after}) exceeds '
+                               f'{retry_policy.max_retry_after}s')
+                return response
+
+            if retry_policy.use_budget and not retry_budget.withdraw():
+                logger.warning(f'{method} {url}: Not retried as the retry budget is exhausted')
+                return response
+
+            backoff = retry_policy.get_next_backoff(backoff)
+            delay = retry_policy.get_retry_after_delay(retry_after)
+            delay = backoff if delay is None else delay
+            retry_count += 1
+
+            logger.debug(f'{method} {url}: HTTP {response.status_code}, retry #{retry_count} in {delay:.3f}s')
+
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def __run_blocking(function: Callable, *args, **kwargs):
+        # NOTE: asyncio.to_thread is not available in Python 3.8.
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(function, *args, **kwargs))
@@ -0,0 +1,355 @@
+"""
+Per-host circuit breakers
+
+A circuit breaker tracks the outcomes of the recent requests to a host (scheme + host + port). It is normally "closed",
+i.e., the requests are sent. When too many of the recent requests have failed (connection errors and server errors,
+after the retries) or have been too slow, the circuit "opens" and the requests to the host fail immediately with
+CircuitOpenError. After a while, the circuit becomes "half-open" and one request is sent to probe the host. The circuit
+closes if the probe succeeds, or opens again if it fails.
+
+The open circuits are also saved in the local storage so that the following invocations of the CLI fail fast too, and
+so that the state can be inspected with "dnastack debug circuit-breakers".
+"""
+import json
+import os
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from threading import Lock
+from time import time
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from imagination.decorator import service
+from pydantic import BaseModel
+
+from dnastack.common.environments import env
+from dnastack.common.logger import get_logger
+from dnastack.constants import LOCAL_STORAGE_DIRECTORY
+from dnastack.http.client_factory import HttpTransportRegistry
+
+
+class CircuitState(str, Enum):
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half-open'
+
+
+class CircuitBreakerSnapshot(BaseModel):
+    """ The state of the circuit breaker of a host """
+    host: str
+    state: CircuitState
+    call_count: int  # The number of the calls in the window
+    failure_count: int
+    slow_call_count: int
+    last_failure: Optional[str] = None
+    opened_at: Optional[float] = None  # Epoch timestamp
+    retry_at: Optional[float] = None  # Epoch timestamp, after which the circuit becomes half-open
+
+
+class CircuitOpenError(RuntimeError):
+    """ Raised instead of sending the request to the host with the open circuit """
+
+    def __init__(self, snapshot: CircuitBreakerSnapshot):
+        retry_time = datetime.fromtimestamp(snapshot.retry_at).strftime('%H:%M:%S') if snapshot.retry_at else 'later'
+        super().__init__(f'{snapshot.host} is unavailable as the recent requests have failed '
+                         f'({snapshot.last_failure or "too slow"}). No requests are sent to the host until '
+                         f'{retry_time}. Run "dnastack debug circuit-breakers reset" to retry immediately.')
+        self.snapshot = snapshot
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a host
+
+    :param failure_rate_threshold: The ratio of the failed calls in the window to open the circuit.
+    :param slow_call_duration: The number of seconds after which a call is considered slow.
+    :param slow_call_rate_threshold: The ratio of the slow calls in the window to open the circuit.
+    :param window_size: The number of the most recent calls to evaluate.
+    :param minimum_calls: The minimum number of calls in the window before the circuit can open.
+    :param open_duration: The number of seconds before the open circuit becomes half-open.
+    """
+
+    def __init__(self,
+                 host: str,
+                 failure_rate_threshold: float = 0.5,
+                 slow_call_duration: float = 60,
+                 slow_call_rate_threshold: float = 0.8,
+                 window_size: int = 20,
+                 minimum_calls: int = 5,
+                 open_duration: float = 30,
+                 clock: Callable[[], float] = time):
+        self.__host = host
+        self.__failure_rate_threshold = failure_rate_threshold
+        self.__slow_call_duration = slow_call_duration
+        self.__slow_call_rate_threshold = slow_call_rate_threshold
+        self.__minimum_calls = minimum_calls
+        self.__open_duration = open_duration
+        self.__clock = clock
+        self.__lock = Lock()
+        self.__outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)  # (failed, slow)
+        self.__state = CircuitState.closed
+        self.__last_failure: Optional[str] = None
+        self.__opened_at: Optional[float] = None
+        self.__probing = False
+
+    @property
+    def host(self) -> str:
+        return self.__host
+
+    @property
+    def state(self) -> CircuitState:
+        with self.__lock:
+            return self.__state
+
+    def before_call(self):
+        """ Check if the call is allowed
+
+            :raises CircuitOpenError: if the circuit is open, or if the host is being probed
+        """
+        with self.__lock:
+            if self.__state == CircuitState.open:
+                if self.__clock() < self.__opened_at + self.__open_duration:
+                    raise CircuitOpenError(self.__snapshot())
+                self.__state = CircuitState.half_open
+                self.__probing = False
+
+            if self.__state == CircuitState.half_open:
+                if self.__probing:
+                    raise CircuitOpenError(self.__snapshot())
+                self.__probing = True
+
+    def record(self, failure: Optional[str], duration: float) -> bool:
+        """ Record the outcome of the call
+
+            :param failure: The description of the failure, or None if the call succeeded
+            :param duration: The duration of the call in seconds
+            :return: True if the circuit has opened or closed
+        """
+        failed = failure is not None
+        slow = duration >= self.__slow_call_duration
+
+        with self.__lock:
+            if failed:
+                self.__last_failure = failure
+
+            if self.__state == CircuitState.half_open:
+                self.__probing = False
+
+                if failed or slow:
+                    self.__open()
+                else:
+                    self.__state = CircuitState.closed
+                    self.__outcomes.clear()
+                    self.__opened_at = None
+
+                return True
+
+            self.__outcomes.append((failed, slow))
+
+            if self.__state == CircuitState.closed and len(self.__outcomes) >= self.__minimum_calls:
+                failure_count, slow_call_count = self.__count()
+                if failure_count >= self.__failure_rate_threshold * len(self.__outcomes) \
+                        or slow_call_count >= self.__slow_call_rate_threshold * len(self.__outcomes):
+                    self.__open()
+                    return True
+
+            return False
+
+    def release(self):
+        """ Release the call allowed by "before_call" without recording its outcome, e.g., when it is interrupted """
+        with self.__lock:
+            if self.__state == CircuitState.half_open:
+                self.__probing = False
+
+    def restore(self, snapshot: CircuitBreakerSnapshot):
+        """ Restore the open circuit from the snapshot, e.g., saved by another process """
+        with self.__lock:
+            if snapshot.state != CircuitState.closed and snapshot.opened_at is not None:
+                self.__state = CircuitState.open
+                self.__opened_at = snapshot.opened_at
+                self.__last_failure = snapshot.last_failure
+
+    def reset(self):
+        with self.__lock:
+            self.__state = CircuitState.closed
+            self.__outcomes.clear()
+            self.__last_failure = None
+            self.__opened_at = None
+            self.__probing = False
+
+    def snapshot(self) -> CircuitBreakerSnapshot:
+        with self.__lock:
+            return self.__snapshot()
+
+    def __open(self):
+        # NOTE: This must be called within the lock.
+        self.__state = CircuitState.open
+        self.__opened_at = self.__clock()
+
+    def __count(self) -> Tuple[int, int]:
+        # NOTE: This must be called within the lock.
+        return (sum([1 for failed, _ in self.__outcomes if failed]),
+                sum([1 for _, slow in self.__outcomes if slow]))
+
+    def __snapshot(self) -> CircuitBreakerSnapshot:
+        # NOTE: This must be called within the lock.
+        failure_count, slow_call_count = self.__count()
+        return CircuitBreakerSnapshot(host=self.__host,
+                                      state=self.__state,
+                                      call_count=len(self.__outcomes),
+                                      failure_count=failure_count,
+                                      slow_call_count=slow_call_count,
+                                      last_failure=self.__last_failure,
+                                      opened_at=self.__opened_at,
+                                      retry_at=(self.__opened_at + self.__open_duration
+                                                if self.__opened_at is not None
+                                                else None))
+
+
+@service.registered()
+class CircuitBreakerRegistry:
+    """
+    Registry of the circuit breakers, one per host
+
+    :param file_path: The file of the saved states. By default, it is "circuit-breakers.json" in the local storage
+                      directory.
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.__logger = get_logger(type(self).__name__)
+        self.__lock = Lock()
+        self.__circuit_breakers: Dict[str, CircuitBreaker] = dict()
+        self.__file_path = file_path or env('DNASTACK_HTTP_CIRCUIT_BREAKER_FILE',
+                                            default=os.path.join(LOCAL_STORAGE_DIRECTORY, 'circuit-breakers.json'),
+                                            description='The file of the saved states of the circuit breakers')
+        self.__failure_rate_threshold = env('DNASTACK_HTTP_CIRCUIT_BREAKER_FAILURE_RATE',
+                                            default=0.5,
+                                            transform=float,
+                                            description='Ratio of the failed HTTP requests to a host to stop sending '
+                                                        'the requests')
+        self.__slow_call_duration = env('DNASTACK_HTTP_CIRCUIT_BREAKER_SLOW_CALL_DURATION',
+                                        default=60,
+                                        transform=float,
+                                        description='Number of seconds after which an HTTP request is considered slow')
+        self.__slow_call_rate_threshold = env('DNASTACK_HTTP_CIRCUIT_BREAKER_SLOW_CALL_RATE',
+                                              default=0.8,
+                                              transform=float,
+                                              description='Ratio of the slow HTTP requests to a host to stop sending '
+                                                          'the requests')
+        self.__minimum_calls = env('DNASTACK_HTTP_CIRCUIT_BREAKER_MINIMUM_CALLS',
+                                   default=5,
+                                   transform=int,
+                                   description='Minimum number of the recent HTTP requests to a host to evaluate')
+        self.__open_duration = env('DNASTACK_HTTP_CIRCUIT_BREAKER_OPEN_DURATION',
+                                   default=30,
+                                   transform=float,
+                                   description='Number of seconds before sending a request to the failing host again')
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    def get(self, url: str) -> CircuitBreaker:
+        """ Get the circuit breaker of the host of the URL """
+        host = HttpTransportRegistry.get_key(url)
+
+        with self.__lock:
+            if host not in self.__circuit_breakers:
+                circuit_breaker = CircuitBreaker(host,
+                                                 failure_rate_threshold=self.__failure_rate_threshold,
+                                                 slow_call_duration=self.__slow_call_duration,
+                                                 slow_call_rate_threshold=self.__slow_call_rate_threshold,
+                                                 minimum_calls=self.__minimum_calls,
+                                                 open_duration=self.__open_duration)
+
+                saved_snapshot = self.__load().get(host)
+                if saved_snapshot:
+                    circuit_breaker.restore(saved_snapshot)
+
+                self.__circuit_breakers[host] = circuit_breaker
+
+            return self.__circuit_breakers[host]
+
+    def record(self, circuit_breaker: CircuitBreaker, failure: Optional[str], duration: float):
+        """ Record the outcome of the call to the host, and save the state when the circuit opens or closes """
+        if not circuit_breaker.record(failure, duration):
+            return
+
+        snapshot = circuit_breaker.snapshot()
+
+        if snapshot.state == CircuitState.open:
+            self.__logger.warning(f'{snapshot.host}: The requests to the host are stopped until '
+                                  f'{datetime.fromtimestamp(snapshot.retry_at).isoformat()} as the recent requests have '
+                                  f'failed ({snapshot.last_failure or "too slow"})')
+        else:
+            self.__logger.info(f'{snapshot.host}: The requests to the host are resumed')
+
+        with self.__lock:
+            self.__save(snapshot.host, snapshot if snapshot.state != CircuitState.closed else None)
+
+    def list_snapshots(self) -> List[CircuitBreakerSnapshot]:
+        """ List the states of the circuit breakers of this process and the saved open circuits """
+        with self.__lock:
+            snapshots = self.__load()
+            snapshots.update({
+                host: circuit_breaker.snapshot()
+                for host, circuit_breaker in self.__circuit_breakers.items()
+            })
+
+        return sorted(snapshots.values(), key=lambda s: s.host)
+
+    def reset(self, host: Optional[str] = None) -> int:
+        """ Close the circuit of the host, or of all hosts if not specified
+
+            :return: the number of the circuits reset
+        """
+        with self.__lock:
+            saved_snapshots = self.__load()
+            hosts = set(saved_snapshots.keys()).union(self.__circuit_breakers.keys())
+
+            if host:
+                host = HttpTransportRegistry.get_key(host) if '://' in host else host.lower()
+                hosts = {h for h in hosts if h == host or h.split('://', 1)[-1] == host}
+
+            for reset_host in hosts:
+                if reset_host in self.__circuit_breakers:
+                    self.__circuit_breakers[reset_host].reset()
+                self.__save(reset_host, None)
+
+        return len(hosts)
+
+    def __load(self) -> Dict[str, CircuitBreakerSnapshot]:
+        # NOTE: This must be called within the lock.
+        try:
+            with open(self.__file_path, 'r') as f:
+                raw_snapshots = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return dict()
+
+        return {
+            host: CircuitBreakerSnapshot(**raw_snapshot)
+            for host, raw_snapshot in raw_snapshots.items()
+        }
+
+    def __save(self, host: str, snapshot: Optional[CircuitBreakerSnapshot]):
+        # NOTE: This must be called within the lock.
+        snapshots = self.__load()
+
+        if snapshot:
+            snapshots[host] = snapshot
+        elif host in snapshots:
+            del snapshots[host]
+        else:
+            return
+
+        temp_file_path = f'{self.__file_path}.{os.getpid()}.{time()}.swap'
+        try:
+            os.makedirs(os.path.dirname(self.__file_path) or '.', exist_ok=True)
+            with open(temp_file_path, 'w') as f:
+                json.dump({h: json.loads(s.json()) for h, s in snapshots.items()}, f, indent=2)
+            os.replace(temp_file_path, self.__file_path)
+        except OSError as e:
+            self.__logger.warning(f'{host}: Unable to save the state of the circuit breaker ({type(e).__name__}: {e})')
+        finally:
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
@@ -1,20 +1,204 @@
-from typing import Optional
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Optional, Dict
+from urllib.parse import urlparse
 
 from imagination.decorator.service import Service
-from requests import Session
-from requests.adapters import HTTPAdapter
+from requests import Session, PreparedRequest, Response
+from requests.adapters import HTTPAdapter, BaseAdapter
 from urllib3 import Retry
 
+from dnastack.common.environments import env
+from dnastack.common.logger import get_logger
+from dnastack.http.retry import RetryBudget, RetryPolicy
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class RetryPolicyAdapter(HTTPAdapter):
+    """ HTTP transport retrying the requests according to the retry policy """
+
+    def __init__(self, retry_policy: RetryPolicy, retry_budget: Optional[RetryBudget] = None, **kwargs):
+        super().__init__(max_retries=retry_policy.create_retry(retry_budget), **kwargs)
+        self.__retry_policy = retry_policy
+        self.__retry_budget = retry_budget
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:
+        if self.__retry_policy.use_budget:
+            (self.__retry_budget or RetryBudget.get_default()).deposit()
+        return super().send(request, *args, **kwargs)
+
+
+class HttpTransportRegistry:
+    """
+    Thread-safe registry of pooled HTTP transports, one per origin (scheme + host + port)
+
+    All sessions using the same registry share the same connection pools so that keep-alive connections are reused
+    across service clients and requests.
+
+    :param pool_size: The maximum number of origins to keep pooled transports for. The least recently used transport
+                      is closed when the limit is exceeded.
+    :param max_connections_per_host: The maximum number of connections kept in the pool of each origin.
+    :param idle_timeout: The number of seconds after which an unused transport is closed.
+    :param retry_option: The retry configuration of all transports, overriding the retry policies.
+    :param retry_policy: The default retry policy.
+    :param retry_budget: The retry budget. By default, it is the process-wide budget.
+    """
+
+    __default_registry: Optional['HttpTransportRegistry'] = None
+    __default_registry_lock = Lock()
+
+    def __init__(self,
+                 pool_size: Optional[int] = None,
+                 max_connections_per_host: Optional[int] = None,
+                 idle_timeout: Optional[float] = None,
+                 retry_option: Optional[Retry] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 retry_budget: Optional[RetryBudget] = None):
+        self.__logger = get_logger(type(self).__name__)
+        self.__lock = Lock()
+        self.__pool_size = pool_size or env('DNASTACK_HTTP_POOL_SIZE',
+                                            default=32,
+                                            transform=int,
+                                            description='Maximum number of hosts with pooled HTTP connections')
+        self.__max_connections_per_host = max_connections_per_host or env('DNASTACK_HTTP_MAX_CONNECTIONS_PER_HOST',
+                                                                          default=10,
+                                                                          transform=int,
+                                                                          description='Maximum number of pooled '
+                                                                                      'HTTP connections per host')
+        self.__idle_timeout = idle_timeout or env('DNASTACK_HTTP_POOL_IDLE_TIMEOUT',
+                                                  default=300,
+                                                  transform=float,
+                                                  description='Number of seconds before an idle HTTP connection pool '
+                                                              'is closed')
+        self.__retry_option = retry_option
+        self.__retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.__retry_budget = retry_budget
+        self.__adapters: Dict[str, HTTPAdapter] = OrderedDict()
+        self.__last_used_times: Dict[str, float] = dict()
+
+    @classmethod
+    def get_default(cls) -> 'HttpTransportRegistry':
+        """ Get the process-wide registry """
+        with cls.__default_registry_lock:
+            if cls.__default_registry is None:
+                cls.__default_registry = cls()
+            return cls.__default_registry
+
+    @property
+    def pool_size(self) -> int:
+        return self.__pool_size
+
+    @property
+    def max_connections_per_host(self) -> int:
+        return self.__max_connections_per_host
+
+    @property
+    def idle_timeout(self) -> float:
+        return self.__idle_timeout
+
+    def get_adapter(self, url: str, retry_policy: Optional[RetryPolicy] = None) -> HTTPAdapter:
+        """ Get the shared transport for the origin of the given URL
+
+            The transports are also separated by the retry policy, e.g., the endpoints on the same host may have
+            different retry policies.
+        """
+        retry_policy = retry_policy or self.__retry_policy
+        key = self.get_key(url)
+        if not self.__retry_option and retry_policy != self.__retry_policy:
+            key = f'{key}#{hashlib.sha256(retry_policy.json(sort_keys=True).encode("utf-8")).hexdigest()[:12]}'
+        now = monotonic()
+
+        with self.__lock:
+            self.__evict_idle_adapters(now)
+
+            if key in self.__adapters:
+                self.__adapters.move_to_end(key)
+                adapter = self.__adapters[key]
+            else:
+                if self.__retry_option:
+                    adapter = HTTPAdapter(pool_connections=1,
+                                          pool_maxsize=self.__max_connections_per_host,
+                                          max_retries=self.__retry_option)
+                else:
+                    adapter = RetryPolicyAdapter(retry_policy,
+                                                 self.__retry_budget,
+                                                 pool_connections=1,
+                                                 pool_maxsize=self.__max_connections_per_host)
+                self.__adapters[key] = adapter
+                self.__logger.debug(f'{key}: Created a new transport')
+
+                while len(self.__adapters) > self.__pool_size:
+                    evicted_key, evicted_adapter = self.__adapters.popitem(last=False)
+                    del self.__last_used_times[evicted_key]
+                    evicted_adapter.close()
+                    self.__logger.debug(f'{evicted_key}: Closed the least recently used transport')
+
+            self.__last_used_times[key] = now
+
+        return adapter
+
+    def size(self) -> int:
+        """ The number of origins with pooled transports """
+        with self.__lock:
+            return len(self.__adapters)
+
+    def clear(self):
+        """ Close all pooled transports """
+        with self.__lock:
+            for adapter in self.__adapters.values():
+                adapter.close()
+            self.__adapters.clear()
+            self.__last_used_times.clear()
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        parsed_url = urlparse(url)
+        return f'{parsed_url.scheme}://{parsed_url.netloc}'.lower()
+
+    def __evict_idle_adapters(self, now: float):
+        # NOTE: This must be called within the lock.
+        for key in [k for k, last_used_time in self.__last_used_times.items()
+                    if now - last_used_time > self.__idle_timeout]:
+            self.__adapters.pop(key).close()
+            del self.__last_used_times[key]
+            self.__logger.debug(f'{key}: Closed the idle transport')
+
+
+class PooledSession(Session):
+    """
+    HTTP session backed by a transport registry
+
+    Closing this session does not close the shared transports.
+    """
+
+    def __init__(self, transport_registry: HttpTransportRegistry, retry_policy: Optional[RetryPolicy] = None):
+        super().__init__()
+        self.__transport_registry = transport_registry
+        self.__retry_policy = retry_policy
+
+    def get_adapter(self, url: str) -> BaseAdapter:
+        if url.lower().startswith(('http://', 'https://')):
+            return self.__transport_registry.get_adapter(url, self.__retry_policy)
+        return super().get_adapter(url)
+
 
 @Service()
 class HttpClientFactory:
-    __DEFAULT_RETRY_OPTION = Retry(total=5,
-                                   backoff_factor=0.5,
-                                   status_forcelist=[500, 502, 503, 504])
-
     @classmethod
-    def make(cls, retry_option: Optional[Retry] = None) -> Session:
+    def make(cls,
+             retry_option: Optional[Retry] = None,
+             transport_registry: Optional[HttpTransportRegistry] = None,
+             retry_policy: Optional[RetryPolicy] = None) -> Session:
+        if transport_registry and not retry_option:
+            return PooledSession(transport_registry, retry_policy)
+
         s = Session()
         for prefix in {'http', 'https'}:
-            s.mount(prefix, HTTPAdapter(max_retries=retry_option or cls.__DEFAULT_RETRY_OPTION))
+            s.mount(prefix,
+                    HTTPAdapter(max_retries=retry_option)
+                    if retry_option
+                    else RetryPolicyAdapter(retry_policy or DEFAULT_RETRY_POLICY))
         return s
@@ -0,0 +1,333 @@
+"""
+On-disk cache of HTTP GET responses with the conditional requests
+
+A successful response is cached when it has a validator (ETag or Last-Modified) or a freshness lifetime
+(Cache-Control: max-age). The body is stored as is and the information of the entry as JSON. The entries are keyed by
+the URL and the credential of the request so that the responses are never shared between principals.
+
+While the entry is fresh, it is used without sending the request. Otherwise, the request is sent with If-None-Match
+and/or If-Modified-Since, and the cached body is used when the server responds with HTTP 304.
+
+The least recently used entries are evicted when the total size of the cache exceeds the limit.
+"""
+import hashlib
+import json
+import os
+import re
+from time import time
+from typing import Dict, List, Optional
+
+from imagination.decorator import service
+from pydantic import BaseModel
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from dnastack.common.environments import env
+from dnastack.common.logger import get_logger
+from dnastack.constants import LOCAL_STORAGE_DIRECTORY
+
+CACHE_FORMAT_VERSION = 1
+
+# The response headers which are not stored, as the body is stored decoded
+_EXCLUDED_HEADER_NAMES = {'connection', 'content-encoding', 'content-length', 'keep-alive', 'set-cookie',
+                          'transfer-encoding'}
+
+
+def _parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = dict()
+
+    for directive in (value or '').split(','):
+        name, _, argument = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+
+    return directives
+
+
+class HttpCacheEntry(BaseModel):
+    """ The information of a cached response """
+    key: str
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float  # Epoch timestamp
+    expires_at: float  # Epoch timestamp, after which the response must be revalidated
+    size: int  # Bytes
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time()) < self.expires_at
+
+
+@service.registered()
+class HttpCache:
+    """
+    Storage of the cached HTTP responses
+
+    :param dir_path: The cache directory. By default, it is "http-cache" under the local storage directory.
+    :param max_size: The maximum total size of the cache in bytes.
+    """
+
+    _BODY_FILE_EXTENSION = '.body'
+    _INFO_FILE_EXTENSION = '.json'
+
+    def __init__(self, dir_path: Optional[str] = None, max_size: Optional[int] = None):
+        self.__logger = get_logger(type(self).__name__)
+        self.__dir_path = dir_path or env('DNASTACK_HTTP_CACHE_DIR',
+                                          default=os.path.join(LOCAL_STORAGE_DIRECTORY, 'http-cache'),
+                                          description='The directory of the cached HTTP responses')
+        self.__max_size = max_size or env('DNASTACK_HTTP_CACHE_MAX_SIZE',
+                                          default=100 * 1024 * 1024,
+                                          transform=int,
+                                          description='The maximum total size (in bytes) of the cached HTTP responses')
+
+    @property
+    def dir_path(self) -> str:
+        return self.__dir_path
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @staticmethod
+    def make_key(url: str, authorization: Optional[str]) -> str:
+        """ Make the key of the response to the GET request to the URL (with the query string) with the credential """
+        principal = hashlib.sha256(authorization.encode('utf-8')).hexdigest() if authorization else 'anonymous'
+        return hashlib.sha256(json.dumps([url, principal]).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        """ Get the entry, either fresh or stale. The entry is marked as recently used. """
+        entry = self.__read_entry(key)
+
+        if entry is None:
+            return None
+
+        try:
+            # NOTE: The modification time of the body file is used as the last access time for the LRU eviction.
+            os.utime(self.__get_body_file_path(key))
+        except FileNotFoundError:
+            return None
+
+        return entry
+
+    @staticmethod
+    def get_conditional_headers(entry: HttpCacheEntry) -> Dict[str, str]:
+        """ The headers to revalidate the entry """
+        headers = dict()
+
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+
+        return headers
+
+    def make_response(self, entry: HttpCacheEntry) -> Optional[Response]:
+        """ Make the response from the entry, or return None if the body is no longer available """
+        try:
+            with open(self.__get_body_file_path(entry.key), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+
+        if len(content) != entry.size:
+            self.remove(entry.key)
+            return None
+
+        response = Response()
+        response.status_code = entry.status_code
+        response.reason = 'OK'
+        response.url = entry.url
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+
+        return response
+
+    def put(self, key: str, response: Response) -> Optional[HttpCacheEntry]:
+        """ Store the response if it is cacheable
+
+            :return: the entry, or None if the response is not cacheable
+        """
+        if response.status_code != 200:
+            return None
+
+        cache_control = _parse_cache_control(response.headers.get('Cache-Control'))
+        if 'no-store' in cache_control or response.headers.get('Vary', '').strip() == '*':
+            return None
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        expires_at = self.__get_expiry(response.headers)
+
+        if not etag and not last_modified and expires_at <= time():
+            # NOTE: The response can neither be revalidated nor used without revalidation.
+            return None
+
+        content = response.content
+        entry = HttpCacheEntry(key=key,
+                               url=response.url,
+                               status_code=response.status_code,
+                               headers={
+                                   name: value
+                                   for name, value in response.headers.items()
+                                   if name.lower() not in _EXCLUDED_HEADER_NAMES
+                               },
+                               etag=etag,
+                               last_modified=last_modified,
+                               stored_at=time(),
+                               expires_at=expires_at,
+                               size=len(content))
+
+        try:
+            os.makedirs(self.__dir_path, exist_ok=True)
+
+            # NOTE: The body is written first so that the entry is never visible without its body.
+            self.__write(self.__get_body_file_path(key), content)
+            self.__write_entry(entry)
+        except OSError as e:
+            self.__logger.warning(f'{key}: Unable to cache the response from {response.url} ({type(e).__name__}: {e})')
+            return None
+
+        self.prune()
+
+        return entry
+
+    def refresh(self, entry: HttpCacheEntry, not_modified_response: Response) -> HttpCacheEntry:
+        """ Update the entry with the headers of the HTTP 304 response """
+        headers = dict(entry.headers)
+        headers.update({
+            name: value
+            for name, value in not_modified_response.headers.items()
+            if name.lower() not in _EXCLUDED_HEADER_NAMES
+        })
+
+        refreshed_entry = entry.copy(update=dict(headers=headers,
+                                                 etag=not_modified_response.headers.get('ETag') or entry.etag,
+                                                 last_modified=(not_modified_response.headers.get('Last-Modified')
+                                                                or entry.last_modified),
+                                                 stored_at=time(),
+                                                 expires_at=self.__get_expiry(CaseInsensitiveDict(headers))))
+
+        try:
+            self.__write_entry(refreshed_entry)
+        except OSError as e:
+            self.__logger.warning(f'{entry.key}: Unable to update the cached response ({type(e).__name__}: {e})')
+
+        return refreshed_entry
+
+    def list_entries(self) -> List[HttpCacheEntry]:
+        return [
+            entry
+            for entry in [self.__read_entry(key) for key in self.__list_keys()]
+            if entry is not None
+        ]
+
+    def size(self) -> int:
+        """ The total size of the cache in bytes """
+        return sum([entry.size for entry in self.list_entries()])
+
+    def prune(self) -> List[str]:
+        """
+        Remove the least recently used entries until the cache fits in the size limit
+
+        :return: the keys of the removed entries
+        """
+        entries = sorted(self.list_entries(), key=lambda e: self.__get_last_used_time(e.key))
+        total_size = sum([entry.size for entry in entries])
+        removed_keys: List[str] = []
+
+        for entry in entries:
+            if total_size <= self.__max_size:
+                break
+
+            self.remove(entry.key)
+            removed_keys.append(entry.key)
+            total_size -= entry.size
+
+        return removed_keys
+
+    def remove(self, key: str):
+        # NOTE: The info file is removed first so that the entry is never visible without its body.
+        self.__remove(self.__get_info_file_path(key))
+        self.__remove(self.__get_body_file_path(key))
+
+    def clear(self) -> int:
+        """ Remove all entries
+
+            :return: the number of removed entries
+        """
+        keys = self.__list_keys()
+        for key in keys:
+            self.remove(key)
+        return len(keys)
+
+    @staticmethod
+    def __get_expiry(headers: CaseInsensitiveDict) -> float:
+        """ The time until which the response is fresh, according to Cache-Control: max-age """
+        cache_control = _parse_cache_control(headers.get('Cache-Control'))
+
+        if 'no-cache' in cache_control or not re.match(r'^\d+$', cache_control.get('max-age') or ''):
+            return 0
+
+        age = headers.get('Age') or '0'
+
+        return time() + int(cache_control['max-age']) - (int(age) if re.match(r'^\d+$', age) else 0)
+
+    def __read_entry(self, key: str) -> Optional[HttpCacheEntry]:
+        try:
+            with open(self.__get_info_file_path(key), 'r') as f:
+                raw_entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if raw_entry.get('version') != CACHE_FORMAT_VERSION:
+            return None
+
+        return HttpCacheEntry(**raw_entry)
+
+    def __write_entry(self, entry: HttpCacheEntry):
+        self.__write(self.__get_info_file_path(entry.key),
+                     json.dumps(dict(version=CACHE_FORMAT_VERSION, **entry.dict())).encode('utf-8'))
+
+    @staticmethod
+    def __write(file_path: str, content: bytes):
+        temp_file_path = f'{file_path}.{os.getpid()}.{time()}.swap'
+        try:
+            with open(temp_file_path, 'wb') as f:
+                f.write(content)
+            os.replace(temp_file_path, file_path)
+        finally:
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+
+    def __get_last_used_time(self, key: str) -> float:
+        try:
+            return os.path.getmtime(self.__get_body_file_path(key))
+        except FileNotFoundError:
+            return 0
+
+    def __list_keys(self) -> List[str]:
+        if not os.path.isdir(self.__dir_path):
+            return []
+
+        return [
+            file_name[:-len(self._INFO_FILE_EXTENSION)]
+            for file_name in os.listdir(self.__dir_path)
+            if file_name.endswith(self._INFO_FILE_EXTENSION)
+        ]
+
+    def __get_body_file_path(self, key: str) -> str:
+        return os.path.join(self.__dir_path, f'{key}{self._BODY_FILE_EXTENSION}')
+
+    def __get_info_file_path(self, key: str) -> str:
+        return os.path.join(self.__dir_path, f'{key}{self._INFO_FILE_EXTENSION}')
+
+    @staticmethod
+    def __remove(file_path: str):
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
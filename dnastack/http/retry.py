@@ -0,0 +1,261 @@
+"""
+Retry policy of the HTTP requests
+
+The requests are retried on the connection errors and on the configured HTTP statuses (by default, HTTP 429 and the
+transient server errors). The delay between the retries follows the "decorrelated jitter" backoff, i.e., every delay
+is randomly chosen between the base delay and three times the previous delay, so that the clients failing at the same
+time do not retry in lockstep. When the server responds with Retry-After, the given delay is used instead, with a
+small random extension.
+
+Only the idempotent methods are retried after the request has been sent, unless the server explicitly rejected the
+request without processing it (by default, HTTP 429).
+
+All retries in the process are limited by the retry budget, i.e., every request deposits a fraction of a retry and
+every retry withdraws one, so that the retries cannot multiply the load on a struggling service.
+"""
+import random
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from time import monotonic, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+from urllib3 import Retry
+from urllib3.exceptions import MaxRetryError, ResponseError
+
+from dnastack.common.environments import env
+from dnastack.common.logger import get_logger
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """ Parse the value of Retry-After (either the number of seconds or the HTTP date) into the number of seconds """
+    value = (value or '').strip()
+
+    if not value:
+        return None
+
+    if value.isdigit():
+        return float(value)
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryBudget:
+    """
+    Thread-safe token bucket limiting the retries of all requests in the process
+
+    :param ratio: The number of retries earned by every request, e.g., 0.2 allows the retries to add up to 20% to the
+                  number of requests.
+    :param min_retries_per_second: The number of retries earned every second regardless of the number of requests so
+                                   that the clients sending few requests can still retry.
+    :param capacity: The maximum number of retries which can be saved up. By default, it is ten seconds worth of the
+                     minimum rate.
+    """
+
+    __default_budget: Optional['RetryBudget'] = None
+    __default_budget_lock = Lock()
+
+    def __init__(self,
+                 ratio: Optional[float] = None,
+                 min_retries_per_second: Optional[float] = None,
+                 capacity: Optional[float] = None):
+        self.__lock = Lock()
+        self.__ratio = ratio if ratio is not None else env('DNASTACK_HTTP_RETRY_BUDGET_RATIO',
+                                                           default=0.2,
+                                                           transform=float,
+                                                           description='Number of retries earned by every HTTP request')
+        self.__min_retries_per_second = (
+            min_retries_per_second
+            if min_retries_per_second is not None
+            else env('DNASTACK_HTTP_RETRY_BUDGET_MIN_PER_SECOND',
+                     default=10,
+                     transform=float,
+                     description='Number of HTTP retries earned every second regardless of the number of requests')
+        )
+        self.__capacity = capacity if capacity is not None else max(self.__min_retries_per_second * 10, 1)
+        self.__balance = self.__capacity
+        self.__last_refilled_time = monotonic()
+
+    @classmethod
+    def get_default(cls) -> 'RetryBudget':
+        """ Get the process-wide budget """
+        with cls.__default_budget_lock:
+            if cls.__default_budget is None:
+                cls.__default_budget = cls()
+            return cls.__default_budget
+
+    @property
+    def balance(self) -> float:
+        with self.__lock:
+            self.__refill()
+            return self.__balance
+
+    def deposit(self):
+        """ Record a request """
+        with self.__lock:
+            self.__refill()
+            self.__balance = min(self.__balance + self.__ratio, self.__capacity)
+
+    def withdraw(self) -> bool:
+        """ Take one retry from the budget
+
+            :return: False if the budget is exhausted, i.e., the request must not be retried.
+        """
+        with self.__lock:
+            self.__refill()
+
+            if self.__balance < 1:
+                return False
+
+            self.__balance -= 1
+            return True
+
+    def __refill(self):
+        # NOTE: This must be called within the lock.
+        now = monotonic()
+        self.__balance = min(self.__balance + (now - self.__last_refilled_time) * self.__min_retries_per_second,
+                             self.__capacity)
+        self.__last_refilled_time = now
+
+
+class RetryPolicy(BaseModel):
+    """ Retry policy of the HTTP requests, configurable per service endpoint """
+
+    max_retries: int = 5
+    """ Maximum number of retries of a request """
+
+    backoff_base: float = 0.5
+    """ Minimum delay (in seconds) before retrying """
+
+    backoff_max: float = 30
+    """ Maximum delay (in seconds) before retrying, unless the server responds with Retry-After """
+
+    retry_on_status: List[int] = [429, 500, 502, 503, 504]
+    """ HTTP statuses of the responses to the idempotent requests to retry """
+
+    idempotent_methods: List[str] = ['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE']
+    """ HTTP methods which can be safely retried after the request has been sent """
+
+    non_idempotent_retry_on_status: List[int] = [429]
+    """ HTTP statuses of the responses to the non-idempotent requests to retry
+
+        The server responds with these statuses without processing the request.
+    """
+
+    respect_retry_after: bool = True
+    """ Wait for the delay given by Retry-After """
+
+    max_retry_after: float = 120
+    """ Maximum delay (in seconds) given by Retry-After to wait for. The request is not retried if the server asks
+        for a longer delay.
+    """
+
+    use_budget: bool = True
+    """ Limit the retries by the process-wide retry budget """
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def is_retryable(self, method: str, status_code: int) -> bool:
+        """ Check if the request with the method is retryable after the response with the status """
+        if self.is_idempotent(method):
+            return status_code in self.retry_on_status
+        return status_code in self.non_idempotent_retry_on_status
+
+    def get_next_backoff(self, previous_backoff: float = 0) -> float:
+        """ The delay before the next retry, based on the delay before the previous retry (decorrelated jitter) """
+        return min(self.backoff_max,
+                   random.uniform(self.backoff_base, max(previous_backoff, self.backoff_base) * 3))
+
+    def get_retry_after_delay(self, retry_after: Optional[str]) -> Optional[float]:
+        """ The delay according to Retry-After
+
+            :return: None if Retry-After is not given or not respected
+        """
+        if not self.respect_retry_after:
+            return None
+
+        delay = parse_retry_after(retry_after)
+
+        if delay is None:
+            return None
+
+        # NOTE: The delay is extended by up to 10% so that the clients told to wait for the same delay do not retry
+        #       at the same time.
+        return delay + random.uniform(0, min(delay * 0.1, 5))
+
+    def exceeds_max_retry_after(self, retry_after: Optional[str]) -> bool:
+        delay = parse_retry_after(retry_after) if self.respect_retry_after else None
+        return delay is not None and delay > self.max_retry_after
+
+    def create_retry(self, budget: Optional[RetryBudget] = None) -> 'PolicyRetry':
+        """ Create the urllib3 retry configuration
+
+            :param budget: The retry budget. By default, it is the process-wide budget.
+        """
+        return PolicyRetry(total=self.max_retries,
+                           status_forcelist=sorted(set(self.retry_on_status + self.non_idempotent_retry_on_status)),
+                           raise_on_status=False,
+                           respect_retry_after_header=self.respect_retry_after,
+                           policy=self,
+                           budget=budget)
+
+
+class PolicyRetry(Retry):
+    """
+    urllib3 retry configuration following the retry policy
+
+    NOTE: When the retries are exhausted, the last response is returned (instead of raising an error) so that the
+          session can report the error response.
+    """
+
+    def __init__(self,
+                 *args,
+                 policy: Optional[RetryPolicy] = None,
+                 budget: Optional[RetryBudget] = None,
+                 backoff: float = 0,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.policy = policy or RetryPolicy()
+        self.budget = budget
+        self.backoff = backoff
+
+    def new(self, **kw) -> 'PolicyRetry':
+        params = dict(policy=self.policy, budget=self.budget, backoff=self.backoff)
+        params.update(kw)
+        return super().new(**params)
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        return bool(self.total) and self.policy.is_retryable(method, status_code)
+
+    def _is_method_retryable(self, method: str) -> bool:
+        return self.policy.is_idempotent(method)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        new_retry = super().increment(method=method,
+                                      url=url,
+                                      response=response,
+                                      error=error,
+                                      _pool=_pool,
+                                      _stacktrace=_stacktrace)
+
+        if response is not None and self.policy.exceeds_max_retry_after(response.headers.get('Retry-After')):
+            raise MaxRetryError(_pool, url, ResponseError(f'Retry-After ({response.headers.get("Retry-After")}) '
+                                                          f'exceeds {self.policy.max_retry_after}s'))
+
+        if self.policy.use_budget and not (self.budget or RetryBudget.get_default()).withdraw():
+            get_logger(type(self).__name__).warning(f'{method} {url}: Not retried as the retry budget is exhausted')
+            raise MaxRetryError(_pool, url, error or ResponseError('retry budget exhausted'))
+
+        new_retry.backoff = self.policy.get_next_backoff(self.backoff)
+
+        return new_retry
+
+    def get_retry_after(self, response) -> Optional[float]:
+        return self.policy.get_retry_after_delay(response.headers.get('Retry-After'))
+
+    def get_backoff_time(self) -> float:
+        return self.backoff if self.history else 0
@@ -1,13 +1,18 @@
+import json
+import logging
 import platform
 import sys
 from contextlib import AbstractContextManager
+from time import perf_counter
 from typing import List, Optional, Any
 from uuid import uuid4
 
 import jwt
 from pydantic import BaseModel
-from requests import Session, Response
+from requests import Session, Response, Request
+from requests.exceptions import RequestException
 
+from dnastack.common.environments import env
 from dnastack.common.events import EventSource
 from dnastack.common.logger import get_logger
 from dnastack.common.tracing import Span
@@ -15,7 +20,10 @@ from dnastack.constants import __version__
 from dnastack.http.authenticators.abstract import Authenticator
 from dnastack.http.authenticators.constants import get_authenticator_log_level
 from dnastack.http.authenticators.oauth2 import OAuth2Authenticator
-from dnastack.http.client_factory import HttpClientFactory
+from dnastack.http.circuit_breaker import CircuitBreakerRegistry
+from dnastack.http.client_factory import HttpClientFactory, HttpTransportRegistry
+from dnastack.http.http_cache import HttpCache, HttpCacheEntry
+from dnastack.http.retry import RetryPolicy
 
 
 class AuthenticationError(RuntimeError):
@@ -83,21 +91,58 @@ class RetryHistoryEntry(BaseModel):
                 f'[ → {self.resolution}]')
 
 
+def format_body_for_log(body: Any, max_size: int) -> str:
+    """ Format the request/response body for the debug log, truncated to the given number of bytes """
+    if body is None or (isinstance(body, (str, bytes)) and len(body) == 0):
+        return '(empty)'
+
+    if isinstance(body, str):
+        # NOTE: Only the part of the text within the budget is encoded.
+        content = body[:max_size].encode('utf-8')
+        truncated = len(body) > max_size or len(content) > max_size
+    elif isinstance(body, bytes):
+        content = body
+        truncated = len(body) > max_size
+    elif isinstance(body, (dict, list)):
+        content = json.dumps(body).encode('utf-8')
+        truncated = len(content) > max_size
+    else:
+        return f'({type(body).__name__})'
+
+    text = content[:max_size].decode('utf-8', errors='replace')
+
+    return f'{text}... (truncated to {max_size}B)' if truncated else text
+
+
 class HttpSession(AbstractContextManager):
     def __init__(self,
                  uuid: Optional[str] = None,
                  authenticators: List[Authenticator] = None,
                  suppress_error: bool = True,
                  enable_auth: bool = True,
-                 session: Optional[Session] = None):
+                 session: Optional[Session] = None,
+                 transport_registry: Optional[HttpTransportRegistry] = None,
+                 log_body_max_size: Optional[int] = None,
+                 http_cache: Optional[HttpCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None):
         super().__init__()
 
         self.__id = uuid or str(uuid4())
         self.__logger = get_logger(f'{type(self).__name__}/{self.__id}')
         self.__authenticators = authenticators
         self.__session: Optional[Session] = session
+        self.__transport_registry = transport_registry
         self.__suppress_error = suppress_error
         self.__enable_auth = enable_auth
+        self.__http_cache = http_cache
+        self.__retry_policy = retry_policy
+        self.__circuit_breakers = circuit_breakers
+        self.__log_body_max_size = log_body_max_size or env('DNASTACK_HTTP_LOG_BODY_MAX_SIZE',
+                                                            default=4096,
+                                                            transform=int,
+                                                            description='Maximum number of bytes of the request and '
+                                                                        'response bodies in the debug log')
 
         # This will inherit event types from
         self.__events = EventSource(['authentication-before',
@@ -130,7 +175,8 @@ class HttpSession(AbstractContextManager):
     @property
     def _session(self) -> Session:
         if not self.__session:
-            self.__session = HttpClientFactory.make()
+            self.__session = HttpClientFactory.make(transport_registry=self.__transport_registry,
+                                                    retry_policy=self.__retry_policy)
             self.__session.headers.update({
                 'User-Agent': self.generate_http_user_agent()
             })
@@ -190,6 +236,21 @@ class HttpSession(AbstractContextManager):
 
         http_method = method.lower()
 
+        cache_key: Optional[str] = None
+        cache_entry: Optional[HttpCacheEntry] = None
+
+        if self.__http_cache and http_method == 'get' and not kwargs.get('stream'):
+            cache_key = self.__http_cache.make_key(Request('GET', url, params=params).prepare().url,
+                                                   (kwargs.get('headers') or dict()).get('Authorization')
+                                                   or session.headers.get('Authorization'))
+            cache_entry = self.__http_cache.get(cache_key)
+
+            if cache_entry and cache_entry.is_fresh():
+                cached_response = self.__http_cache.make_response(cache_entry)
+                if cached_response is not None:
+                    logger.debug(f'HTTP Cache: HIT: {url}')
+                    return cached_response
+
         trace_metadata = {
             'auth_enabled': self.__enable_auth,
             'request': {
@@ -201,16 +262,50 @@ class HttpSession(AbstractContextManager):
         with trace_context.new_span(metadata=trace_metadata) as sub_span:
             sub_logger = sub_span.create_span_logger(logger)
 
-            sub_logger.debug(f'Request/{http_method.upper()} {url}')
+            # NOTE: The bodies are only formatted when the debug log is enabled as the requests in the hot paths, e.g.,
+            #       paging through the query results, may have large bodies.
+            log_body = sub_logger.isEnabledFor(logging.DEBUG)
+
+            if log_body:
+                request_body = kwargs.get('json') if kwargs.get('json') is not None else kwargs.get('data')
+                sub_logger.debug(f'Request/{http_method.upper()} {url}'
+                                 f'\n{format_body_for_log(request_body, self.__log_body_max_size)}')
 
             existing_headers = kwargs.get('headers') or dict()
             existing_headers.update(sub_span.create_http_headers())
             kwargs['headers'] = existing_headers
 
-            response = getattr(session, http_method)(url, **kwargs)
+            if cache_entry:
+                # NOTE: The conditional headers are not passed on to the retries as the cache key may change.
+                conditional_headers = self.__http_cache.get_conditional_headers(cache_entry)
+                response = self.__send(session,
+                                       http_method,
+                                       url,
+                                       **dict(kwargs, headers={**existing_headers, **conditional_headers}))
+            else:
+                response = self.__send(session, http_method, url, **kwargs)
 
-            sub_logger.debug(f'HTTP {response.status_code} {method} {url} ({len(response.text)}B)'
-                             f'\n{response.text}')
+            if log_body:
+                if kwargs.get('stream'):
+                    # NOTE: Reading the streamed body here would consume it before the caller does.
+                    sub_logger.debug(f'HTTP {response.status_code} {method} {url} (streamed)')
+                else:
+                    sub_logger.debug(f'HTTP {response.status_code} {method} {url} ({len(response.content)}B)'
+                                     f'\n{format_body_for_log(response.content, self.__log_body_max_size)}')
+
+            if cache_key:
+                if response.status_code == 304 and cache_entry:
+                    cached_response = self.__http_cache.make_response(self.__http_cache.refresh(cache_entry, response))
+
+                    if cached_response is not None:
+                        sub_logger.debug(f'HTTP Cache: REVALIDATED: {url}')
+                        response = cached_response
+                    else:
+                        # NOTE: The cached body has been removed since the entry was read.
+                        response = self.__send(session, http_method, url, **kwargs)
+                        self.__http_cache.put(cache_key, response)
+                else:
+                    self.__http_cache.put(cache_key, response)
 
         if response.ok:
             return response
@@ -223,7 +318,9 @@ class HttpSession(AbstractContextManager):
 
             if self.__enable_auth:
                 fallback_logger = trace_context.create_span_logger(logger, get_authenticator_log_level())
-                fallback_logger.debug(f'HTTP {status_code}: {method} {url}\n{response.text}')
+                if fallback_logger.isEnabledFor(logging.DEBUG):
+                    fallback_logger.debug(f'HTTP {status_code}: {method} {url}'
+                                          f'\n{format_body_for_log(response.text, self.__log_body_max_size)}')
 
                 if status_code == 401 and authenticator:
                     authenticator.clear_access_token()
@@ -278,6 +375,31 @@ class HttpSession(AbstractContextManager):
                                        trace_context=trace_context)
         # End if response is not OK.
 
+    def __send(self, session: Session, http_method: str, url: str, **kwargs) -> Response:
+        """ Send the request through the circuit breaker of the host, if enabled """
+        if not self.__circuit_breakers:
+            return getattr(session, http_method)(url, **kwargs)
+
+        circuit_breaker = self.__circuit_breakers.get(url)
+        circuit_breaker.before_call()
+
+        started_time = perf_counter()
+
+        try:
+            response = getattr(session, http_method)(url, **kwargs)
+        except RequestException as e:
+            self.__circuit_breakers.record(circuit_breaker, f'{type(e).__name__}: {e}', perf_counter() - started_time)
+            raise
+        except BaseException:
+            # NOTE: The other errors, e.g., KeyboardInterrupt, say nothing about the health of the host.
+            circuit_breaker.release()
+            raise
+
+        self.__circuit_breakers.record(circuit_breaker,
+                                       f'HTTP {response.status_code}' if response.status_code >= 500 else None,
+                                       perf_counter() - started_time)
+        return response
+
     def get(self, url, trace_context: Optional[Span] = None, **kwargs) -> Response:
         return self.submit(method='get',
                            url=url,
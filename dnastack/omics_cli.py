@@ -6,10 +6,12 @@ import click
 import dnastack.cli.commands.workbench.utils as workbench_utils
 from dnastack.alpha.cli.commands import alpha_command_group
 from dnastack.cli.commands.auth import auth_command_group
+from dnastack.cli.commands.cache import cache_command_group
 from dnastack.cli.commands.collections import collections_command_group
 from dnastack.cli.commands.config import config_command_group
 from dnastack.cli.commands.config.contexts import contexts_command_group, ContextCommandHandler
 from dnastack.cli.commands.dataconnect import data_connect_command_group
+from dnastack.cli.commands.debug import debug_command_group
 from dnastack.cli.commands.drs import drs_command_group
 from dnastack.cli.commands.publisher import publisher_command_group
 from dnastack.cli.commands.workbench import workbench_command_group
@@ -109,6 +111,10 @@ omics.add_command(alpha_command_group)
 omics.add_command(publisher_command_group)
 # noinspection PyTypeChecker
 omics.add_command(workbench_command_group)
+# noinspection PyTypeChecker
+omics.add_command(cache_command_group)
+# noinspection PyTypeChecker
+omics.add_command(debug_command_group)
 
 
 if __name__ == "__main__":
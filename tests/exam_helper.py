@@ -8,6 +8,7 @@ import time
 from abc import abstractmethod
 from contextlib import contextmanager
 from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pprint import pformat
 from subprocess import call
 from threading import Lock, Thread
@@ -120,6 +121,39 @@ def make_mock_response(status_code: int,
     return mock_response
 
 
+def make_mock_page(rows: List[Dict[str, Any]],
+                   next_page_url: Optional[str] = None,
+                   data_model: Optional[Dict[str, Any]] = None,
+                   errors: Optional[List[Dict[str, Any]]] = None) -> Response:
+    """ Make the mock response of a page of a Data Connect query result """
+    return make_mock_response(200,
+                              json_data=dict(data=rows,
+                                             data_model=data_model or dict(),
+                                             pagination=dict(next_page_url=next_page_url),
+                                             errors=errors))
+
+
+class LocalHttpServer:
+    """ Local HTTP server handling the requests on a background thread, used as a context manager """
+
+    def __init__(self, handler_class: Type[BaseHTTPRequestHandler]):
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__server.shutdown()
+        self.__server.server_close()
+
+
 class CallableProxy():
     def __init__(self, operation: Callable, args, kwargs):
         self.operation = operation
@@ -0,0 +1,285 @@
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import TestCase, skipUnless
+from unittest.mock import MagicMock, patch
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    # NOTE: pyarrow is an optional dependency (see the "arrow" extra).
+    pa = None
+
+from dnastack.alpha.app.publisher_helper.filter import FilterOperation
+from dnastack.cli.commands.dataconnect.utils import handle_query
+from dnastack.client.data_connect import DataConnectClient, QueryLoader
+from dnastack.client.models import ServiceEndpoint
+from dnastack.client.data_connect_arrow import iterate_record_batches, to_arrow_table, to_data_frame, \
+    write_record_batches
+from dnastack.common.exceptions import DependencyError
+from dnastack.http.session import HttpSession
+from tests.exam_helper import make_mock_page
+
+DATA_MODEL = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string'},
+        'count': {'type': 'string', 'format': 'bigint'},
+        'price': {'type': 'string', 'format': 'decimal'},
+        'born_on': {'type': 'string', 'format': 'date'},
+        'updated_at': {'type': 'string', 'format': 'timestamp with time zone'},
+        'duration': {'type': 'string', 'format': 'interval day to second'},
+        'tags': {'type': 'array', 'items': {'type': 'string'}},
+        'nested': {
+            'type': 'object',
+            'properties': {
+                'score': {'type': 'number'},
+            }
+        },
+    }
+}
+
+
+def make_row(i: int):
+    return {
+        'id': f'row-{i}',
+        'count': str(i),
+        'price': '12.50',
+        'born_on': '2020-01-31',
+        'updated_at': '2022-03-04T05:06:07.123Z',
+        'duration': 'P1DT2H3M4S',
+        'tags': ['a', 'b'],
+        'nested': {'score': 1},
+    }
+
+
+def make_loader(mock_session: HttpSession) -> QueryLoader:
+    return QueryLoader('https://dc.test/search', query='SELECT 1', http_session=mock_session)
+
+
+@skipUnless(pa, 'pyarrow is not installed')
+class TestUnit(TestCase):
+    def test_one_record_batch_per_page(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([make_row(1), make_row(2)],
+                                                        'https://dc.test/search/page-2',
+                                                        data_model=DATA_MODEL)
+        mock_session.get.return_value = make_mock_page([make_row(3)], data_model=DATA_MODEL)
+
+        batches = list(iterate_record_batches(make_loader(mock_session)))
+
+        self.assertEqual([batch.num_rows for batch in batches], [2, 1])
+        mock_session.close.assert_called_once()
+
+        table = to_arrow_table(batches)
+        self.assertEqual(table.schema.field('count').type, pa.int64())
+        self.assertEqual(table.schema.field('price').type, pa.float64())
+        self.assertEqual(table.schema.field('born_on').type, pa.date32())
+        self.assertEqual(table.schema.field('updated_at').type, pa.timestamp('us', tz='UTC'))
+        self.assertEqual(table.schema.field('duration').type, pa.duration('us'))
+        self.assertEqual(table.schema.field('tags').type, pa.list_(pa.string()))
+        self.assertEqual(table.schema.field('nested').type, pa.struct([('score', pa.float64())]))
+
+        first_row = table.slice(0, 1).to_pylist()[0]
+        self.assertEqual(first_row['id'], 'row-1')
+        self.assertEqual(first_row['count'], 1)
+        self.assertEqual(first_row['price'], 12.5)
+        self.assertEqual(first_row['born_on'], date(2020, 1, 31))
+        self.assertEqual(first_row['updated_at'], datetime(2022, 3, 4, 5, 6, 7, 123000, tzinfo=timezone.utc))
+        self.assertEqual(first_row['duration'], timedelta(days=1, hours=2, minutes=3, seconds=4))
+        self.assertEqual(first_row['tags'], ['a', 'b'])
+        self.assertEqual(first_row['nested'], {'score': 1.0})
+
+    def test_decimal_as_decimal128(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([make_row(1)], data_model=DATA_MODEL)
+
+        table = to_arrow_table(iterate_record_batches(make_loader(mock_session), decimal_as='decimal'))
+
+        self.assertIsInstance(table.schema.field('price').type, pa.Decimal128Type)
+        self.assertEqual(table.column('price').to_pylist(), [Decimal('12.50')])
+
+    def test_signed_numbers(self):
+        rows = [dict(make_row(1), count='-5', price='-0.25'), dict(make_row(2), count='+7', price='3')]
+
+        for decimal_as, expected_prices in [('float', [-0.25, 3.0]), ('decimal', [Decimal('-0.25'), Decimal('3')])]:
+            with self.subTest(decimal_as):
+                mock_session = MagicMock(HttpSession)
+                mock_session.post.return_value = make_mock_page(rows, data_model=DATA_MODEL)
+
+                table = to_arrow_table(iterate_record_batches(make_loader(mock_session), decimal_as=decimal_as))
+
+                self.assertEqual(table.column('count').to_pylist(), [-5, 7])
+                self.assertEqual(table.column('price').to_pylist(), expected_prices)
+
+    def test_decimal_scale(self):
+        # Without the scale in the data model, the scale is adjusted to the first page.
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(make_row(1), price='0.123456789012')],
+                                                        'https://dc.test/search/page-2',
+                                                        data_model=DATA_MODEL)
+        mock_session.get.return_value = make_mock_page([dict(make_row(2), price='1.5')], data_model=DATA_MODEL)
+
+        table = to_arrow_table(iterate_record_batches(make_loader(mock_session), decimal_as='decimal'))
+
+        self.assertEqual(table.schema.field('price').type, pa.decimal128(38, 12))
+        self.assertEqual(table.column('price').to_pylist(), [Decimal('0.123456789012'), Decimal('1.5')])
+
+        # The scale from the data model is used as it is.
+        data_model = dict(DATA_MODEL, properties=dict(DATA_MODEL['properties'],
+                                                      price=dict(type='string', format='decimal', precision=10,
+                                                                 scale=2)))
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([make_row(1)], data_model=data_model)
+
+        table = to_arrow_table(iterate_record_batches(make_loader(mock_session), decimal_as='decimal'))
+
+        self.assertEqual(table.schema.field('price').type, pa.decimal128(10, 2))
+
+    def test_decimal_values_not_fitting(self):
+        # The column falls back to strings when the values of the following pages do not fit.
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([make_row(1)],
+                                                        'https://dc.test/search/page-2',
+                                                        data_model=DATA_MODEL)
+        mock_session.get.return_value = make_mock_page([dict(make_row(2), price='0.123456789012345')],
+                                                       data_model=DATA_MODEL)
+
+        table = to_arrow_table(iterate_record_batches(make_loader(mock_session), decimal_as='decimal'))
+
+        self.assertEqual(table.schema.field('price').type, pa.string())
+        self.assertEqual([Decimal(v) for v in table.column('price').to_pylist()],
+                         [Decimal('12.5'), Decimal('0.123456789012345')])
+
+        df = to_data_frame(table)
+        self.assertEqual(df['count'].tolist(), [1, 2])
+
+        # The values of the first page are too large for decimal128 even with the adjusted scale.
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(make_row(1), price='1' * 30 + '.' + '1' * 10)],
+                                                        data_model=DATA_MODEL)
+
+        table = to_arrow_table(iterate_record_batches(make_loader(mock_session), decimal_as='decimal'))
+
+        self.assertEqual(table.column('price').to_pylist(), ['1' * 30 + '.' + '1' * 10])
+
+    def test_empty_result_keeps_the_schema(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([], data_model=DATA_MODEL)
+
+        table = to_arrow_table(iterate_record_batches(make_loader(mock_session)))
+
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.column_names, list(DATA_MODEL['properties'].keys()))
+
+    def test_schema_is_inferred_without_data_model(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(i=1, s='a')],
+                                                        'https://dc.test/search/page-2',
+                                                        data_model=dict())
+        mock_session.get.return_value = make_mock_page([dict(i=2, s='b')], data_model=dict())
+
+        table = to_arrow_table(iterate_record_batches(make_loader(mock_session)))
+
+        self.assertEqual(table.to_pylist(), [dict(i=1, s='a'), dict(i=2, s='b')])
+
+    def test_to_data_frame(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([make_row(1), make_row(2)], data_model=DATA_MODEL)
+
+        df = to_data_frame(to_arrow_table(iterate_record_batches(make_loader(mock_session))))
+
+        self.assertEqual(list(df.columns), list(DATA_MODEL['properties'].keys()))
+        self.assertEqual(df['count'].tolist(), [1, 2])
+        self.assertEqual(str(df['count'].dtype), 'int64')
+
+    def test_publisher_data_frame(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.get.return_value = make_mock_page([make_row(1), make_row(2)], data_model=DATA_MODEL)
+
+        with patch('dnastack.alpha.app.publisher_helper.filter.HttpSession', return_value=mock_session):
+            operation = FilterOperation('https://dc.test/search')
+
+            # The decimal values are kept exact by default.
+            df = operation.to_data_frame()
+            self.assertEqual(df['price'].tolist(), [Decimal('12.50'), Decimal('12.50')])
+
+            # Without pyarrow, the data frame is built from the rows.
+            with patch('dnastack.alpha.app.publisher_helper.filter.import_pyarrow',
+                       side_effect=DependencyError('pyarrow')):
+                df = operation.to_data_frame()
+            self.assertEqual(df['price'].tolist(), [Decimal('12.50'), Decimal('12.50')])
+            self.assertEqual(df['count'].tolist(), [1, 2])
+
+    def test_write_record_batches(self):
+        readers = {
+            'parquet': pq.read_table,
+            'feather': feather.read_table,
+            'arrow-ipc': lambda path: pa.ipc.open_stream(path).read_all(),
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for file_format, read_table in readers.items():
+                with self.subTest(file_format):
+                    mock_session = MagicMock(HttpSession)
+                    mock_session.post.return_value = make_mock_page([make_row(1), make_row(2)],
+                                                                    'https://dc.test/search/page-2',
+                                                                    data_model=DATA_MODEL)
+                    mock_session.get.return_value = make_mock_page([make_row(3)], data_model=DATA_MODEL)
+                    file_path = os.path.join(temp_dir, f'result.{file_format}')
+
+                    row_count = write_record_batches(iterate_record_batches(make_loader(mock_session),
+                                                                            decimal_as='string'),
+                                                     file_path,
+                                                     file_format)
+
+                    table = read_table(file_path)
+                    self.assertEqual(row_count, 3)
+                    self.assertEqual(table.column('id').to_pylist(), ['row-1', 'row-2', 'row-3'])
+                    self.assertEqual(table.column('price').to_pylist(), ['12.50', '12.50', '12.50'])
+                    self.assertEqual(table.schema.field('count').type, pa.int64())
+
+        # Each page becomes one row group.
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mock_session = MagicMock(HttpSession)
+            mock_session.post.return_value = make_mock_page([make_row(1)],
+                                                            'https://dc.test/search/page-2',
+                                                            data_model=DATA_MODEL)
+            mock_session.get.return_value = make_mock_page([make_row(2)], data_model=DATA_MODEL)
+            file_path = os.path.join(temp_dir, 'result.parquet')
+
+            write_record_batches(iterate_record_batches(make_loader(mock_session)), file_path, 'parquet')
+
+            self.assertEqual(pq.ParquetFile(file_path).num_row_groups, 2)
+
+    def test_export_decimal_types(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([make_row(1), make_row(2)], data_model=DATA_MODEL)
+        client = DataConnectClient.make(ServiceEndpoint(id='dc', url='https://dc.test/'))
+        client.create_http_session = lambda *args, **kwargs: mock_session
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'result.parquet')
+
+            # The columnar formats keep the decimal values exact by default.
+            handle_query(client, 'SELECT 1', output_format='parquet', output_file=file_path)
+            table = pq.read_table(file_path)
+            self.assertTrue(pa.types.is_decimal(table.schema.field('price').type))
+            self.assertEqual(table.column('price').to_pylist(), [Decimal('12.50'), Decimal('12.50')])
+
+            handle_query(client, 'SELECT 1', decimal_as='string', output_format='parquet', output_file=file_path)
+            self.assertEqual(pq.read_table(file_path).schema.field('price').type, pa.string())
+
+    def test_write_empty_result(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mock_session = MagicMock(HttpSession)
+            mock_session.post.return_value = make_mock_page([], data_model=DATA_MODEL)
+            file_path = os.path.join(temp_dir, 'result.parquet')
+
+            row_count = write_record_batches(iterate_record_batches(make_loader(mock_session)), file_path, 'parquet')
+
+            self.assertEqual(row_count, 0)
+            self.assertEqual(pq.read_table(file_path).column_names, list(DATA_MODEL['properties'].keys()))
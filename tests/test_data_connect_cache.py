@@ -0,0 +1,138 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime, time as time_of_day, timedelta, timezone
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from dnastack.client.data_connect import DataConnectClient
+from dnastack.client.data_connect_cache import CachedResultLoader, QueryResultCache
+from dnastack.client.models import ServiceEndpoint
+from dnastack.http.session import HttpSession
+from tests.exam_helper import make_mock_page
+
+DATA_MODEL = {
+    'type': 'object',
+    'properties': {
+        'i': {'type': 'integer'},
+        'price': {'type': 'string', 'format': 'decimal'},
+    }
+}
+
+
+class TestUnit(TestCase):
+    def setUp(self) -> None:
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.cache = QueryResultCache(dir_path=self.__temp_dir.name, max_size=1024 * 1024)
+        self.mock_session = MagicMock(HttpSession)
+        self.client = DataConnectClient.make(ServiceEndpoint(id='dc', url='https://dc.test/'))
+        self.client.query_cache = self.cache
+        self.client.create_http_session = lambda *args, **kwargs: self.mock_session
+
+    def tearDown(self) -> None:
+        self.__temp_dir.cleanup()
+
+    def test_cached_result_is_reused(self):
+        self.mock_session.post.return_value = make_mock_page([dict(i=1, price='1.50')],
+                                                             'https://dc.test/search/p2',
+                                                             data_model=DATA_MODEL)
+        self.mock_session.get.return_value = make_mock_page([dict(i=2, price='2.50')], data_model=DATA_MODEL)
+
+        first_result = list(self.client.query('SELECT * FROM t', cache_ttl=60))
+        second_result = list(self.client.query('  SELECT *\n  FROM t;', cache_ttl=60))
+
+        self.assertEqual(second_result, first_result)
+        self.assertEqual([str(row['price']) for row in second_result], ['1.50', '2.50'])
+        self.assertEqual(self.mock_session.post.call_count, 1)
+        self.assertEqual(self.mock_session.get.call_count, 1)
+
+        entries = self.cache.list_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].row_count, 2)
+        self.assertEqual(entries[0].query, 'SELECT * FROM t')
+        self.assertEqual(entries[0].data_model, DATA_MODEL)
+
+        # Without the TTL, the cache is not used.
+        self.mock_session.post.return_value = make_mock_page([dict(i=3, price='3.50')], data_model=DATA_MODEL)
+        self.assertEqual([row['i'] for row in self.client.query('SELECT * FROM t')], [3])
+
+    def test_typed_values_are_restored(self):
+        page = [
+            dict(price=Decimal('-12.50'),
+                 day=date(2022, 3, 4),
+                 at=datetime(2022, 3, 4, 5, 6, 7, 890, tzinfo=timezone(timedelta(hours=-5))),
+                 clock=time_of_day(5, 6, 7),
+                 duration=timedelta(days=1, seconds=2, microseconds=3),
+                 raw=b'\x00\xff',
+                 tags=['a', None, 1.5, True],
+                 nested={'$decimal': 'not a decimal', '$$x': 1}),
+        ]
+
+        writer = self.cache.open_writer('https://dc.test/', 'SELECT 1', 'anonymous', 60)
+        writer.write(page)
+        writer.commit()
+
+        key = QueryResultCache.make_key('https://dc.test/', 'SELECT 1', 'anonymous')
+        with gzip.open(os.path.join(self.__temp_dir.name, f'{key}.pages'), 'rt') as f:
+            self.assertEqual(json.loads(f.readline())[0]['price'], {'$decimal': '-12.50'})
+
+        loader = CachedResultLoader(self.cache, self.cache.get(key))
+        self.assertEqual(loader.load(), page)
+        self.assertFalse(loader.has_more())
+
+    def test_key_includes_endpoint_and_principal(self):
+        key = QueryResultCache.make_key('https://dc.test/', 'SELECT 1', 'anonymous')
+
+        self.assertEqual(key, QueryResultCache.make_key('https://dc.test/', ' SELECT  1 ; ', 'anonymous'))
+        self.assertNotEqual(key, QueryResultCache.make_key('https://dc.test/', 'SELECT 1', 'someone'))
+        self.assertNotEqual(key, QueryResultCache.make_key('https://other.test/', 'SELECT 1', 'anonymous'))
+        self.assertNotEqual(key, QueryResultCache.make_key('https://dc.test/', 'SELECT 2', 'anonymous'))
+
+    def test_incomplete_result_is_not_cached(self):
+        # Closed before all pages are loaded
+        self.mock_session.post.return_value = make_mock_page([dict(i=1, price='1.50')],
+                                                             'https://dc.test/search/p2',
+                                                             data_model=DATA_MODEL)
+        iterator = self.client.query('SELECT * FROM t', cache_ttl=60)
+        next(iterator)
+        iterator.close()
+
+        # Interrupted by an error from the server
+        self.mock_session.get.return_value = make_mock_page([], data_model=DATA_MODEL, errors=[dict(title='Boom')])
+        list(self.client.query('SELECT * FROM t', cache_ttl=60))
+
+        self.assertEqual(self.cache.list_entries(), [])
+        self.assertEqual([file_name for file_name in os.listdir(self.__temp_dir.name)], [])
+
+    def test_expired_result_is_not_used(self):
+        self.mock_session.post.return_value = make_mock_page([dict(i=1, price='1.50')], data_model=DATA_MODEL)
+
+        list(self.client.query('SELECT * FROM t', cache_ttl=0.1))
+        time.sleep(0.2)
+        list(self.client.query('SELECT * FROM t', cache_ttl=60))
+
+        self.assertEqual(self.mock_session.post.call_count, 2)
+
+    def test_prune_evicts_least_recently_used_entries(self):
+        keys = []
+        for i in range(3):
+            writer = self.cache.open_writer('https://dc.test/', f'SELECT {i}', 'anonymous', 60)
+            writer.write([dict(i=i)])
+            writer.commit()
+            keys.append(QueryResultCache.make_key('https://dc.test/', f'SELECT {i}', 'anonymous'))
+
+        for offset, key in enumerate([keys[1], keys[0], keys[2]]):
+            os.utime(os.path.join(self.__temp_dir.name, f'{key}.pages'), (1000 + offset, 1000 + offset))
+
+        entry_sizes = {entry.key: entry.size for entry in self.cache.list_entries()}
+        removed_entries = QueryResultCache(dir_path=self.__temp_dir.name,
+                                           max_size=entry_sizes[keys[0]] + entry_sizes[keys[2]]).prune()
+
+        self.assertEqual([e.key for e in removed_entries], [keys[1]])
+        self.assertEqual(sorted([e.key for e in self.cache.list_entries()]), sorted([keys[0], keys[2]]))
+
+        self.assertEqual(self.cache.clear(), 2)
+        self.assertEqual(self.cache.list_entries(), [])
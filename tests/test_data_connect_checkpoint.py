@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from dnastack.cli.commands.dataconnect.utils import handle_query
+from dnastack.client.data_connect import DataConnectClient
+from dnastack.client.models import ServiceEndpoint
+from dnastack.http.session import HttpSession
+from tests.exam_helper import make_mock_page
+
+QUERY = 'SELECT * FROM t'
+
+
+class TestUnit(TestCase):
+    def setUp(self) -> None:
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_file = os.path.join(self.__temp_dir.name, 'query.checkpoint')
+
+    def tearDown(self) -> None:
+        self.__temp_dir.cleanup()
+
+    def test_resumed_json_output_continues_interrupted_output(self):
+        first_output, second_output = self._interrupt_and_resume('json')
+
+        self.assertEqual(json.loads(first_output + second_output), [dict(i=i) for i in range(1, 6)])
+
+    def test_resumed_csv_output_has_no_header(self):
+        first_output, second_output = self._interrupt_and_resume('csv')
+
+        self.assertFalse(second_output.startswith('i'))
+        self.assertEqual(list(csv.reader(io.StringIO(first_output + second_output))),
+                         [['i']] + [[str(i)] for i in range(1, 6)])
+
+    def _interrupt_and_resume(self, output_format: str):
+        # The first run is interrupted while loading the third page.
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(i=1), dict(i=2)], 'https://dc.test/search/p2')
+        mock_session.get.side_effect = [make_mock_page([dict(i=3)], 'https://dc.test/search/p3'),
+                                        RuntimeError('Connection lost')]
+
+        first_output = io.StringIO()
+        with redirect_stdout(first_output):
+            with self.assertRaisesRegex(RuntimeError, 'Connection lost'):
+                handle_query(self._make_client(mock_session), QUERY, output_format=output_format,
+                             checkpoint_file=self.checkpoint_file)
+        self.assertTrue(os.path.exists(self.checkpoint_file))
+
+        # The second run only loads the remaining pages.
+        mock_session = MagicMock(HttpSession)
+        mock_session.get.side_effect = [make_mock_page([dict(i=4), dict(i=5)])]
+
+        second_output = io.StringIO()
+        with redirect_stdout(second_output):
+            handle_query(self._make_client(mock_session), QUERY, output_format=output_format,
+                         checkpoint_file=self.checkpoint_file)
+        mock_session.post.assert_not_called()
+        self.assertEqual(mock_session.get.call_args[0][0], 'https://dc.test/search/p3')
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+        return first_output.getvalue(), second_output.getvalue()
+
+    @staticmethod
+    def _make_client(mock_session: HttpSession) -> DataConnectClient:
+        client = DataConnectClient.make(ServiceEndpoint(id='dc', url='https://dc.test/'))
+        client.create_http_session = lambda *args, **kwargs: mock_session
+        return client
@@ -0,0 +1,157 @@
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from time import perf_counter
+from typing import Any, Dict, List
+from unittest import TestCase
+
+from dnastack.client.data_connect import QueryLoader
+from dnastack.common.environments import flag
+from dnastack.common.logger import get_logger
+
+DATA_MODEL = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string'},
+        'count': {'type': 'string', 'format': 'bigint'},
+        'price': {'type': 'string', 'format': 'decimal'},
+        'born_on': {'type': 'string', 'format': 'date'},
+        'alarm': {'type': 'string', 'format': 'time with time zone'},
+        'updated_at': {'type': 'string', 'format': 'timestamp with time zone'},
+        'duration': {'type': 'string', 'format': 'interval day to second'},
+        'tags': {'type': 'array', 'items': {'type': 'string'}},
+        'dates': {'type': 'array', 'items': {'type': 'string', 'format': 'date'}},
+        'nested': {
+            'type': 'object',
+            'properties': {
+                'when': {'type': 'string', 'format': 'timestamp'},
+                'note': {'type': 'string'},
+            }
+        },
+    }
+}
+
+
+def make_row(i: int) -> Dict[str, Any]:
+    return {
+        'id': f'row-{i}',
+        'count': str(i),
+        'price': '12.50',
+        'born_on': '2020-01-31',
+        'alarm': '10:20:30+02',
+        'updated_at': '2022-03-04T05:06:07.123Z',
+        'duration': 'P1DT2H3M4S',
+        'tags': ['a', 'b'],
+        'dates': ['2021-02-03', None],
+        'nested': {'when': '2021-02-03 04:05:06', 'note': 'n'},
+    }
+
+
+class TestUnit(TestCase):
+    def test_compiled_converter(self):
+        converter = QueryLoader.compile_converter(DATA_MODEL)
+        row = make_row(7)
+
+        converted = converter(row)
+
+        self.assertEqual(list(converted.keys()), list(row.keys()), 'The order of the properties must be preserved.')
+        self.assertEqual(converted['id'], 'row-7')
+        self.assertEqual(converted['count'], 7)
+        self.assertEqual(converted['price'], Decimal('12.50'))
+        self.assertEqual(converted['born_on'], date(2020, 1, 31))
+        self.assertEqual(converted['alarm'], time(10, 20, 30, tzinfo=timezone(timedelta(hours=2))))
+        self.assertEqual(converted['updated_at'], datetime(2022, 3, 4, 5, 6, 7, 123000, tzinfo=timezone.utc))
+        self.assertEqual(converted['duration'], timedelta(days=1, hours=2, minutes=3, seconds=4))
+        self.assertEqual(converted['tags'], ['a', 'b'])
+        self.assertEqual(converted['dates'], [date(2021, 2, 3), None])
+        self.assertEqual(converted['nested'], {'when': datetime(2021, 2, 3, 4, 5, 6), 'note': 'n'})
+
+        # The original row is not modified.
+        self.assertEqual(row['count'], '7')
+
+    def test_unmatched_values_are_returned_as_is(self):
+        converter = QueryLoader.compile_converter(DATA_MODEL)
+
+        converted = converter({'count': 'n/a', 'alarm': 'noon', 'extra': '1'})
+
+        self.assertEqual(converted, {'count': 'n/a', 'alarm': 'noon', 'extra': '1'})
+
+    def test_no_op_fast_path(self):
+        self.assertIsNone(QueryLoader.compile_converter(dict()))
+        self.assertIsNone(QueryLoader.compile_converter({
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'string'},
+                'tags': {'type': 'array', 'items': {'type': 'string'}},
+                'score': {'type': 'number'},
+            }
+        }))
+
+
+class TestBenchmark(TestCase):
+    _logger = get_logger('lib/benchmark', logging.INFO)
+
+    def setUp(self) -> None:
+        if not flag('BENCHMARK_ENABLED'):
+            self.skipTest('Disabled. Set BENCHMARK_ENABLED=true to enable.')
+
+    def test_row_conversion(self):
+        rows = [make_row(i) for i in range(50000)]
+
+        legacy_start_time = perf_counter()
+        legacy_result = [_legacy_remap_obj(DATA_MODEL, row) for row in rows]
+        legacy_duration = perf_counter() - legacy_start_time
+
+        compiled_start_time = perf_counter()
+        converter = QueryLoader.compile_converter(DATA_MODEL)
+        compiled_result = [converter(row) for row in rows]
+        compiled_duration = perf_counter() - compiled_start_time
+
+        self.assertEqual(compiled_result, legacy_result)
+        self._logger.info(f'Converted {len(rows)} rows: legacy remapper = {legacy_duration:.3f}s, '
+                          f'compiled converter = {compiled_duration:.3f}s '
+                          f'({legacy_duration / compiled_duration:.1f}x)')
+
+
+def _legacy_remap_array(schema: Dict[str, Any], array: List[Any]) -> List[Any]:
+    """ The per-row schema walk used before the converters were compiled (reference for the benchmark) """
+    if not schema:
+        return array
+    else:
+        return [_legacy_remap_obj(schema, row) for row in array]
+
+
+def _legacy_remap_obj(schema: Dict[str, Any], obj: Any) -> Any:
+    if not schema:
+        return obj
+
+    obj_types = (
+        ([schema['type']] if isinstance(schema['type'], str) else schema['type'])
+        if 'type' in schema
+        else ['object']
+    )
+
+    if obj is None:
+        return None
+    if 'array' in obj_types and isinstance(obj, (tuple, list)):
+        return _legacy_remap_array(schema['items'], obj)
+    elif 'object' in obj_types and isinstance(obj, dict):
+        if schema.get('properties'):
+            return {
+                property_name: (
+                    _legacy_remap_obj(schema['properties'][property_name], property_value)
+                    if property_name in schema['properties'] and schema['properties'][property_name]
+                    else property_value
+                )
+                for property_name, property_value in obj.items()
+            }
+        else:
+            return obj
+    else:
+        for mapper_group in QueryLoader._data_mapper_groups:
+            if not mapper_group.can_handle(obj_types, schema.get('format')):
+                continue
+            for mapper in mapper_group.mappers:
+                if mapper.can_handle(obj):
+                    return mapper.map(obj)
+        return obj
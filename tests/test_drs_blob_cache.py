@@ -0,0 +1,163 @@
+import base64
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+from time import time
+from unittest import TestCase
+
+from dnastack.client.drs_blob_cache import BlobCache, link_file
+from tests import test_drs_download
+from tests.test_drs_download import FileServer
+
+
+class TestUnit(TestCase):
+    content = os.urandom(256 * 1024)
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = BlobCache(os.path.join(self.temp_dir, 'cache'), max_size=1024 * 1024)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def test_make_key(self):
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        md5 = hashlib.md5(self.content)
+
+        self.assertEqual(BlobCache.make_key('drs://a/aa', 'v1', 10, [('md5', md5.hexdigest()), ('SHA-256', sha256)]),
+                         f'sha256-{sha256}-10')
+        self.assertEqual(BlobCache.make_key('drs://a/aa', 'v1', 10, [('md5', base64.b64encode(md5.digest()).decode())]),
+                         f'md5-{md5.hexdigest()}-10')
+
+        # Without the checksum usable as the content address, the key depends on the DRS URL and the version.
+        fallback_key = BlobCache.make_key('drs://a/aa', 'v1', 10, [('crc32c', 'abcd1234')])
+        self.assertTrue(fallback_key.startswith('drs-'))
+        self.assertNotEqual(BlobCache.make_key('drs://a/aa', 'v2', 10, []), fallback_key)
+
+    def test_put_and_link(self):
+        key = BlobCache.make_key('drs://a/aa', 'v1', len(self.content), [('sha256', self._sha256(self.content))])
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertTrue(self.cache.put_data(key, self.content))
+        self.assertEqual(self.cache.read(key), self.content)
+
+        destination_path = os.path.join(self.temp_dir, 'output.bin')
+        self.assertTrue(self.cache.link_to(key, destination_path))
+        with open(destination_path, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        self.assertFalse(self.cache.link_to('sha256-missing-1', destination_path))
+
+        # The content not matching the checksum in the key is not cached.
+        other_key = BlobCache.make_key('drs://a/bb', 'v1', len(self.content), [('md5', 'ab' * 16)])
+        self.assertFalse(self.cache.put_data(other_key, self.content))
+        self.assertTrue(self.cache.put_data(other_key, self.content, verified=True))
+
+        # The content with the wrong size is never cached.
+        self.assertFalse(self.cache.put_data(other_key, self.content[1:], verified=True))
+
+    def test_evict_least_recently_used_blobs(self):
+        keys = []
+
+        for i in range(4):
+            content = os.urandom(300 * 1024)
+            key = BlobCache.make_key(f'drs://a/{i}', 'v1', len(content), [('sha256', self._sha256(content))])
+            self.assertTrue(self.cache.put_data(key, content))
+            keys.append(key)
+
+            # Make the order of the last access time deterministic.
+            blob_file_path = os.path.join(self.cache.dir_path, f'{key}.blob')
+            os.utime(blob_file_path, ns=(int((time() - 100 + i) * 1e9), os.stat(blob_file_path).st_mtime_ns))
+
+            if i == 2:
+                # The first blob is used again.
+                self.cache.get(keys[0])
+
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[3]))
+        self.assertLessEqual(self.cache.size(), self.cache.max_size)
+
+        self.assertEqual(self.cache.clear(), 3)
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_blob_modified_outside_cache(self):
+        source_path = os.path.join(self.temp_dir, 'source.bin')
+        with open(source_path, 'wb') as f:
+            f.write(self.content)
+
+        key = BlobCache.make_key('drs://a/aa', 'v1', len(self.content), [('sha256', self._sha256(self.content))])
+        self.assertTrue(self.cache.put_file(key, source_path))
+
+        # The source file is not shared with the cache.
+        with open(source_path, 'r+b') as f:
+            f.write(b'x' * 16)
+        self.assertEqual(self.cache.read(key), self.content)
+
+        # The cached blob is read-only, and so is its hard-linked destination.
+        destination_path = os.path.join(self.temp_dir, 'output.bin')
+        self.assertTrue(self.cache.link_to(key, destination_path))
+        self.assertFalse(os.stat(destination_path).st_mode & stat.S_IWUSR)
+
+        # Touching the blob only causes it to be verified again.
+        os.utime(self.cache.get(key), (time() + 10, time() + 10))
+        self.assertIsNotNone(self.cache.get(key))
+
+        # The blob modified in place is removed.
+        blob_file_path = self.cache.get(key)
+        os.chmod(blob_file_path, stat.S_IRUSR | stat.S_IWUSR)
+        with open(blob_file_path, 'r+b') as f:
+            f.write(b'x' * 16)
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(os.listdir(self.cache.dir_path), [])
+
+        # The blob whose key is not derived from the content cannot be verified again.
+        other_key = BlobCache.make_key('drs://a/bb', 'v1', len(self.content), [])
+        self.assertTrue(self.cache.put_data(other_key, self.content))
+        os.utime(self.cache.get(other_key), (time() + 10, time() + 10))
+        self.assertIsNone(self.cache.get(other_key))
+
+    def test_link_file_replaces_destination(self):
+        source_path = os.path.join(self.temp_dir, 'source.bin')
+        destination_path = os.path.join(self.temp_dir, 'destination.bin')
+
+        with open(source_path, 'wb') as f:
+            f.write(self.content)
+        with open(destination_path, 'wb') as f:
+            f.write(b'old')
+
+        self.assertIn(link_file(source_path, destination_path), ['reflink', 'hardlink', 'copy'])
+
+        with open(destination_path, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['destination.bin', 'source.bin'])
+
+    def test_download_from_cache(self):
+        download_test = test_drs_download.TestUnit()
+        content = download_test.content
+        checksums = [dict(type='sha-256', checksum=self._sha256(content))]
+
+        with FileServer(content) as server:
+            client = download_test._create_client(server, checksums)
+            client.blob_cache = BlobCache(self.cache.dir_path, max_size=10 * 1024 * 1024)
+
+            for output_dir_name in ['first', 'second']:
+                client._download_files(['drs://drs.dnastack.com/foo'],
+                                       output_dir=os.path.join(self.temp_dir, output_dir_name))
+
+            # The second download is linked from the cache.
+            self.assertEqual(len(server.requested_ranges), 1)
+
+            for output_dir_name in ['first', 'second']:
+                with open(os.path.join(self.temp_dir, output_dir_name, 'foo.bin'), 'rb') as f:
+                    self.assertEqual(f.read(), content)
+
+            # The blob data is also read from the cache.
+            self.assertEqual(client.get_blob('foo').data, content)
+            self.assertEqual(len(server.requested_ranges), 1)
+
+    @staticmethod
+    def _sha256(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
@@ -0,0 +1,131 @@
+import threading
+from time import sleep, time
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from dnastack.client.drs import DrsClient, DrsObjectAccessUrl
+from dnastack.client.drs_cache import DrsResolutionCache, ExpiringCache, get_signed_url_expiry
+from dnastack.client.models import ServiceEndpoint
+from dnastack.http.session import HttpSession
+from tests.exam_helper import make_mock_response
+from tests.test_drs_client import make_indirect_drs_object
+
+
+class TestUnit(TestCase):
+    def test_get_signed_url_expiry(self):
+        # 2022-01-01T00:00:00Z
+        signed_at = 1640995200
+
+        self.assertEqual(get_signed_url_expiry('https://s3.amazonaws.com/a?X-Amz-Date=20220101T000000Z'
+                                               '&X-Amz-Expires=3600&X-Amz-Signature=abc'),
+                         signed_at + 3600)
+        self.assertEqual(get_signed_url_expiry('https://storage.googleapis.com/a?X-Goog-Date=20220101T000000Z'
+                                               '&X-Goog-Expires=900'),
+                         signed_at + 900)
+        self.assertEqual(get_signed_url_expiry(f'https://storage.googleapis.com/a?Expires={signed_at}&Signature=abc'),
+                         signed_at)
+        self.assertEqual(get_signed_url_expiry('https://x.blob.core.windows.net/a?sv=2021-06-08'
+                                               '&se=2022-01-01T00:00:00Z&sig=abc'),
+                         signed_at)
+        self.assertIsNone(get_signed_url_expiry('https://s3.amazonaws.com/a'))
+        self.assertIsNone(get_signed_url_expiry('https://s3.amazonaws.com/a?Expires=never'))
+
+    def test_expiring_cache_evicts_expired_and_least_recently_used_entries(self):
+        cache = ExpiringCache(max_entry_count=2)
+
+        cache.put('a', 1, time() + 60)
+        cache.put('b', 2, time() + 60)
+        cache.get('a')
+        cache.put('c', 3, time() + 60)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+        cache.put('d', 4, time() - 1)
+        self.assertIsNone(cache.get('d'))
+
+        cache.put('e', 5, time() + 0.05)
+        sleep(0.1)
+        self.assertIsNone(cache.get('e'))
+
+    def test_expiring_cache_coalesces_concurrent_loads(self):
+        cache = ExpiringCache()
+        call_count = 0
+        barrier = threading.Barrier(8)
+
+        def load():
+            nonlocal call_count
+            call_count += 1
+            sleep(0.1)
+            return 'value'
+
+        results = []
+
+        def get():
+            barrier.wait()
+            results.append(cache.get_or_load('key', load, lambda _: time() + 60))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['value'] * 8)
+        self.assertEqual(call_count, 1)
+
+    def test_expiring_cache_shares_load_errors_without_caching_them(self):
+        cache = ExpiringCache()
+
+        def load():
+            raise RuntimeError('failed')
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load('key', load, lambda _: time() + 60)
+
+        self.assertEqual(cache.get_or_load('key', lambda: 'value', lambda _: time() + 60), 'value')
+
+    def test_access_url_evicted_before_advertised_expiry(self):
+        cache = DrsResolutionCache(access_url_ttl=60)
+
+        cache.put_access_url('drs://a/aa', 'v1', DrsObjectAccessUrl(url=f'https://a/aa?Expires={int(time()) - 1}'))
+        self.assertIsNone(cache.get_access_url('drs://a/aa', 'v1'))
+
+        # Evicted 10% of its lifetime before the advertised expiry
+        cache.put_access_url('drs://a/aa', 'v1', DrsObjectAccessUrl(url=f'https://a/aa?Expires={time() + 0.5:.3f}'))
+        sleep(0.46)
+        self.assertIsNone(cache.get_access_url('drs://a/aa', 'v1'))
+
+        cache.put_access_url('drs://a/aa', 'v1', DrsObjectAccessUrl(url=f'https://a/aa?Expires={int(time()) + 3600}'))
+        self.assertIsNotNone(cache.get_access_url('drs://a/aa', 'v1'))
+        self.assertIsNone(cache.get_access_url('drs://a/aa', 'v2'))
+
+        cache.invalidate('drs://a/aa', 'v1')
+        self.assertIsNone(cache.get_access_url('drs://a/aa', 'v1'))
+
+    def test_blobs_share_resolution_cache(self):
+        session = MagicMock(HttpSession)
+
+        def get(url: str, **kwargs):
+            if '/access/' in url:
+                return make_mock_response(200, json_data=dict(url='https://gcs.dnastack.com/aa'))
+            else:
+                return make_mock_response(200, json_data=make_indirect_drs_object('aa'))
+
+        session.get.side_effect = get
+
+        client = DrsClient(ServiceEndpoint(url='https://drs.dnastack.com/'))
+        client.create_http_session = MagicMock(return_value=session)
+
+        for _ in range(3):
+            self.assertEqual(client.get_blob('aa').get_download_url(), 'https://gcs.dnastack.com/aa')
+
+        # One request for the object and one for the access URL
+        self.assertEqual(session.get.call_count, 2)
+
+        # The cached object and access URL are also used by the bulk resolution.
+        results = client.resolve_many(['aa'])
+        self.assertEqual(results['aa'].access_url.url, 'https://gcs.dnastack.com/aa')
+        self.assertEqual(session.get.call_count, 2)
+        session.post.assert_not_called()
@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Optional
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from dnastack.client.drs import DrsClient, DrsObjectAccessUrl
+from dnastack.client.models import ServiceEndpoint
+from dnastack.http.session import HttpSession, HttpError
+from tests.exam_helper import make_mock_response
+
+DRS_SERVER_URL = 'https://drs.dnastack.com/ga4gh/drs/v1/'
+
+
+def make_drs_object(object_id: str, access_method: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(
+        id=object_id,
+        name=f'{object_id}.bin',
+        size=10,
+        checksums=[],
+        created_time='2022-01-01T00:00:00Z',
+        updated_time='2022-01-01T00:00:00Z',
+        access_methods=[access_method],
+    )
+
+
+def make_direct_drs_object(object_id: str) -> Dict[str, Any]:
+    return make_drs_object(object_id, dict(type='https', access_url=dict(url=f'https://s3.dnastack.com/{object_id}')))
+
+
+def make_indirect_drs_object(object_id: str) -> Dict[str, Any]:
+    return make_drs_object(object_id, dict(type='https', access_id=f'{object_id}-access'))
+
+
+def make_http_error(status_code: int) -> HttpError:
+    return HttpError(make_mock_response(status_code))
+
+
+class TestUnit(TestCase):
+    def test_resolve_many_in_bulk(self):
+        session = MagicMock(HttpSession)
+        requests: List[Dict[str, Any]] = []
+
+        def post(url: str, json: Optional[Dict[str, Any]] = None, **kwargs):
+            requests.append(dict(url=url, json=json))
+
+            if url == f'{DRS_SERVER_URL}objects':
+                return make_mock_response(200, json_data=dict(
+                    resolved_drs_object=[
+                        make_direct_drs_object(object_id) if object_id == 'aa' else make_indirect_drs_object(object_id)
+                        for object_id in json['bulk_object_ids']
+                        if object_id != 'missing'
+                    ],
+                    unresolved_drs_objects=[dict(error_code=404, object_ids=['missing'])]
+                    if 'missing' in json['bulk_object_ids']
+                    else [],
+                ))
+            elif url == f'{DRS_SERVER_URL}objects/access':
+                return make_mock_response(200, json_data=dict(
+                    resolved_drs_object_access_urls=[
+                        dict(drs_object_id=item['bulk_object_id'],
+                             drs_access_id=item['bulk_access_ids'][0],
+                             url=f'https://gcs.dnastack.com/{item["bulk_object_id"]}',
+                             headers=['Authorization: Bearer xyz'])
+                        for item in json['bulk_object_access_ids']
+                    ]
+                ))
+            else:
+                raise make_http_error(404)
+
+        session.post.side_effect = post
+
+        client = self._create_client(session)
+        results = client.resolve_many(['aa', 'drs://drs.dnastack.com/bb', 'cc', 'missing', 'bb'], bulk_size=2)
+
+        self.assertEqual(set(results.keys()), {'aa', 'drs://drs.dnastack.com/bb', 'cc', 'missing', 'bb'})
+
+        self.assertEqual(results['aa'].drs_object.id, 'aa')
+        self.assertEqual(results['aa'].access_url.url, 'https://s3.dnastack.com/aa')
+        self.assertIsNone(results['aa'].error)
+
+        self.assertEqual(results['bb'], results['drs://drs.dnastack.com/bb'])
+        self.assertEqual(results['bb'].drs_url, 'drs://drs.dnastack.com/bb')
+        self.assertEqual(results['bb'].access_url,
+                         DrsObjectAccessUrl(url='https://gcs.dnastack.com/bb', headers={'Authorization': 'Bearer xyz'}))
+
+        self.assertIsNone(results['missing'].drs_object)
+        self.assertEqual(results['missing'].error, 'HTTP 404')
+
+        # Two requests for 4 objects, then one request for the access URLs of 2 objects
+        self.assertEqual([r['url'] for r in requests],
+                         [f'{DRS_SERVER_URL}objects', f'{DRS_SERVER_URL}objects', f'{DRS_SERVER_URL}objects/access'])
+        session.get.assert_not_called()
+
+    def test_resolve_many_without_bulk_requests(self):
+        for status_code in [400, 405]:
+            with self.subTest(status_code):
+                self._test_resolve_many_without_bulk_requests(status_code)
+
+    def _test_resolve_many_without_bulk_requests(self, status_code: int):
+        session = MagicMock(HttpSession)
+        session.post.side_effect = make_http_error(status_code)
+
+        def get(url: str, **kwargs):
+            object_id = url.split('/')[-1]
+            if url.startswith(f'{DRS_SERVER_URL}objects/') and '/access/' in url:
+                return make_mock_response(200, json_data=dict(url=f'https://gcs.dnastack.com/{url.split("/")[-3]}'))
+            elif object_id == 'missing':
+                raise make_http_error(404)
+            else:
+                return make_mock_response(200, json_data=make_indirect_drs_object(object_id))
+
+        session.get.side_effect = get
+
+        client = self._create_client(session)
+
+        for _ in range(2):
+            results = client.resolve_many([f'object-{i}' for i in range(20)] + ['missing'], concurrency=4)
+
+            self.assertEqual(len(results), 21)
+            for i in range(20):
+                self.assertEqual(results[f'object-{i}'].access_url.url, f'https://gcs.dnastack.com/object-{i}')
+            self.assertIsNone(results['missing'].access_url)
+            self.assertIn('HTTP 404', results['missing'].error)
+
+        # The support of the bulk requests is only checked once.
+        self.assertEqual(session.post.call_count, 1)
+        self.assertEqual(session.__exit__.call_count, 2)
+
+    def test_get_blobs(self):
+        session = MagicMock(HttpSession)
+        session.post.return_value = make_mock_response(200, json_data=dict(
+            resolved_drs_object=[make_direct_drs_object('aa')],
+        ))
+
+        blobs = self._create_client(session).get_blobs(['aa'])
+
+        self.assertEqual(blobs['aa'].get_object().id, 'aa')
+        self.assertEqual(blobs['aa'].get_download_url(), 'https://s3.dnastack.com/aa')
+        session.get.assert_not_called()
+
+    @staticmethod
+    def _create_client(session: HttpSession) -> DrsClient:
+        client = DrsClient(ServiceEndpoint(url='https://drs.dnastack.com/'))
+        client.create_http_session = MagicMock(return_value=session)
+        session.__enter__.return_value = session
+        return client
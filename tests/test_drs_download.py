@@ -0,0 +1,491 @@
+import base64
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from dnastack.client.drs import DrsClient, DRSDownloadException, DownloadFailureEvent, DownloadProgressEvent, \
+    DownloadJournal, AdaptiveStreamReader, DownloadProgressReporter, MIN_READ_SIZE, MAX_READ_SIZE
+from dnastack.client.drs_checksum import ChecksumCalculator, ChecksumMismatchError
+from dnastack.client.models import ServiceEndpoint
+from dnastack.common.events import EventSource
+from dnastack.http.session import HttpSession
+from tests.exam_helper import make_mock_response, LocalHttpServer
+
+
+class FileServer(LocalHttpServer):
+    """ Local HTTP server serving the same content on every path """
+
+    def __init__(self, content: bytes, accept_ranges: bool = True, failing_range_start: Optional[int] = None):
+        self.content = content
+        self.accept_ranges = accept_ranges
+        self.failing_range_start = failing_range_start
+        self.requested_ranges: List[Optional[str]] = []
+        self.connection_count = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connection_count += 1
+
+            def do_GET(self):
+                range_header = self.headers.get('Range')
+
+                with server.lock:
+                    server.requested_ranges.append(range_header)
+
+                range_match = re.match(r'^bytes=(\d+)-(\d+)$', range_header or '')
+
+                if not server.accept_ranges or not range_match:
+                    self.send_response(200)
+                    if server.accept_ranges:
+                        self.send_header('Accept-Ranges', 'bytes')
+                    self.send_header('Content-Length', str(len(server.content)))
+                    self.end_headers()
+                    self.wfile.write(server.content)
+                    return
+
+                start, end = int(range_match.group(1)), int(range_match.group(2))
+
+                if start == server.failing_range_start:
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                part = server.content[start:end + 1]
+                self.send_response(206)
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('Content-Range', f'bytes {start}-{end}/{len(server.content)}')
+                self.send_header('Content-Length', str(len(part)))
+                self.end_headers()
+                self.wfile.write(part)
+
+        super().__init__(Handler)
+
+
+class TestUnit(TestCase):
+    content = os.urandom(1024 * 1024 + 123)
+
+    def setUp(self) -> None:
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.output_dir)
+
+    def test_download_in_parts(self):
+        with FileServer(self.content) as server:
+            client = self._create_client(server)
+            progress_events = self._collect_events(client, 'download-progress')
+
+            client._download_files(['drs://drs.dnastack.com/foo'],
+                                   output_dir=self.output_dir,
+                                   part_size=100 * 1024,
+                                   part_concurrency=4,
+                                   part_threshold=512 * 1024)
+
+        with open(os.path.join(self.output_dir, 'foo.bin'), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        # The first request is for the whole content. The content is then downloaded in 11 parts.
+        self.assertEqual(len(server.requested_ranges), 12)
+        self.assertIsNone(server.requested_ranges[0])
+        self.assertEqual(sorted(server.requested_ranges[1:], key=lambda r: int(r[6:].split('-')[0]))[-1],
+                         f'bytes={10 * 100 * 1024}-{len(self.content) - 1}')
+
+        last_event: DownloadProgressEvent = progress_events[-1]
+        self.assertEqual(last_event.read_byte_count, len(self.content))
+        self.assertEqual(last_event.total_byte_count, len(self.content))
+
+    def test_single_stream_without_accept_ranges(self):
+        with FileServer(self.content, accept_ranges=False) as server:
+            client = self._create_client(server)
+
+            client._download_files(['drs://drs.dnastack.com/foo'],
+                                   output_dir=self.output_dir,
+                                   part_size=100 * 1024,
+                                   part_concurrency=4,
+                                   part_threshold=512 * 1024)
+
+        with open(os.path.join(self.output_dir, 'foo.bin'), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        self.assertEqual(server.requested_ranges, [None])
+
+    def test_single_stream_below_threshold(self):
+        with FileServer(self.content) as server:
+            client = self._create_client(server)
+
+            client._download_files(['drs://drs.dnastack.com/foo'],
+                                   output_dir=self.output_dir,
+                                   part_size=100 * 1024,
+                                   part_concurrency=4,
+                                   part_threshold=2 * len(self.content))
+
+        with open(os.path.join(self.output_dir, 'foo.bin'), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        self.assertEqual(server.requested_ranges, [None])
+
+    def test_failed_part_keeps_partial_file(self):
+        with FileServer(self.content, failing_range_start=3 * 100 * 1024) as server:
+            client = self._create_client(server)
+            failure_events = self._collect_events(client, 'download-failure')
+
+            with self.assertRaises(DRSDownloadException):
+                client._download_files(['drs://drs.dnastack.com/foo'],
+                                       output_dir=self.output_dir,
+                                       part_size=100 * 1024,
+                                       part_concurrency=2,
+                                       part_threshold=512 * 1024)
+
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'foo.bin')))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'foo.bin.part')))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'foo.bin.part.json')))
+
+        self.assertEqual(len(failure_events), 1)
+        failure_event: DownloadFailureEvent = failure_events[0]
+        self.assertIn('HTTP 503', str(failure_event.error))
+
+    def test_resume_downloads_missing_ranges_only(self):
+        part_options = dict(part_size=100 * 1024, part_concurrency=2, part_threshold=512 * 1024)
+
+        with FileServer(self.content, failing_range_start=3 * 100 * 1024) as server:
+            # NOTE: The content downloaded before the interruption is also verified.
+            client = self._create_client(server,
+                                         [dict(type='sha-256', checksum=hashlib.sha256(self.content).hexdigest())])
+            failure_events = self._collect_events(client, 'download-failure')
+
+            with self.assertRaises(DRSDownloadException):
+                client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, **part_options)
+
+            journal = DownloadJournal(os.path.join(self.output_dir, 'foo.bin.part.json'),
+                                      'drs://drs.dnastack.com/foo',
+                                      len(self.content))
+            self.assertTrue(journal.load())
+            missing_ranges = [f'bytes={start}-{end}' for start, end in journal.get_missing_ranges(100 * 1024)]
+            self.assertIn(f'bytes={3 * 100 * 1024}-{4 * 100 * 1024 - 1}', missing_ranges)
+            self.assertLess(len(missing_ranges), 11)
+
+            server.failing_range_start = None
+            server.requested_ranges.clear()
+            failure_events.clear()
+
+            client._download_files(['drs://drs.dnastack.com/foo'],
+                                   output_dir=self.output_dir,
+                                   resume=True,
+                                   **part_options)
+
+        self.assertEqual(failure_events, [])
+
+        with open(os.path.join(self.output_dir, 'foo.bin'), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'foo.bin.part')))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'foo.bin.part.json')))
+
+        # The first request is for the whole content, followed by the requests for the missing ranges.
+        self.assertIsNone(server.requested_ranges[0])
+        self.assertEqual(sorted(server.requested_ranges[1:]), sorted(missing_ranges))
+
+    def test_resume_single_stream_download(self):
+        # A single-stream download leaves a partial file shorter than the content.
+        with open(os.path.join(self.output_dir, 'foo.bin.part'), 'wb') as f:
+            f.write(self.content[:300 * 1024])
+
+        journal = DownloadJournal(os.path.join(self.output_dir, 'foo.bin.part.json'),
+                                  'drs://drs.dnastack.com/foo',
+                                  len(self.content))
+        journal.add(0, 300 * 1024 - 1)
+
+        with FileServer(self.content) as server:
+            client = self._create_client(server)
+            client._download_files(['drs://drs.dnastack.com/foo'],
+                                   output_dir=self.output_dir,
+                                   part_size=512 * 1024,
+                                   resume=True)
+
+        with open(os.path.join(self.output_dir, 'foo.bin'), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        self.assertEqual(server.requested_ranges,
+                         [None, f'bytes={300 * 1024}-{812 * 1024 - 1}', f'bytes={812 * 1024}-{len(self.content) - 1}'])
+
+    def test_resume_without_accept_ranges_restarts(self):
+        with open(os.path.join(self.output_dir, 'foo.bin.part'), 'wb') as f:
+            f.write(b'garbage')
+
+        journal = DownloadJournal(os.path.join(self.output_dir, 'foo.bin.part.json'),
+                                  'drs://drs.dnastack.com/foo',
+                                  len(self.content))
+        journal.add(0, 6)
+
+        with FileServer(self.content, accept_ranges=False) as server:
+            client = self._create_client(server)
+            client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, resume=True)
+
+        with open(os.path.join(self.output_dir, 'foo.bin'), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        self.assertEqual(server.requested_ranges, [None])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'foo.bin.part.json')))
+
+    def test_connections_reused_across_downloads(self):
+        with FileServer(self.content) as server:
+            client = self._create_client(server)
+
+            for _ in range(3):
+                client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, part_concurrency=1)
+
+            self.assertEqual(server.requested_ranges, [None] * 3)
+            self.assertEqual(server.connection_count, 1)
+
+            for _ in range(3):
+                client._download_files(['drs://drs.dnastack.com/foo'],
+                                       output_dir=self.output_dir,
+                                       part_size=100 * 1024,
+                                       part_concurrency=2,
+                                       part_threshold=512 * 1024)
+
+        # NOTE: The connection of the request for the whole content is closed once the download switches to the parts.
+        #       The parts of all downloads are then downloaded over the same two connections.
+        self.assertEqual(len(server.requested_ranges), 3 + 3 * 12)
+        self.assertLessEqual(server.connection_count, 1 + 3 + 2)
+
+    def test_transfer_pool_shared_by_blobs(self):
+        client = DrsClient(ServiceEndpoint(url='https://drs.dnastack.com/'))
+        client.create_http_session = MagicMock(return_value=MagicMock(HttpSession))
+
+        pool = client.get_transfer_pool()
+
+        with client.get_blob('aa') as blob:
+            self.assertIs(blob._pool, pool)
+        with client.get_blob('bb') as blob:
+            self.assertIs(blob._pool, pool)
+
+        # The pool is only replaced when it is too small.
+        self.assertIs(client.get_transfer_pool(4), pool)
+        larger_pool = client.get_transfer_pool(64)
+        self.assertIsNot(larger_pool, pool)
+        self.assertEqual(larger_pool.connection_pool_kw['maxsize'], 64)
+        self.assertFalse(larger_pool.connection_pool_kw['block'])
+
+        client.max_connections_per_host = 2
+        limited_pool = client.get_transfer_pool(64)
+        self.assertEqual(limited_pool.connection_pool_kw['maxsize'], 2)
+        self.assertTrue(limited_pool.connection_pool_kw['block'])
+
+    def test_skip_existing(self):
+        checksums = [dict(type='sha-256', checksum=hashlib.sha256(self.content).hexdigest())]
+        output_file_path = os.path.join(self.output_dir, 'foo.bin')
+
+        with FileServer(self.content) as server:
+            client = self._create_client(server, checksums)
+            skipped_events = self._collect_events(client, 'download-skipped')
+
+            client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, skip_existing=True)
+            self.assertEqual(len(server.requested_ranges), 1)
+
+            # The identical file is not downloaded again.
+            client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, skip_existing=True)
+            self.assertEqual(len(server.requested_ranges), 1)
+            self.assertEqual(len(skipped_events), 1)
+            self.assertEqual(skipped_events[0].output_file_path, output_file_path)
+            self.assertEqual(skipped_events[0].byte_count, len(self.content))
+
+            # The file with the same size but different content is only skipped without the verification.
+            with open(output_file_path, 'r+b') as f:
+                f.write(b'corrupted')
+
+            client._download_files(['drs://drs.dnastack.com/foo'],
+                                   output_dir=self.output_dir,
+                                   skip_existing=True,
+                                   verify=False)
+            self.assertEqual(len(server.requested_ranges), 1)
+
+            client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, skip_existing=True)
+            self.assertEqual(len(server.requested_ranges), 2)
+
+            # The file with a different size is downloaded again.
+            with open(output_file_path, 'ab') as f:
+                f.write(b'extra')
+
+            client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, skip_existing=True)
+            self.assertEqual(len(server.requested_ranges), 3)
+
+        with open(output_file_path, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(len(skipped_events), 2)
+
+    def test_journal_missing_ranges(self):
+        journal = DownloadJournal(os.path.join(self.output_dir, 'journal.json'), 'drs://drs.dnastack.com/foo', 100)
+        journal.add(10, 19)
+        journal.add(20, 29)
+        journal.add(60, 69)
+
+        self.assertEqual(journal.completed_ranges, [(10, 29), (60, 69)])
+        self.assertEqual(journal.completed_byte_count, 30)
+        self.assertEqual(journal.get_missing_ranges(20),
+                         [(0, 9), (30, 49), (50, 59), (70, 89), (90, 99)])
+
+        # The journal is only loaded for the same object with the same size.
+        self.assertTrue(DownloadJournal(journal.file_path, 'drs://drs.dnastack.com/foo', 100).load())
+        self.assertFalse(DownloadJournal(journal.file_path, 'drs://drs.dnastack.com/foo', 101).load())
+        self.assertFalse(DownloadJournal(journal.file_path, 'drs://drs.dnastack.com/bar', 100).load())
+
+    def test_verify_checksum(self):
+        checksums = [dict(type='md5', checksum=hashlib.md5(self.content).hexdigest()),
+                     dict(type='sha-256', checksum=hashlib.sha256(self.content).hexdigest())]
+
+        for part_concurrency in [1, 4]:
+            with self.subTest(part_concurrency=part_concurrency):
+                with FileServer(self.content) as server:
+                    client = self._create_client(server, checksums)
+                    failure_events = self._collect_events(client, 'download-failure')
+
+                    client._download_files(['drs://drs.dnastack.com/foo'],
+                                           output_dir=self.output_dir,
+                                           part_size=100 * 1024,
+                                           part_concurrency=part_concurrency,
+                                           part_threshold=512 * 1024)
+
+                self.assertEqual(failure_events, [])
+                self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'foo.bin')))
+                os.unlink(os.path.join(self.output_dir, 'foo.bin'))
+
+    def test_checksum_mismatch(self):
+        checksums = [dict(type='sha-256', checksum=hashlib.sha256(b'something else').hexdigest())]
+
+        for part_concurrency in [1, 4]:
+            with self.subTest(part_concurrency=part_concurrency):
+                with FileServer(self.content) as server:
+                    client = self._create_client(server, checksums)
+                    failure_events = self._collect_events(client, 'download-failure')
+
+                    with self.assertRaises(DRSDownloadException):
+                        client._download_files(['drs://drs.dnastack.com/foo'],
+                                               output_dir=self.output_dir,
+                                               part_size=100 * 1024,
+                                               part_concurrency=part_concurrency,
+                                               part_threshold=512 * 1024)
+
+                self.assertEqual(len(failure_events), 1)
+                failure_event: DownloadFailureEvent = failure_events[0]
+                self.assertEqual(failure_event.reason, 'checksum-mismatch')
+                self.assertIsInstance(failure_event.error, ChecksumMismatchError)
+                self.assertEqual(os.listdir(self.output_dir), [])
+
+        # The verification can be skipped.
+        with FileServer(self.content) as server:
+            client = self._create_client(server, checksums)
+            client._download_files(['drs://drs.dnastack.com/foo'], output_dir=self.output_dir, verify=False)
+
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'foo.bin')))
+
+    def test_checksum_calculator(self):
+        content = os.urandom(3 * 1024 * 1024 + 5)
+        md5_digest = hashlib.md5(content).digest()
+
+        # The most preferred checksum is picked. CRC32C is skipped if the optional dependency is not available.
+        calculator = ChecksumCalculator.create([('ETag', '"abc"'), ('MD5', md5_digest.hex()), ('foo', 'bar')],
+                                               len(content))
+        self.assertEqual(calculator.checksum_type, 'md5')
+        self.assertIsNone(ChecksumCalculator.create([('foo', 'bar')], len(content)))
+
+        # The base64-encoded digest is accepted.
+        calculator = ChecksumCalculator('md5', base64.b64encode(md5_digest).decode(), len(content))
+        calculator.update(content)
+        calculator.verify()
+
+        # The ETag of the multipart upload (with 1 MiB parts)
+        part_digests = b''.join([hashlib.md5(content[i:i + 1024 * 1024]).digest()
+                                 for i in range(0, len(content), 1024 * 1024)])
+        calculator = ChecksumCalculator('etag', f'"{hashlib.md5(part_digests).hexdigest()}-4"', len(content))
+        for i in range(0, len(content), 1000):
+            calculator.update(content[i:i + 1000])
+        calculator.verify()
+
+        calculator = ChecksumCalculator('etag', f'"{hashlib.md5(part_digests).hexdigest()}-4"', len(content))
+        calculator.update(content[:-1])
+        with self.assertRaises(ChecksumMismatchError):
+            calculator.verify()
+
+    def test_adaptive_stream_reader(self):
+        content = os.urandom(3 * MAX_READ_SIZE + 7)
+        reader = AdaptiveStreamReader(io.BytesIO(content))
+
+        chunk_sizes = []
+        received = bytearray()
+        for chunk in reader:
+            chunk_sizes.append(len(chunk))
+            received.extend(chunk)
+
+        self.assertEqual(bytes(received), content)
+        # The fast (in-memory) stream is read with the growing read size up to the maximum.
+        self.assertEqual(chunk_sizes[0], MIN_READ_SIZE)
+        self.assertEqual(chunk_sizes[1], 2 * MIN_READ_SIZE)
+        self.assertEqual(reader.read_size, MAX_READ_SIZE)
+
+    def test_progress_reporter_throttles_events(self):
+        events = EventSource(['download-progress'])
+        received_events: List[DownloadProgressEvent] = []
+        events.on('download-progress', received_events.append)
+
+        reporter = DownloadProgressReporter(events, 'drs://drs.dnastack.com/foo', 1000,
+                                            interval=3600, byte_interval=300)
+        for _ in range(100):
+            reporter.add(10)
+
+        # One event per 300 bytes, then one for the completion
+        self.assertEqual([e.read_byte_count for e in received_events], [300, 600, 900, 1000])
+
+        reporter.flush()
+        self.assertEqual(len(received_events), 5)
+
+    def _create_client(self, server: FileServer, checksums: Optional[List[Dict]] = None) -> DrsClient:
+        session = MagicMock(HttpSession)
+        session.get.return_value = make_mock_response(200, json_data=self._make_drs_object(server.url, checksums))
+
+        client = DrsClient(ServiceEndpoint(url='https://drs.dnastack.com/'))
+        client.create_http_session = MagicMock(return_value=session)
+
+        return client
+
+    def _make_drs_object(self, base_url: str, checksums: Optional[List[Dict]] = None) -> Dict:
+        return dict(
+            id='foo',
+            name='foo.bin',
+            size=len(self.content),
+            checksums=checksums or [],
+            created_time='2022-01-01T00:00:00Z',
+            updated_time='2022-01-01T00:00:00Z',
+            access_methods=[dict(type='https', access_url=dict(url=f'{base_url}/files/foo.bin'))],
+        )
+
+    @staticmethod
+    def _collect_events(client: DrsClient, event_type: str) -> List:
+        events = []
+        lock = threading.Lock()
+
+        def collect(event):
+            with lock:
+                events.append(event)
+
+        client.events.on(event_type, collect)
+        return events
@@ -0,0 +1,82 @@
+import io
+import os
+import random
+from unittest import TestCase
+
+from tests import test_drs_download
+from tests.test_drs_download import FileServer
+
+
+class TestUnit(TestCase):
+    content = os.urandom(1024 * 1024 + 123)
+    block_size = 64 * 1024
+
+    def test_random_access(self):
+        with FileServer(self.content) as server:
+            with self._open(server) as reader:
+                self.assertTrue(reader.seekable())
+                self.assertEqual(reader.seek(0, io.SEEK_END), len(self.content))
+
+                # The tail of the content only requires the last block.
+                reader.seek(-100, io.SEEK_END)
+                self.assertEqual(reader.read(), self.content[-100:])
+                self.assertEqual(server.requested_ranges,
+                                 [f'bytes={16 * self.block_size}-{len(self.content) - 1}'])
+
+                randomizer = random.Random(1234)
+                for _ in range(50):
+                    position = randomizer.randrange(0, len(self.content))
+                    size = randomizer.randrange(0, 3 * self.block_size)
+                    reader.seek(position)
+                    self.assertEqual(reader.read(size), self.content[position:position + size])
+                    self.assertEqual(reader.tell(), min(position + size, len(self.content)))
+
+                # Reading beyond the end of the content
+                reader.seek(len(self.content) + 10)
+                self.assertEqual(reader.read(10), b'')
+
+            with self.assertRaises(ValueError):
+                reader.read(1)
+
+    def test_sequential_reads_with_readahead(self):
+        with FileServer(self.content) as server:
+            with self._open(server) as reader:
+                chunks = []
+                while True:
+                    chunk = reader.read(4096)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+
+        self.assertEqual(b''.join(chunks), self.content)
+
+        # The readahead window doubles at every following block, limited by the number of cached blocks. The 17 blocks
+        # are read as 1 + (1 + 1) + (1 + 4) + (1 + 7) + 1 blocks.
+        self.assertEqual(len(server.requested_ranges), 5)
+
+    def test_text_consumers(self):
+        lines = [f'{i}\tfoo\tbar\n'.encode() for i in range(50000)]
+        content = b''.join(lines)
+
+        with FileServer(content) as server:
+            with self._open(server, content) as reader:
+                with io.TextIOWrapper(io.BufferedReader(reader)) as text_stream:
+                    self.assertEqual(text_stream.readline(), '0\tfoo\tbar\n')
+                    self.assertEqual(text_stream.readline(), '1\tfoo\tbar\n')
+
+        # Only the first block is downloaded.
+        self.assertEqual(server.requested_ranges, [f'bytes=0-{self.block_size - 1}'])
+
+    def test_unsupported_mode(self):
+        with FileServer(self.content) as server:
+            blob = test_drs_download.TestUnit()._create_client(server).get_blob('foo')
+            with self.assertRaises(ValueError):
+                blob.open('r')
+
+    def _open(self, server: FileServer, content: bytes = None):
+        download_test = test_drs_download.TestUnit()
+        download_test.content = content or self.content
+
+        return download_test._create_client(server).get_blob('foo').open(block_size=self.block_size,
+                                                                           max_cached_block_count=8,
+                                                                           max_readahead_block_count=8)
@@ -0,0 +1,46 @@
+from time import monotonic
+from unittest import TestCase
+
+from dnastack.client.drs_scheduler import BandwidthLimiter, DownloadScheduler
+
+
+class TestUnit(TestCase):
+    def test_largest_first_with_reserved_workers_for_small_objects(self):
+        scheduler = DownloadScheduler([('a', 10), ('b', 1000), ('c', 1), ('d', 5000), ('e', 100), ('f', 0)],
+                                      small_size_threshold=500)
+
+        self.assertEqual(scheduler.get_reserved_worker_count(1), 0)
+        self.assertEqual(scheduler.get_reserved_worker_count(8), 2)
+
+        # The reserved workers take the smallest objects first.
+        self.assertEqual(scheduler.next(small_only=True), 'f')
+
+        # The general workers take the largest objects first, then the small ones.
+        self.assertEqual([scheduler.next() for _ in range(3)], ['d', 'b', 'e'])
+        self.assertEqual(scheduler.next(small_only=True), 'c')
+        self.assertEqual(scheduler.next(), 'a')
+
+        self.assertIsNone(scheduler.next())
+        self.assertIsNone(scheduler.next(small_only=True))
+
+    def test_no_reserved_workers_without_both_small_and_large_objects(self):
+        self.assertEqual(DownloadScheduler([('a', 1), ('b', 2)], small_size_threshold=500)
+                         .get_reserved_worker_count(8), 0)
+        self.assertEqual(DownloadScheduler([('a', 1000), ('b', 2000)], small_size_threshold=500)
+                         .get_reserved_worker_count(8), 0)
+
+    def test_bandwidth_limiter(self):
+        limiter = BandwidthLimiter(1000)
+
+        started_time = monotonic()
+
+        # The first second worth of bytes is available right away.
+        limiter.acquire(1000)
+        self.assertLess(monotonic() - started_time, 0.1)
+
+        # The next bytes have to wait.
+        limiter.acquire(250)
+        self.assertGreaterEqual(monotonic() - started_time, 0.2)
+
+        with self.assertRaises(ValueError):
+            BandwidthLimiter(0)
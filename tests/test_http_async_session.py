@@ -0,0 +1,119 @@
+import asyncio
+from time import perf_counter
+from typing import Any, Dict, List
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from dnastack.client.data_connect import QueryLoader
+from dnastack.client.result_iterator import AsyncResultIterator
+from dnastack.http.authenticators.abstract import Authenticator
+from dnastack.http.async_session import AsyncHttpSession
+from dnastack.http.session import ClientError
+from tests.exam_helper import make_mock_response
+
+
+class FakeAsyncClient:
+    """ Replacement of httpx.AsyncClient responding with the given responses in order """
+
+    def __init__(self, responses: List[Any], delay: float = 0):
+        self.responses = responses
+        self.delay = delay
+        self.requests: List[Dict[str, Any]] = []
+        self.closed = False
+
+    async def request(self, method: str, url: str, **kwargs):
+        self.requests.append(dict(method=method, url=url, **kwargs))
+        await asyncio.sleep(self.delay)
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestUnit(TestCase):
+    def test_authenticated_request(self):
+        authenticator = self._make_authenticator()
+        client = FakeAsyncClient([make_mock_response(200, json_data=dict(ok=True))])
+
+        async def run():
+            async with AsyncHttpSession(authenticators=[authenticator], client=client, suppress_error=False) as session:
+                return await session.get('http://localhost/runs',
+                                         params=dict(tag=['a', 'b'], page_size=10, page_token=None))
+
+        response = asyncio.run(run())
+
+        self.assertEqual(response.json(), dict(ok=True))
+        request = client.requests[0]
+        self.assertEqual(request['method'], 'GET')
+        self.assertEqual(request['headers']['Authorization'], 'Bearer token-1')
+        self.assertIn('X-B3-TraceId', request['headers'])
+        self.assertEqual(request['params'], [('tag', 'a'), ('tag', 'b'), ('page_size', '10')])
+
+        # The client given to the session is not closed by the session.
+        self.assertFalse(client.closed)
+
+    def test_reauthentication_on_401(self):
+        authenticator = self._make_authenticator()
+        client = FakeAsyncClient([make_mock_response(401), make_mock_response(200, json_data=dict(ok=True))])
+
+        async def run():
+            session = AsyncHttpSession(authenticators=[authenticator], client=client, suppress_error=False)
+            return await session.get('http://localhost/runs')
+
+        self.assertEqual(asyncio.run(run()).status_code, 200)
+        authenticator.clear_access_token.assert_called_once()
+        self.assertEqual([r['headers']['Authorization'] for r in client.requests], ['Bearer token-1', 'Bearer token-2'])
+
+    def test_client_error(self):
+        client = FakeAsyncClient([make_mock_response(404)])
+
+        async def run():
+            session = AsyncHttpSession(enable_auth=False, client=client, suppress_error=False)
+            return await session.get('http://localhost/runs/foo')
+
+        with self.assertRaises(ClientError):
+            asyncio.run(run())
+
+    def test_concurrent_requests_on_one_thread(self):
+        client = FakeAsyncClient([make_mock_response(200)], delay=0.2)
+
+        async def run():
+            session = AsyncHttpSession(enable_auth=False, client=client)
+            await asyncio.gather(*[session.get(f'http://localhost/runs/{i}') for i in range(100)])
+
+        started_time = perf_counter()
+        asyncio.run(run())
+
+        self.assertEqual(len(client.requests), 100)
+        self.assertLess(perf_counter() - started_time, 2)
+
+    def test_query_pages(self):
+        client = FakeAsyncClient([
+            make_mock_response(200, json_data=dict(data=[dict(id=1), dict(id=2)],
+                                                   data_model=dict(properties=dict(id=dict(type='integer'))),
+                                                   pagination=dict(next_page_url='/search/page-2'))),
+            make_mock_response(200, json_data=dict(data=[dict(id=3)])),
+        ])
+
+        async def run():
+            session = AsyncHttpSession(enable_auth=False, client=client, suppress_error=False)
+            loader = QueryLoader('http://localhost/search', query='SELECT 1', http_session=session)
+            return [row async for row in AsyncResultIterator(loader)]
+
+        self.assertEqual(asyncio.run(run()), [dict(id=1), dict(id=2), dict(id=3)])
+        self.assertEqual([(r['method'], r['url']) for r in client.requests],
+                         [('POST', 'http://localhost/search'), ('GET', 'http://localhost/search/page-2')])
+        self.assertEqual(client.requests[0]['json'], dict(query='SELECT 1'))
+
+    @staticmethod
+    def _make_authenticator() -> Authenticator:
+        tokens = iter(['token-1', 'token-2'])
+
+        def before_request(r, trace_context):
+            r.headers['Authorization'] = f'Bearer {next(tokens)}'
+
+        authenticator = MagicMock(Authenticator)
+        authenticator.session_id = 'foo'
+        authenticator.before_request.side_effect = before_request
+
+        return authenticator
@@ -0,0 +1,110 @@
+import json
+import shutil
+import tempfile
+from http.server import BaseHTTPRequestHandler
+from typing import List, Optional
+from unittest import TestCase
+
+from requests import Session
+
+from dnastack.http.http_cache import HttpCache
+from dnastack.http.session import HttpSession
+from tests.exam_helper import LocalHttpServer
+
+
+class MetadataServer(LocalHttpServer):
+    """ Local HTTP server responding with the validators and Cache-Control headers set by the tests """
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.cache_control: Optional[str] = None
+        self.requests: List[dict] = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(dict(path=self.path, headers=dict(self.headers.items())))
+
+                if self.headers.get('If-None-Match') == server.etag:
+                    self.send_response(304)
+                    self.send_header('ETag', server.etag)
+                    self.end_headers()
+                    return
+
+                body = json.dumps(dict(path=self.path, etag=server.etag)).encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', server.etag)
+                if server.cache_control:
+                    self.send_header('Cache-Control', server.cache_control)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        super().__init__(Handler)
+
+
+class TestUnit(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = HttpCache(self.temp_dir, max_size=1024 * 1024)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def test_revalidation_with_etag(self):
+        with MetadataServer() as server:
+            session = self._make_session()
+
+            first_response = session.get(f'{server.url}/service-info', params=dict(a=1))
+            second_response = session.get(f'{server.url}/service-info', params=dict(a=1))
+
+            self.assertEqual(second_response.status_code, 200)
+            self.assertEqual(second_response.json(), first_response.json())
+            self.assertEqual(server.requests[1]['headers'].get('If-None-Match'), '"v1"')
+
+            # The new version is cached once the server responds with it.
+            server.etag = '"v2"'
+            self.assertEqual(session.get(f'{server.url}/service-info', params=dict(a=1)).json()['etag'], '"v2"')
+            self.assertEqual(session.get(f'{server.url}/service-info', params=dict(a=1)).json()['etag'], '"v2"')
+            self.assertEqual(len(server.requests), 4)
+
+            # The responses to different URLs are cached separately.
+            self.assertEqual(session.get(f'{server.url}/service-info', params=dict(a=2)).json()['path'],
+                             '/service-info?a=2')
+            self.assertNotIn('If-None-Match', server.requests[-1]['headers'])
+
+    def test_fresh_response_without_request(self):
+        with MetadataServer() as server:
+            server.cache_control = 'max-age=60'
+            session = self._make_session()
+
+            for _ in range(3):
+                self.assertEqual(session.get(f'{server.url}/collections').json()['path'], '/collections')
+
+            self.assertEqual(len(server.requests), 1)
+
+    def test_no_store(self):
+        with MetadataServer() as server:
+            server.cache_control = 'no-store'
+            session = self._make_session()
+
+            session.get(f'{server.url}/runs')
+            session.get(f'{server.url}/runs')
+
+            self.assertNotIn('If-None-Match', server.requests[1]['headers'])
+            self.assertEqual(self.cache.size(), 0)
+
+    def test_responses_not_shared_between_principals(self):
+        self.assertNotEqual(HttpCache.make_key('http://localhost/a', 'Bearer a'),
+                            HttpCache.make_key('http://localhost/a', 'Bearer b'))
+        self.assertNotEqual(HttpCache.make_key('http://localhost/a', 'Bearer a'),
+                            HttpCache.make_key('http://localhost/a', None))
+
+    def _make_session(self) -> HttpSession:
+        return HttpSession(enable_auth=False, session=Session(), suppress_error=False, http_cache=self.cache)
@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from dnastack.http.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, CircuitState
+from dnastack.http.client_factory import HttpTransportRegistry
+from dnastack.http.retry import RetryBudget, RetryPolicy
+from dnastack.http.session import HttpSession, ServerError
+from tests.test_http_retry import ScriptedServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestUnit(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'circuit-breakers.json')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def test_state_transitions(self):
+        clock = FakeClock()
+        circuit_breaker = CircuitBreaker('https://alpha.test', minimum_calls=4, open_duration=30, clock=clock)
+
+        # The circuit stays closed while the failure rate is below the threshold.
+        for failure in [None, 'HTTP 503', None]:
+            circuit_breaker.before_call()
+            self.assertFalse(circuit_breaker.record(failure, 0.1))
+
+        circuit_breaker.before_call()
+        self.assertTrue(circuit_breaker.record('HTTP 502', 0.1))
+        self.assertEqual(circuit_breaker.state, CircuitState.open)
+
+        with self.assertRaisesRegex(CircuitOpenError, 'https://alpha.test is unavailable .+HTTP 502'):
+            circuit_breaker.before_call()
+
+        # Only one request probes the host while the circuit is half-open.
+        clock.now += 30
+        circuit_breaker.before_call()
+        self.assertEqual(circuit_breaker.state, CircuitState.half_open)
+        with self.assertRaises(CircuitOpenError):
+            circuit_breaker.before_call()
+
+        # The failed probe opens the circuit again.
+        self.assertTrue(circuit_breaker.record('ConnectionError: refused', 0.1))
+        self.assertEqual(circuit_breaker.snapshot().retry_at, clock.now + 30)
+
+        clock.now += 30
+        circuit_breaker.before_call()
+        self.assertTrue(circuit_breaker.record(None, 0.1))
+        self.assertEqual(circuit_breaker.state, CircuitState.closed)
+        self.assertEqual(circuit_breaker.snapshot().call_count, 0)
+
+    def test_interrupted_calls(self):
+        def interrupt(*args, **kwargs):
+            raise KeyboardInterrupt()
+
+        with ScriptedServer([]) as server:
+            registry = CircuitBreakerRegistry(self.file_path)
+            session = HttpSession(enable_auth=False, suppress_error=False, circuit_breakers=registry)
+
+            for _ in range(10):
+                with self.assertRaises(KeyboardInterrupt):
+                    session.get(f'{server.url}/runs', hooks=dict(response=interrupt))
+
+            # The interrupted calls are not recorded as failures.
+            snapshot = registry.get(server.url).snapshot()
+            self.assertEqual((snapshot.state, snapshot.call_count), (CircuitState.closed, 0))
+
+        # The interrupted probe lets the next call probe the host.
+        clock = FakeClock()
+        circuit_breaker = CircuitBreaker('https://alpha.test', minimum_calls=1, open_duration=30, clock=clock)
+        circuit_breaker.before_call()
+        circuit_breaker.record('HTTP 503', 0.1)
+
+        clock.now += 30
+        circuit_breaker.before_call()
+        circuit_breaker.release()
+        circuit_breaker.before_call()
+        self.assertEqual(circuit_breaker.state, CircuitState.half_open)
+
+    def test_slow_calls(self):
+        circuit_breaker = CircuitBreaker('https://alpha.test', slow_call_duration=5, slow_call_rate_threshold=0.5,
+                                         minimum_calls=4, clock=FakeClock())
+
+        for duration in [1, 6, 1, 7]:
+            circuit_breaker.before_call()
+            circuit_breaker.record(None, duration)
+
+        self.assertEqual(circuit_breaker.state, CircuitState.open)
+        self.assertEqual(circuit_breaker.snapshot().slow_call_count, 2)
+
+    def test_failing_host(self):
+        with ScriptedServer([(503, None)] * 100) as server:
+            registry = CircuitBreakerRegistry(self.file_path)
+            session = HttpSession(enable_auth=False,
+                                  suppress_error=False,
+                                  transport_registry=HttpTransportRegistry(retry_budget=RetryBudget()),
+                                  retry_policy=RetryPolicy(max_retries=0),
+                                  circuit_breakers=registry)
+
+            for _ in range(5):
+                with self.assertRaises(ServerError):
+                    session.get(f'{server.url}/runs')
+
+            # The requests fail immediately once the circuit is open.
+            for _ in range(10):
+                with self.assertRaises(CircuitOpenError):
+                    session.get(f'{server.url}/runs')
+            self.assertEqual(len(server.requests), 5)
+
+            # The open circuit is visible to the other processes.
+            other_registry = CircuitBreakerRegistry(self.file_path)
+            snapshots = other_registry.list_snapshots()
+            self.assertEqual([(s.host, s.state, s.last_failure) for s in snapshots],
+                             [(server.url, CircuitState.open, 'HTTP 503')])
+            with self.assertRaises(CircuitOpenError):
+                other_registry.get(f'{server.url}/runs/foo').before_call()
+
+            self.assertEqual(other_registry.reset(server.url.split('://')[1]), 1)
+            self.assertEqual(CircuitBreakerRegistry(self.file_path).list_snapshots(), [])
+
+            # The circuit of this process is not affected by the reset in the other process.
+            with self.assertRaises(CircuitOpenError):
+                session.get(f'{server.url}/runs')
+
+            registry.reset()
+            server.statuses.clear()
+            self.assertEqual(session.get(f'{server.url}/runs').status_code, 200)
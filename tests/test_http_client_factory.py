@@ -0,0 +1,44 @@
+from time import sleep
+from unittest import TestCase
+
+from dnastack.http.client_factory import HttpTransportRegistry, HttpClientFactory, PooledSession
+
+
+class TestUnit(TestCase):
+    def test_transport_is_shared_per_origin(self):
+        registry = HttpTransportRegistry(pool_size=4, max_connections_per_host=2, idle_timeout=60)
+
+        adapter = registry.get_adapter('https://alpha.test/foo')
+        self.assertIs(registry.get_adapter('https://ALPHA.test/bar?x=1'), adapter)
+        self.assertIsNot(registry.get_adapter('http://alpha.test/foo'), adapter)
+        self.assertIsNot(registry.get_adapter('https://alpha.test:8443/foo'), adapter)
+        self.assertEqual(registry.size(), 3)
+
+        session_1 = HttpClientFactory.make(transport_registry=registry)
+        session_2 = HttpClientFactory.make(transport_registry=registry)
+        self.assertIsInstance(session_1, PooledSession)
+        self.assertIs(session_1.get_adapter('https://alpha.test/a'), session_2.get_adapter('https://alpha.test/b'))
+
+        # Closing a session must not close the shared transport.
+        session_1.close()
+        self.assertIs(session_2.get_adapter('https://alpha.test/c'), adapter)
+
+    def test_least_recently_used_transport_is_evicted(self):
+        registry = HttpTransportRegistry(pool_size=2, max_connections_per_host=2, idle_timeout=60)
+
+        alpha = registry.get_adapter('https://alpha.test/')
+        registry.get_adapter('https://bravo.test/')
+        registry.get_adapter('https://alpha.test/')
+        registry.get_adapter('https://charlie.test/')
+
+        self.assertEqual(registry.size(), 2)
+        self.assertIs(registry.get_adapter('https://alpha.test/'), alpha)
+
+    def test_idle_transport_is_evicted(self):
+        registry = HttpTransportRegistry(pool_size=2, max_connections_per_host=2, idle_timeout=0.1)
+
+        alpha = registry.get_adapter('https://alpha.test/')
+        sleep(0.2)
+
+        self.assertIsNot(registry.get_adapter('https://alpha.test/'), alpha)
+        self.assertEqual(registry.size(), 1)
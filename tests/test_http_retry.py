@@ -0,0 +1,159 @@
+import asyncio
+from http.server import BaseHTTPRequestHandler
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from unittest import TestCase
+
+from dnastack.client.models import ServiceEndpoint
+from dnastack.http.async_session import AsyncHttpSession
+from dnastack.http.client_factory import HttpTransportRegistry
+from dnastack.http.retry import RetryBudget, RetryPolicy, parse_retry_after
+from dnastack.http.session import ClientError, HttpSession, ServerError
+from tests.exam_helper import make_mock_response, LocalHttpServer
+from tests.test_http_async_session import FakeAsyncClient
+
+
+class ScriptedServer(LocalHttpServer):
+    """ Local HTTP server responding with the scripted statuses in order, then with HTTP 200 """
+
+    def __init__(self, statuses: List[Tuple[int, Optional[str]]]):
+        self.statuses = list(statuses)
+        self.requests: List[Dict[str, float]] = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.respond()
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                self.respond()
+
+            def respond(self):
+                server.requests.append(dict(method=self.command, time=perf_counter()))
+                status, retry_after = server.statuses.pop(0) if server.statuses else (200, None)
+
+                body = b'{}'
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                if retry_after is not None:
+                    self.send_header('Retry-After', retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        super().__init__(Handler)
+
+
+class TestUnit(TestCase):
+    policy = RetryPolicy(max_retries=3, backoff_base=0.01, backoff_max=0.05)
+
+    def test_retry_after_on_429(self):
+        with ScriptedServer([(429, '1'), (503, None)]) as server:
+            response = self._make_session().get(f'{server.url}/runs')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(server.requests), 3)
+        self.assertGreaterEqual(server.requests[1]['time'] - server.requests[0]['time'], 1)
+        self.assertLess(server.requests[2]['time'] - server.requests[1]['time'], 1)
+
+    def test_retry_after_exceeding_limit(self):
+        with ScriptedServer([(429, '3600')]) as server:
+            with self.assertRaises(ClientError):
+                self._make_session().get(f'{server.url}/runs')
+
+        self.assertEqual(len(server.requests), 1)
+
+    def test_non_idempotent_request(self):
+        with ScriptedServer([(503, None)]) as server:
+            with self.assertRaises(ServerError):
+                self._make_session().post(f'{server.url}/runs', json=dict())
+            self.assertEqual(len(server.requests), 1)
+
+        # The server responds with HTTP 429 without processing the request.
+        with ScriptedServer([(429, '0')]) as server:
+            self.assertEqual(self._make_session().post(f'{server.url}/runs', json=dict()).status_code, 200)
+            self.assertEqual(len(server.requests), 2)
+
+    def test_exhausted_retries(self):
+        with ScriptedServer([(502, None)] * 10) as server:
+            with self.assertRaises(ServerError):
+                self._make_session().get(f'{server.url}/runs')
+
+        self.assertEqual(len(server.requests), 1 + self.policy.max_retries)
+
+    def test_retry_budget(self):
+        budget = RetryBudget(ratio=0, min_retries_per_second=0, capacity=1)
+
+        with ScriptedServer([(503, None)] * 10) as server:
+            session = self._make_session(budget)
+            with self.assertRaises(ServerError):
+                session.get(f'{server.url}/runs')
+
+            # Only one retry is allowed by the budget.
+            self.assertEqual(len(server.requests), 2)
+
+            with self.assertRaises(ServerError):
+                session.get(f'{server.url}/runs')
+            self.assertEqual(len(server.requests), 3)
+
+        # Every request earns a fraction of a retry.
+        budget = RetryBudget(ratio=0.5, min_retries_per_second=0, capacity=1)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    def test_decorrelated_jitter(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=20)
+
+        backoff = 0
+        for _ in range(20):
+            next_backoff = policy.get_next_backoff(backoff)
+            self.assertGreaterEqual(next_backoff, 1)
+            self.assertLessEqual(next_backoff, min(20, max(backoff, 1) * 3))
+            backoff = next_backoff
+
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(RetryPolicy(respect_retry_after=False).get_retry_after_delay('10'))
+
+    def test_policy_per_endpoint(self):
+        endpoint = ServiceEndpoint(url='https://alpha.test/', retry_policy=dict(max_retries='1'))
+        self.assertEqual(endpoint.retry_policy.max_retries, 1)
+        self.assertIsNone(ServiceEndpoint(url='https://alpha.test/').retry_policy)
+
+        registry = HttpTransportRegistry()
+        default_adapter = registry.get_adapter('https://alpha.test/foo')
+        adapter = registry.get_adapter('https://alpha.test/bar', endpoint.retry_policy)
+
+        self.assertIsNot(adapter, default_adapter)
+        self.assertIs(registry.get_adapter('https://alpha.test/', RetryPolicy(max_retries=1)), adapter)
+        self.assertIs(registry.get_adapter('https://alpha.test/', RetryPolicy()), default_adapter)
+        self.assertEqual(adapter.max_retries.total, 1)
+
+    def test_async_retry(self):
+        client = FakeAsyncClient([make_mock_response(429, headers={'Retry-After': '0'}),
+                                  make_mock_response(503),
+                                  make_mock_response(200)])
+
+        async def run():
+            session = AsyncHttpSession(enable_auth=False, client=client, suppress_error=False,
+                                       retry_policy=self.policy, retry_budget=RetryBudget())
+            return await session.get('http://localhost/runs')
+
+        self.assertEqual(asyncio.run(run()).status_code, 200)
+        self.assertEqual(len(client.requests), 3)
+
+    def _make_session(self, budget: Optional[RetryBudget] = None) -> HttpSession:
+        return HttpSession(enable_auth=False,
+                           suppress_error=False,
+                           transport_registry=HttpTransportRegistry(retry_budget=budget or RetryBudget()),
+                           retry_policy=self.policy)
@@ -1,17 +1,20 @@
 import json
+import logging
 import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from time import time, sleep
+from time import time, sleep, perf_counter
 from typing import Dict, List, Any, Optional, Union
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 from dnastack import ServiceEndpoint
+from dnastack.common.environments import flag
+from dnastack.common.logger import get_logger
 from dnastack.common.tracing import Span
 from dnastack.http.authenticators.abstract import Authenticator, AuthenticationRequired
 from dnastack.http.authenticators.oauth2 import OAuth2Authenticator
 from dnastack.http.authenticators.oauth2_adapter.factory import OAuth2AdapterFactory
-from dnastack.http.session import HttpSession, ClientError
+from dnastack.http.session import HttpSession, ClientError, format_body_for_log
 from dnastack.http.session_info import InMemorySessionStorage, SessionManager, SessionInfo
 from requests import Session, Response, Request
 from pydantic import BaseModel, Field
@@ -261,3 +264,78 @@ class TestHttpSession(TestCase):
             self.assertNotEqual(item.headers["X-B3-SpanId"], first_header_spanid)
             self.assertIsNotNone(item.path)
             self.assertIn("User-Agent", item.headers.keys())
+
+    def test_format_body_for_log(self):
+        self.assertEqual(format_body_for_log(None, 10), '(empty)')
+        self.assertEqual(format_body_for_log(b'', 10), '(empty)')
+        self.assertEqual(format_body_for_log(b'0123456789', 10), '0123456789')
+        self.assertEqual(format_body_for_log(b'0123456789a', 10), '0123456789... (truncated to 10B)')
+        self.assertEqual(format_body_for_log('0123456789a', 10), '0123456789... (truncated to 10B)')
+        self.assertEqual(format_body_for_log(dict(a=1), 10), '{"a": 1}')
+        self.assertEqual(format_body_for_log(object(), 10), '(object)')
+
+        # The multibyte characters cut by the budget do not break the formatting.
+        self.assertEqual(format_body_for_log('ééééé', 5), 'éé\ufffd... (truncated to 5B)')
+
+    def test_body_not_read_without_debug_log(self):
+        self.assertEqual(self._count_body_reads(logging.WARNING), 0)
+        self.assertGreater(self._count_body_reads(logging.DEBUG), 0)
+
+    def _count_body_reads(self, log_level: int) -> int:
+        response = make_mock_response(200)
+        content_property = PropertyMock(return_value=b'{"data": []}')
+        text_property = PropertyMock(return_value='{"data": []}')
+        type(response).content = content_property
+        type(response).text = text_property
+
+        session = MagicMock(Session)
+        session.get.return_value = response
+
+        with patch('dnastack.common.logger.default_logging_level', log_level):
+            http_session = HttpSession(session=session, enable_auth=False)
+
+        http_session.submit('get', 'http://localhost:8000/')
+
+        return content_property.call_count + text_property.call_count
+
+
+class TestBenchmark(TestCase):
+    _logger = get_logger('lib/benchmark', logging.INFO)
+
+    def setUp(self) -> None:
+        if not flag('BENCHMARK_ENABLED'):
+            self.skipTest('Disabled. Set BENCHMARK_ENABLED=true to enable.')
+
+    def test_paging_without_debug_log(self):
+        """ Compare the overhead of submitting the requests for the pages of the query results """
+        page = json.dumps(dict(data=[dict(id=i, name=f'sample-{i}', score=i / 3) for i in range(10000)])).encode()
+        page_count = 200
+
+        def make_response(*args, **kwargs):
+            response = Response()
+            response.status_code = 200
+            response.headers['Content-Type'] = 'application/json'
+            response._content = page
+            return response
+
+        session = MagicMock(Session)
+        session.get.side_effect = make_response
+
+        with patch('dnastack.common.logger.default_logging_level', logging.WARNING):
+            http_session = HttpSession(session=session, enable_auth=False)
+
+        start_time = perf_counter()
+        for _ in range(page_count):
+            http_session.submit('get', 'http://localhost:8000/')
+        duration = perf_counter() - start_time
+
+        # NOTE: This is what the previous version computed for every response, regardless of the log level.
+        legacy_start_time = perf_counter()
+        for _ in range(page_count):
+            response = http_session.submit('get', 'http://localhost:8000/')
+            _ = f'HTTP {response.status_code} GET {response.url} ({len(response.text)}B)\n{response.text}'
+        legacy_duration = perf_counter() - legacy_start_time
+
+        self._logger.info(f'Submitted {page_count} requests for pages of {len(page)}B: '
+                          f'previous = {legacy_duration:.3f}s, current = {duration:.3f}s '
+                          f'({legacy_duration / duration:.1f}x)')
@@ -0,0 +1,208 @@
+from threading import Event
+from typing import Any, List, Optional
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from dnastack.client.data_connect import QueryLoader, DataConnectClient
+from dnastack.client.models import ServiceEndpoint
+from dnastack.client.result_iterator import ResultIterator, ResultLoader, UrlHistory, ResultCheckpoint, PagePrefetcher
+from dnastack.http.session import HttpSession
+from tests.exam_helper import make_mock_page
+
+
+class TestUnit(TestCase):
+    def test_session_is_kept_alive_across_pages(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(i=1), dict(i=2)], 'https://dc.test/search/page-2')
+        mock_session.get.side_effect = [
+            make_mock_page([dict(i=3)], 'https://dc.test/search/page-3'),
+            make_mock_page([dict(i=4)]),
+        ]
+
+        iterator = ResultIterator(QueryLoader('https://dc.test/search', query='SELECT 1', http_session=mock_session))
+
+        self.assertEqual([row['i'] for row in iterator], [1, 2, 3, 4])
+        self.assertEqual(mock_session.post.call_count, 1)
+        self.assertEqual(mock_session.get.call_count, 2)
+
+        # The session is only closed once the result is depleted.
+        mock_session.close.assert_called_once()
+        mock_session.__exit__.assert_not_called()
+
+    def test_close_releases_the_session(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(i=1), dict(i=2)], 'https://dc.test/search/page-2')
+
+        iterator = ResultIterator(QueryLoader('https://dc.test/search', query='SELECT 1', http_session=mock_session))
+
+        self.assertEqual(next(iterator)['i'], 1)
+        mock_session.close.assert_not_called()
+
+        iterator.close()
+        mock_session.close.assert_called_once()
+
+        with self.assertRaises(StopIteration):
+            next(iterator)
+
+    def test_prefetch_delivers_pages_and_errors_in_order(self):
+        loader = MockPageLoader([[1, 2], [3], RuntimeError('page 3 failed'), [4]])
+        iterator = ResultIterator(loader, prefetch=2)
+
+        self.assertEqual([next(iterator) for _ in range(3)], [1, 2, 3])
+        with self.assertRaisesRegex(RuntimeError, 'page 3 failed'):
+            next(iterator)
+        with self.assertRaises(StopIteration):
+            next(iterator)
+
+    def test_prefetch_is_cancelled_when_the_iterator_is_closed(self):
+        loader = MockPageLoader([[i] for i in range(100)])
+        iterator = ResultIterator(loader, prefetch=2)
+
+        self.assertEqual(next(iterator), 0)
+        iterator.close()
+
+        # The loader stops shortly after the cancellation instead of loading all pages.
+        self.assertTrue(loader.closed_event.wait(5))
+        self.assertLess(loader.load_count, 10)
+
+    def test_prefetch_closes_the_loader_after_the_page_being_loaded(self):
+        page_requested = Event()
+        page_released = Event()
+        loader = MockPageLoader([[1], [2]], page_requested=page_requested, page_released=page_released)
+        prefetcher = PagePrefetcher(loader, 1)
+
+        self.assertTrue(page_requested.wait(5))
+        prefetcher.close(timeout=0.01)
+
+        # The loader is not closed while the background thread is loading the page.
+        self.assertFalse(loader.closed)
+
+        page_released.set()
+        self.assertTrue(loader.closed_event.wait(5))
+        self.assertEqual(loader.load_count, 1)
+
+    def test_iter_pages_yields_the_buffered_items_first(self):
+        loader = MockPageLoader([[1, 2, 3], [], [4, 5], [6]])
+        iterator = ResultIterator(loader)
+
+        self.assertEqual(next(iterator), 1)
+        self.assertEqual(list(iterator.iter_pages()), [[2, 3], [4, 5], [6]])
+        self.assertTrue(loader.closed)
+
+        with self.assertRaises(StopIteration):
+            next(iterator)
+
+    def test_iter_batches(self):
+        for prefetch in (0, 2):
+            with self.subTest(prefetch=prefetch):
+                iterator = ResultIterator(MockPageLoader([[1, 2, 3], [4], [5, 6, 7, 8, 9], [10]]), prefetch=prefetch)
+                self.assertEqual(list(iterator.iter_batches(3)), [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]])
+
+    def test_url_history(self):
+        history = UrlHistory(max_recent_urls=2)
+        for i in range(5):
+            history.append(f'https://dc.test/search/page-{i}')
+
+        self.assertIn('https://dc.test/search/page-0', history)
+        self.assertNotIn('https://dc.test/search/page-5', history)
+        self.assertEqual(list(history), ['https://dc.test/search/page-3', 'https://dc.test/search/page-4'])
+
+    def test_revisited_page_ends_the_iteration(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(i=1)], 'https://dc.test/search/page-2')
+        mock_session.get.side_effect = [
+            make_mock_page([dict(i=2)], 'https://dc.test/search/page-2'),
+            make_mock_page([dict(i=3)]),
+        ]
+
+        iterator = ResultIterator(QueryLoader('https://dc.test/search', query='SELECT 1', http_session=mock_session))
+
+        self.assertEqual([row['i'] for row in iterator], [1, 2])
+        self.assertEqual(mock_session.get.call_count, 1)
+
+    def test_resume_from_checkpoint(self):
+        for prefetch in (0, 2):
+            with self.subTest(prefetch=prefetch):
+                mock_session = MagicMock(HttpSession)
+                mock_session.post.return_value = make_mock_page([dict(i=1), dict(i=2)], 'https://dc.test/search/p2')
+                mock_session.get.side_effect = [
+                    make_mock_page([dict(i=3), dict(i=4)], 'https://dc.test/search/p3'),
+                    make_mock_page([dict(i=5)]),
+                ]
+                client = self.__make_client(mock_session)
+
+                iterator = client.query('SELECT 1', prefetch=prefetch)
+                self.assertEqual([next(iterator)['i'] for _ in range(3)], [1, 2, 3])
+                checkpoint = ResultCheckpoint.parse_raw(iterator.checkpoint().json())
+                iterator.close()
+
+                self.assertEqual(checkpoint.position['page_url'], 'https://dc.test/search/p2')
+                self.assertEqual(checkpoint.offset, 1)
+                self.assertEqual(checkpoint.row_count, 3)
+                self.assertFalse(checkpoint.completed)
+
+                mock_session.get.side_effect = [
+                    make_mock_page([dict(i=3), dict(i=4)], 'https://dc.test/search/p3'),
+                    make_mock_page([dict(i=5)]),
+                ]
+                mock_session.post.reset_mock()
+
+                resumed_iterator = client.resume(checkpoint, prefetch=prefetch)
+
+                self.assertEqual([row['i'] for row in resumed_iterator], [4, 5])
+                mock_session.post.assert_not_called()
+                self.assertEqual(mock_session.get.call_args_list[-2][0][0], 'https://dc.test/search/p2')
+                self.assertEqual(resumed_iterator.checkpoint().row_count, 5)
+                self.assertTrue(resumed_iterator.checkpoint().completed)
+
+    def test_resume_within_the_first_page(self):
+        mock_session = MagicMock(HttpSession)
+        mock_session.post.return_value = make_mock_page([dict(i=1), dict(i=2)])
+        client = self.__make_client(mock_session)
+
+        iterator = client.query('SELECT 1')
+        next(iterator)
+        checkpoint = iterator.checkpoint()
+
+        self.assertIsNone(checkpoint.position['page_url'])
+        self.assertEqual([row['i'] for row in client.resume(checkpoint)], [2])
+        self.assertEqual(mock_session.post.call_count, 2)
+
+    @staticmethod
+    def __make_client(mock_session: HttpSession) -> DataConnectClient:
+        client = DataConnectClient.make(ServiceEndpoint(id='dc', url='https://dc.test/'))
+        client.create_http_session = lambda *args, **kwargs: mock_session
+        return client
+
+
+class MockPageLoader(ResultLoader):
+    def __init__(self,
+                 pages: List[Any],
+                 page_requested: Optional[Event] = None,
+                 page_released: Optional[Event] = None):
+        self.__pages = pages
+        self.__page_requested = page_requested
+        self.__page_released = page_released
+        self.load_count = 0
+        self.closed = False
+        self.closed_event = Event()
+
+    def has_more(self) -> bool:
+        return len(self.__pages) > 0
+
+    def load(self) -> List[Any]:
+        self.load_count += 1
+
+        if self.__page_requested:
+            # Block until the test releases the page.
+            self.__page_requested.set()
+            self.__page_released.wait(5)
+
+        page = self.__pages.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    def close(self):
+        self.closed = True
+        self.closed_event.set()